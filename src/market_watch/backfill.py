@@ -0,0 +1,88 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from .tools.dashboard_store import DASHBOARD_DIR, INDEX_NAME
+
+load_dotenv()
+
+DEFAULT_BACKFILL_DIR = os.path.join("output", "backfill")
+
+
+def backfill_dates(start: str, end: str) -> List[str]:
+    """Trading days (Mon-Fri) between start and end, inclusive, as YYYY-MM-DD strings."""
+    return [d.strftime('%Y-%m-%d') for d in pd.bdate_range(start, end)]
+
+
+def run_date(date: str, output_root: str = DEFAULT_BACKFILL_DIR) -> dict:
+    """Runs the whole crew for one historical date.
+
+    Executed in a fresh worker process: the environment is set before the crew (and
+    with it every cache singleton) is imported, so all data reads are point-in-time.
+    """
+    output_dir = os.path.join(output_root, date)
+    os.environ["MARKET_WATCH_AS_OF"] = date
+    os.environ["MARKET_WATCH_OUTPUT_DIR"] = output_dir
+    from src.market_watch.crew import MarketWatchCrew
+
+    started = time.monotonic()
+    MarketWatchCrew().crew().kickoff(inputs={'date': date, 'watchlist': ''})
+    return {"date": date, "output_dir": output_dir, "seconds": time.monotonic() - started}
+
+
+def run_backfill(
+    start: str,
+    end: str,
+    workers: Optional[int] = None,
+    output_root: str = DEFAULT_BACKFILL_DIR,
+    force: bool = False,
+) -> List[dict]:
+    """Runs the pipeline for every trading day in [start, end] across worker processes.
+
+    Dates that already have a published dashboard index are skipped unless `force` is set.
+    Each date gets its own process, so per-process caches never leak between dates;
+    the rate limiter's buckets are shared by all of them.
+    """
+    dates = backfill_dates(start, end)
+    if not force:
+        dates = [d for d in dates if not os.path.exists(os.path.join(output_root, d, DASHBOARD_DIR, INDEX_NAME))]
+    if not dates:
+        return []
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(dates)), mp_context=context, max_tasks_per_child=1) as pool:
+        futures = {pool.submit(run_date, date, output_root): date for date in dates}
+        for future in as_completed(futures):
+            date = futures[future]
+            try:
+                results.append(future.result())
+                print(f"[backfill] {date} done")
+            except Exception as e:
+                results.append({"date": date, "error": str(e)})
+                print(f"[backfill] {date} failed: {str(e)}")
+    return sorted(results, key=lambda r: r["date"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Market Watch for a range of historical dates.")
+    parser.add_argument("start", help="First date (YYYY-MM-DD)")
+    parser.add_argument("end", help="Last date (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel worker processes")
+    parser.add_argument("--output-dir", default=DEFAULT_BACKFILL_DIR, help="Root folder for per-date outputs")
+    parser.add_argument("--force", action="store_true", help="Re-run dates that already have output")
+    args = parser.parse_args()
+    results = run_backfill(args.start, args.end, args.workers, args.output_dir, args.force)
+    failed = [r for r in results if "error" in r]
+    print(f"Backfill finished: {len(results) - len(failed)} succeeded, {len(failed)} failed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import argparse
+
+from dotenv import load_dotenv
+
+from .tools.backtest import DEFAULT_BENCHMARK, DEFAULT_HORIZONS, format_summary, run_backtest
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the published Market Watch picks.")
+    parser.add_argument(
+        "--root", default=None,
+        help="Read picks from dashboard_data.json files under this folder instead of the run history store",
+    )
+    parser.add_argument("--benchmark", default=DEFAULT_BENCHMARK)
+    parser.add_argument("--horizons", default=",".join(map(str, DEFAULT_HORIZONS)), help="Comma separated trading days")
+    args = parser.parse_args()
+    horizons = [int(h) for h in args.horizons.split(",")]
+    _, summary = run_backtest(args.root, horizons, args.benchmark)
+    print(format_summary(summary, args.benchmark))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import argparse
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import yaml
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_WATCHLISTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../config/watchlists.yaml')
+
+
+def load_watchlists(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Reads config/watchlists.yaml into name -> upper-cased, de-duplicated tickers."""
+    with open(path or DEFAULT_WATCHLISTS, 'r') as f:
+        config = yaml.safe_load(f) or {}
+    watchlists = {}
+    for name, spec in config.items():
+        tickers = spec.get("tickers", []) if isinstance(spec, dict) else spec
+        watchlists[name] = list(dict.fromkeys(str(t).strip().upper() for t in tickers or [] if str(t).strip()))
+    return watchlists
+
+
+def shared_tickers(watchlists: Dict[str, List[str]]) -> List[str]:
+    """Tickers that appear on more than one watchlist."""
+    counts = Counter(t for tickers in watchlists.values() for t in tickers)
+    return sorted(t for t, n in counts.items() if n > 1)
+
+
+def warm_shared_caches(tickers: List[str]) -> Dict[str, int]:
+    """Does the ticker-level work once, in the parent, before the crews start.
+
+    Prices, charts (and their asset variants) and fundamentals land in the on-disk
+    caches every worker reads, so a ticker on several watchlists is fetched and
+    rendered once instead of once per watchlist.
+    """
+    from .tools.chart_assets import get_chart_assets
+    from .tools.chart_renderer import get_chart_renderer
+    from .tools.fundamentals_cache import get_fundamentals_cache
+    from .tools.price_cache import get_price_cache
+
+    frames = get_price_cache().history_many(tickers, period="1y")
+    closes = {t: df['Close'] for t, df in frames.items() if not df.empty}
+    charts = get_chart_renderer().warm(closes) if closes else {}
+    assets = get_chart_assets()
+    for path in charts.values():
+        assets.build(path)
+    get_fundamentals_cache().prefetch(tickers)
+    return {"tickers": len(tickers), "priced": len(closes), "charts": len(charts)}
+
+
+def run_watchlist(batch_id: str, name: str, tickers: List[str], date: str, output_root: Optional[str] = None) -> dict:
+    """Runs the crew for one watchlist in its own workspace. Executed in a fresh worker process."""
+    from src.market_watch.crew import MarketWatchCrew
+    from src.market_watch.tools.run_context import RunContext, LATEST_NAME
+
+    context = RunContext(run_id=f"{batch_id}-{name}", root=output_root, pointer=f"{LATEST_NAME}-{name}")
+    started = time.monotonic()
+    with context:
+        MarketWatchCrew().crew().kickoff(inputs={'date': date, 'watchlist': ", ".join(tickers)})
+    return {"watchlist": name, "run_id": context.run_id, "workspace": context.workspace,
+            "seconds": time.monotonic() - started}
+
+
+def run_batch(
+    watchlists: Dict[str, List[str]],
+    workers: Optional[int] = None,
+    date: Optional[str] = None,
+    output_root: Optional[str] = None,
+    warm: bool = True,
+) -> List[dict]:
+    """Runs every watchlist over a process pool after warming the shared caches once.
+
+    Workers share the on-disk price, fundamentals, chart and search caches and the
+    rate limiter's buckets; each writes to its own run workspace. Old workspaces
+    are collected once the pool is done.
+    """
+    from .tools.run_context import gc_runs
+
+    if not watchlists:
+        return []
+    date = date or datetime.now().strftime('%Y-%m-%d')
+    batch_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+
+    if warm:
+        universe = sorted({t for tickers in watchlists.values() for t in tickers})
+        try:
+            stats = warm_shared_caches(universe)
+            print(f"[batch] warmed {stats['tickers']} tickers ({len(shared_tickers(watchlists))} on several watchlists)")
+        except Exception as e:
+            print(f"[batch] cache warm-up failed, workers will fetch on demand: {str(e)}")
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(watchlists)), mp_context=context, max_tasks_per_child=1) as pool:
+        futures = {
+            pool.submit(run_watchlist, batch_id, name, tickers, date, output_root): name
+            for name, tickers in watchlists.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results.append(future.result())
+                print(f"[batch] {name} done")
+            except Exception as e:
+                results.append({"watchlist": name, "error": str(e)})
+                print(f"[batch] {name} failed: {str(e)}")
+    gc_runs(output_root)
+    return sorted(results, key=lambda r: r["watchlist"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Market Watch for several watchlists in parallel.")
+    parser.add_argument("--watchlists", default=DEFAULT_WATCHLISTS, help="YAML file of watchlists")
+    parser.add_argument("--only", default=None, help="Comma separated watchlist names to run")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel worker processes")
+    parser.add_argument("--date", default=None, help="Date passed to the crews (YYYY-MM-DD)")
+    parser.add_argument("--no-warm", action="store_true", help="Skip the shared cache warm-up")
+    args = parser.parse_args()
+
+    watchlists = load_watchlists(args.watchlists)
+    if args.only:
+        wanted = {n.strip() for n in args.only.split(",")}
+        watchlists = {n: t for n, t in watchlists.items() if n in wanted}
+    results = run_batch(watchlists, args.workers, args.date, warm=not args.no_warm)
+    failed = [r for r in results if "error" in r]
+    print(f"Batch finished: {len(results) - len(failed)} succeeded, {len(failed)} failed.")
+
+
+if __name__ == "__main__":
+    main()
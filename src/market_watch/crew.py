@@ -3,14 +3,19 @@ from crewai.project import CrewBase, agent, crew, task
 import yaml
 import os
 from langchain_google_genai import ChatGoogleGenerativeAI
-from crewai_tools import BraveSearchTool
 from .tools.analysis_tools import (
     ChartGenerationTool, 
+    BatchChartGenerationTool,
     TechnicalAnalysisTool, 
-    FundamentalDataTool
+    BulkTechnicalAnalysisTool,
+    FundamentalDataTool,
+    FundamentalsPrefetchTool
 )
 from .tools.reporting_tools import WordReportTool
-from .tools.scanner_tools import SectorDiscoveryTool
+from .tools.scanner_tools import SectorDiscoveryTool, MarketScreenerTool
+from .tools.search_tools import RateLimitedBraveSearchTool
+from .tools.prestage import prestage_guardrail
+from .llm import MarketWatchLLM
 
 @CrewBase
 class MarketWatchCrew():
@@ -22,14 +27,16 @@ class MarketWatchCrew():
 
     @property
     def llm(self):
-        return "gemini/gemini-flash-latest"
+        # Paced by the 'llm' bucket (config/rate_limits.yaml) rather than a crew-wide max_rpm,
+        # and recorded/replayed through the cassette (MARKET_WATCH_CASSETTE).
+        return MarketWatchLLM(model="gemini/gemini-flash-latest")
 
     # --- AGENTS ---
     @agent
     def market_scout(self) -> Agent:
         return Agent(
             config=self.agents_config['market_scout'],
-            tools=[SectorDiscoveryTool(), BraveSearchTool()],
+            tools=[MarketScreenerTool(), SectorDiscoveryTool(), RateLimitedBraveSearchTool()],
             verbose=True,
             llm=self.llm
         )
@@ -38,7 +45,7 @@ class MarketWatchCrew():
     def technical_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['technical_analyst'],
-            tools=[ChartGenerationTool(), TechnicalAnalysisTool()],
+            tools=[BatchChartGenerationTool(), ChartGenerationTool(), BulkTechnicalAnalysisTool(), TechnicalAnalysisTool()],
             verbose=True,
             llm=self.llm
         )
@@ -47,7 +54,7 @@ class MarketWatchCrew():
     def fundamental_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['fundamental_analyst'],
-            tools=[FundamentalDataTool(), BraveSearchTool()],
+            tools=[FundamentalsPrefetchTool(), FundamentalDataTool(), RateLimitedBraveSearchTool()],
             verbose=True,
             llm=self.llm
         )
@@ -56,7 +63,7 @@ class MarketWatchCrew():
     def risk_manager(self) -> Agent:
         return Agent(
             config=self.agents_config['risk_manager'],
-            tools=[BraveSearchTool()],
+            tools=[RateLimitedBraveSearchTool()],
             verbose=True,
             llm=self.llm
         )
@@ -83,7 +90,10 @@ class MarketWatchCrew():
     def scout_task(self) -> Task:
         return Task(
             config=self.tasks_config['scout_task'],
-            agent=self.market_scout()
+            agent=self.market_scout(),
+            # Non-LLM stage: bulk indicators, charts and fundamentals for the scout's
+            # tickers are appended to its output, which the analysts get as context.
+            guardrail=prestage_guardrail
         )
 
     @task
@@ -126,7 +136,9 @@ class MarketWatchCrew():
         return Crew(
             agents=self.agents,
             tasks=self.tasks,
+            # Tasks form a DAG: the technical, fundamental and risk tasks are async
+            # (see tasks.yaml), run concurrently after scout_task and join at
+            # investment_decision_task. The rate limiter's buckets are shared by all of them.
             process=Process.sequential,
-            verbose=True,
-            max_rpm=1 # Respect Gemini Free Tier - Very Conservative
+            verbose=True
         )
\ No newline at end of file
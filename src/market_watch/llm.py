@@ -0,0 +1,66 @@
+from typing import Any, Optional
+
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+
+from .tools.cassette import Cassette, get_cassette
+from .tools.rate_limiter import get_rate_limiter
+
+
+class MarketWatchLLM(BaseLLM):
+    """Wraps the crew's LLM client: real calls pay the shared 'llm' rate-limit bucket,
+    and completions go through the cassette so reruns can be served from disk."""
+
+    llm_type: str = "market_watch"
+    inner: Optional[BaseLLM] = None
+    cassette: Optional[Cassette] = None
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        if self.inner is None:
+            self.inner = LLM(model=self.model)
+        if self.cassette is None:
+            self.cassette = get_cassette()
+
+    def call(
+        self,
+        messages,
+        tools=None,
+        callbacks=None,
+        available_functions=None,
+        from_task=None,
+        from_agent=None,
+        response_model=None,
+    ):
+        request = {
+            "model": self.model,
+            "messages": messages,
+            "tools": tools,
+            "stop": self.stop_sequences,
+            "response_model": response_model.__name__ if response_model else None,
+        }
+
+        def live():
+            get_rate_limiter().acquire("llm")
+            with call_stop_override(self.inner, list(self.stop_sequences)):
+                return self.inner.call(
+                    messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                    from_task=from_task, from_agent=from_agent, response_model=response_model,
+                )
+
+        return self.cassette.through("llm", request, live)
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def supports_multimodal(self) -> bool:
+        return self.inner.supports_multimodal()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+    def get_token_usage_summary(self):
+        return self.inner.get_token_usage_summary()
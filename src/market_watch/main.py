@@ -2,13 +2,21 @@ from datetime import datetime
 from dotenv import load_dotenv
 load_dotenv()
 from src.market_watch.crew import MarketWatchCrew
+from src.market_watch.tools.rate_limiter import get_rate_limiter
+from src.market_watch.tools.run_context import RunContext, gc_runs
 
 def run():
     # You can loop through your specific stocks here
     inputs = {
-        'date': datetime.now().strftime('%Y-%m-%d')
+        'date': datetime.now().strftime('%Y-%m-%d'),
+        'watchlist': ''
     }
-    MarketWatchCrew().crew().kickoff(inputs=inputs)
+    # Each run writes into its own output/runs/<run id>/ workspace; LATEST points at the last good one.
+    with RunContext() as context:
+        MarketWatchCrew().crew().kickoff(inputs=inputs)
+    print(f"Run {context.run_id} saved to {context.workspace}")
+    print(get_rate_limiter().format_stats(context.run_id))
+    gc_runs()
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
@@ -0,0 +1,120 @@
+"""Test doubles shared by the tools test suites."""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+import pytest
+from market_watch.tools.market_data import MarketDataProvider
+
+
+class StubGitHub:
+    """Local HTTP server standing in for the GitHub API.
+
+    Every request is recorded as (method, path, headers, body). Replies come from
+    `respond(method, path, headers)` when set, else from the scripted `script`
+    queue of (status, headers, payload), else 200 {"ok": true}.
+    """
+
+    def __init__(self, respond=None):
+        self.requests = []
+        self.script = []
+        self.connections = set()
+        self.respond = respond
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                stub.requests.append((self.command, self.path, dict(self.headers), body))
+                stub.connections.add(self.client_address)
+                if stub.respond is not None:
+                    status, headers, payload = stub.respond(self.command, self.path, dict(self.headers))
+                else:
+                    status, headers, payload = stub.script.pop(0) if stub.script else (200, {}, {"ok": True})
+                data = json.dumps(payload).encode('utf-8') if payload is not None else b""
+                self.send_response(status)
+                if payload is not None:
+                    self.send_header("Content-Type", "application/json")
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _handle
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def count(self, method):
+        return sum(1 for request in self.requests if request[0] == method)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class CountingProvider(MarketDataProvider):
+    """Stub provider recording every ticker requested.
+
+    Bars are 260 business days ending 2026-01-05; `info` for "BAD" raises.
+    """
+
+    name = "counting"
+
+    def __init__(self):
+        self.requested = []
+        self.info_calls = []
+        self._lock = threading.Lock()
+
+    def history(self, ticker, period=None, start=None):
+        return self.download([ticker], period, start)[ticker]
+
+    def download(self, tickers, period=None, start=None):
+        with self._lock:
+            self.requested.extend(tickers)
+        index = pd.bdate_range(end="2026-01-05", periods=260)
+        return {t: pd.DataFrame({'Close': range(1, 261)}, index=index, dtype=float) for t in tickers}
+
+    def info(self, ticker):
+        with self._lock:
+            self.info_calls.append(ticker)
+        if ticker == "BAD":
+            raise RuntimeError("boom")
+        return {'longName': f'{ticker} Inc', 'sector': 'Technology', 'marketCap': 1000, 'companyOfficers': [{}]}
+
+
+class InlinePool(ThreadPoolExecutor):
+    """Drop-in for the ProcessPoolExecutor of batch and backfill runs.
+
+    Runs one task at a time in a thread: tasks set process-wide environment
+    variables, so they must not overlap.
+    """
+
+    def __init__(self, max_workers=None, mp_context=None, max_tasks_per_child=None):
+        super().__init__(max_workers=1)
+
+
+@pytest.fixture
+def github_stub():
+    server = StubGitHub()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def counting_provider():
+    return CountingProvider()
+
+
+@pytest.fixture
+def inline_pool():
+    return InlinePool
@@ -0,0 +1,86 @@
+"""Tests for backfill.py"""
+import os
+import sys
+import types
+import pytest
+from market_watch import backfill
+from market_watch.backfill import *
+
+
+@pytest.fixture
+def kickoffs(monkeypatch, inline_pool):
+    """Replaces the crew with one that records its inputs and environment and writes a dashboard."""
+    calls = []
+
+    class FakeCrew:
+        def crew(self):
+            return self
+
+        def kickoff(self, inputs):
+            output_dir = os.environ["MARKET_WATCH_OUTPUT_DIR"]
+            calls.append({"inputs": inputs, "as_of": os.environ["MARKET_WATCH_AS_OF"], "output_dir": output_dir})
+            if inputs["date"] == "2026-01-07" and os.environ.get("FAIL_DATE"):
+                raise RuntimeError("crew failed")
+            os.makedirs(os.path.join(output_dir, "dashboard"), exist_ok=True)
+            with open(os.path.join(output_dir, "dashboard", "index.json"), 'w') as f:
+                f.write("{}")
+
+    module = types.ModuleType("src.market_watch.crew")
+    module.MarketWatchCrew = FakeCrew
+    monkeypatch.setitem(sys.modules, "src.market_watch.crew", module)
+    monkeypatch.setattr(backfill, "ProcessPoolExecutor", inline_pool)
+    # run_date sets these for its worker process; restore them after each test.
+    monkeypatch.setenv("MARKET_WATCH_AS_OF", "")
+    monkeypatch.setenv("MARKET_WATCH_OUTPUT_DIR", "")
+    return calls
+
+
+class TestBackfillDates:
+    """Test suite for backfill_dates"""
+
+    def test_weekdays_inclusive(self):
+        """Test weekends are skipped and both ends are included"""
+        assert backfill_dates("2026-01-02", "2026-01-06") == ["2026-01-02", "2026-01-05", "2026-01-06"]
+        assert backfill_dates("2026-01-03", "2026-01-04") == []
+
+
+class TestRunDate:
+    """Test suite for run_date"""
+
+    def test_point_in_time_environment(self, kickoffs, tmp_path):
+        """Test the crew sees the date as MARKET_WATCH_AS_OF and writes into the date's folder"""
+        result = run_date("2026-01-05", str(tmp_path))
+        assert kickoffs == [{
+            "inputs": {"date": "2026-01-05", "watchlist": ""},
+            "as_of": "2026-01-05",
+            "output_dir": os.path.join(str(tmp_path), "2026-01-05"),
+        }]
+        assert result["output_dir"] == os.path.join(str(tmp_path), "2026-01-05")
+
+
+class TestRunBackfill:
+    """Test suite for run_backfill"""
+
+    def test_resume_skips_finished_dates(self, kickoffs, tmp_path):
+        """Test dates with a published dashboard index are skipped unless forced"""
+        root = str(tmp_path)
+        results = run_backfill("2026-01-05", "2026-01-07", output_root=root)
+        assert [r["date"] for r in results] == ["2026-01-05", "2026-01-06", "2026-01-07"]
+        assert [c["as_of"] for c in kickoffs] == ["2026-01-05", "2026-01-06", "2026-01-07"]
+        assert all(c["output_dir"] == os.path.join(root, c["as_of"]) for c in kickoffs)
+
+        assert run_backfill("2026-01-05", "2026-01-07", output_root=root) == []
+        assert len(kickoffs) == 3
+
+        os.remove(os.path.join(root, "2026-01-06", "dashboard", "index.json"))
+        assert [r["date"] for r in run_backfill("2026-01-05", "2026-01-07", output_root=root)] == ["2026-01-06"]
+        assert len(run_backfill("2026-01-05", "2026-01-07", output_root=root, force=True)) == 3
+        assert len(kickoffs) == 7
+
+    def test_failed_date_is_retried_next_time(self, kickoffs, tmp_path, monkeypatch):
+        """Test a failed date is reported and, having no dashboard, runs again on resume"""
+        monkeypatch.setenv("FAIL_DATE", "1")
+        results = run_backfill("2026-01-06", "2026-01-07", output_root=str(tmp_path))
+        assert results[1] == {"date": "2026-01-07", "error": "crew failed"}
+        monkeypatch.delenv("FAIL_DATE")
+        assert [r["date"] for r in run_backfill("2026-01-06", "2026-01-07", output_root=str(tmp_path))] == ["2026-01-07"]
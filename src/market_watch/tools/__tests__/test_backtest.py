@@ -0,0 +1,131 @@
+"""Tests for backtest.py"""
+import json
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from market_watch.tools import backtest
+from market_watch.tools.backtest import *
+
+
+@pytest.fixture
+def close():
+    dates = pd.bdate_range("2025-01-01", periods=100)
+    return pd.DataFrame({
+        "UP": 100 * 1.01 ** np.arange(100),
+        "DOWN": 100 * 0.99 ** np.arange(100),
+        "SPY": np.full(100, 50.0),
+    }, index=dates)
+
+
+def _write(root, name, as_of, short, long):
+    path = root / name
+    path.mkdir(parents=True)
+    data = {"generated_at": "2030-01-01 10:00:00", "as_of": as_of,
+            "top_short": [{"ticker": t, "reason": "x"} for t in short],
+            "top_long": [{"ticker": t, "reason": "x"} for t in long]}
+    (path / "dashboard_data.json").write_text(json.dumps(data))
+
+
+class TestBacktest:
+    """Test suite for the picks backtest"""
+
+    def test_load_picks(self, tmp_path):
+        """Test picks are collected from every dashboard file with their as-of date"""
+        _write(tmp_path, "backfill/2025-01-02", "2025-01-02", ["UP"], ["DOWN"])
+        _write(tmp_path, "backfill/2025-01-03", "2025-01-03", ["up", "DOWN"], [])
+        picks = load_picks(str(tmp_path))
+        assert len(picks) == 4
+        assert set(picks.loc[picks["date"] == "2025-01-03", "ticker"]) == {"UP", "DOWN"}
+        assert set(picks["book"]) == {"short", "long"}
+
+    def test_forward_returns(self, close):
+        """Test returns, excess, drawdown and out-of-range horizons"""
+        picks = pd.DataFrame({
+            "date": pd.to_datetime(["2025-01-01", "2025-01-04", "2025-05-01", "2025-01-01"]),
+            "ticker": ["UP", "DOWN", "UP", "MISSING"],
+            "book": ["short", "long", "short", "short"],
+        })
+        result = forward_returns(close, picks, horizons=(1, 5, 60))
+        assert result.loc[0, "ret_5d"] == pytest.approx(1.01 ** 5 - 1)
+        assert result.loc[0, "excess_5d"] == pytest.approx(1.01 ** 5 - 1)
+        assert result.loc[0, "mdd_60d"] == pytest.approx(0)
+        # Saturday pick enters on Friday's close.
+        assert result.loc[1, "ret_1d"] == pytest.approx(-0.01)
+        assert result.loc[1, "mdd_5d"] == pytest.approx(0.99 ** 5 - 1)
+        # Past the panel end and unknown tickers are NaN.
+        assert np.isnan(result.loc[2, "ret_60d"])
+        assert not np.isnan(result.loc[2, "ret_1d"])
+        assert np.isnan(result.loc[3, "ret_1d"])
+
+    def test_summarize(self, close):
+        """Test hit rates and aggregate statistics per book"""
+        picks = pd.DataFrame({
+            "date": pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-01"]),
+            "ticker": ["UP", "DOWN", "DOWN"],
+            "book": ["short", "short", "long"],
+        })
+        summary = summarize(forward_returns(close, picks, horizons=(5,)), horizons=(5,))
+        short = summary[summary["book"] == "short"].iloc[0]
+        assert short["picks"] == 2
+        assert short["hit_rate"] == 0.5
+        assert short["beat_benchmark"] == 0.5
+        assert summary[summary["book"] == "long"].iloc[0]["hit_rate"] == 0
+        assert "short | 5d | 2" in format_summary(summary)
+
+    def test_panel_period_spans_oldest_pick(self):
+        """Test the panel period is the shortest one reaching the oldest pick"""
+        today = pd.Timestamp.now().normalize()
+        assert panel_period(today - pd.Timedelta(days=30)) == "1y"
+        assert panel_period(today - pd.Timedelta(days=400)) == "2y"
+        assert panel_period(today - pd.Timedelta(days=365 * 20)) == "max"
+
+    def test_run_backtest_uses_cached_period(self, close, monkeypatch):
+        """Test recent picks are scored on the "1y" panel the cache already covers, not on all history"""
+        requests = []
+
+        class CacheStub:
+            def panel(self, tickers, period, field):
+                requests.append((tickers, period))
+                return close
+
+        monkeypatch.setattr(backtest, "get_price_cache", lambda: CacheStub())
+        picks = pd.DataFrame({"date": [pd.Timestamp.now().normalize()], "ticker": ["UP"], "book": ["short"]})
+        run_backtest(picks=picks, horizons=(1,))
+        assert requests == [(["SPY", "UP"], "1y")]
+
+    def test_picks_default_to_run_history(self, close, tmp_path, monkeypatch):
+        """Test the default pick source is the run history store, not the output folder"""
+        class HistoryStub:
+            def picks_frame(self):
+                return pd.DataFrame({"date": pd.to_datetime(["2025-01-01"]), "ticker": ["UP"], "book": ["long"]})
+
+        class CacheStub:
+            def panel(self, tickers, period, field):
+                return close
+
+        monkeypatch.setattr(backtest, "get_run_history", lambda: HistoryStub())
+        monkeypatch.setattr(backtest, "get_price_cache", lambda: CacheStub())
+        _write(tmp_path, "run", "2025-01-02", ["DOWN"], [])
+
+        results, _ = run_backtest(horizons=(1,))
+        assert list(results["ticker"]) == ["UP"]
+        results, _ = run_backtest(str(tmp_path), horizons=(1,))
+        assert list(results["ticker"]) == ["DOWN"]
+
+    def test_thousands_of_picks_fast(self):
+        """Test scoring is vectorized"""
+        rng = np.random.default_rng(0)
+        dates = pd.bdate_range("2015-01-01", periods=2500)
+        tickers = [f"T{i}" for i in range(500)]
+        close = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (2500, 500)), axis=0)), index=dates, columns=tickers)
+        close["SPY"] = 100.0
+        picks = pd.DataFrame({
+            "date": dates[rng.integers(0, 2500, 20000)],
+            "ticker": rng.choice(tickers, 20000),
+            "book": rng.choice(["short", "long"], 20000),
+        })
+        start = time.perf_counter()
+        summary = summarize(forward_returns(close, picks))
+        assert time.perf_counter() - start < 5
+        assert summary["picks"].sum() > 0
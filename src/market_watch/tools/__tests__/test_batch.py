@@ -0,0 +1,94 @@
+"""Tests for batch.py"""
+import pytest
+from market_watch import batch
+from market_watch.batch import *
+from market_watch.tools import chart_assets, chart_renderer, fundamentals_cache, price_cache
+from market_watch.tools.run_context import LATEST_NAME, RunContext, list_runs
+
+
+@pytest.fixture
+def watchlists():
+    return {"tech": ["NVDA", "MSFT"], "income": ["MSFT", "XOM"]}
+
+
+@pytest.fixture
+def stub_caches(tmp_path, monkeypatch, counting_provider):
+    prices = price_cache.PriceCache(root=str(tmp_path / "prices"), provider=counting_provider)
+    fundamentals = fundamentals_cache.FundamentalsCache(path=str(tmp_path / "f.sqlite"), provider=counting_provider)
+    assets = chart_assets.ChartAssets(root=str(tmp_path / "assets"))
+    renderer = chart_renderer.ChartRenderer(root=str(tmp_path / "charts"), max_workers=1, assets=assets)
+    rendered = []
+    render = chart_renderer.render_chart
+    monkeypatch.setattr(chart_renderer, "render_chart", lambda ticker, *args: rendered.append(ticker) or render(ticker, *args))
+    monkeypatch.setattr(price_cache, "get_price_cache", lambda: prices)
+    monkeypatch.setattr(fundamentals_cache, "get_fundamentals_cache", lambda: fundamentals)
+    monkeypatch.setattr(chart_assets, "get_chart_assets", lambda: assets)
+    monkeypatch.setattr(chart_renderer, "get_chart_renderer", lambda: renderer)
+    counting_provider.rendered = rendered
+    return counting_provider
+
+
+class TestWatchlists:
+    """Test suite for load_watchlists and shared_tickers"""
+
+    def test_load_watchlists(self, tmp_path):
+        """Test both YAML forms load, upper-cased and de-duplicated"""
+        path = tmp_path / "watchlists.yaml"
+        path.write_text("tech:\n  tickers: [nvda, AMD, NVDA, ' ']\nincome: [xom, KO]\nempty:\n  tickers:\n")
+        assert load_watchlists(str(path)) == {"tech": ["NVDA", "AMD"], "income": ["XOM", "KO"], "empty": []}
+
+    def test_shipped_watchlists_load(self):
+        """Test config/watchlists.yaml parses"""
+        assert "MSFT" in shared_tickers(load_watchlists())
+
+    def test_shared_tickers(self, watchlists):
+        """Test only tickers on several watchlists are shared"""
+        assert shared_tickers(watchlists) == ["MSFT"]
+
+
+class TestRunBatch:
+    """Test suite for warm_shared_caches and run_batch"""
+
+    def test_shared_ticker_fetched_and_rendered_once(self, stub_caches, watchlists):
+        """Test a ticker on two watchlists is fetched, charted and looked up once"""
+        stats = warm_shared_caches(sorted({t for tickers in watchlists.values() for t in tickers}))
+        assert stats == {"tickers": 3, "priced": 3, "charts": 3}
+        assert sorted(stub_caches.requested) == ["MSFT", "NVDA", "XOM"]
+        assert sorted(stub_caches.rendered) == ["MSFT", "NVDA", "XOM"]
+        assert sorted(stub_caches.info_calls) == ["MSFT", "NVDA", "XOM"]
+
+    def test_run_batch_warms_then_runs_each_watchlist(self, stub_caches, watchlists, tmp_path, monkeypatch, inline_pool):
+        """Test run_batch warms once, runs every watchlist in its own workspace and collects old runs"""
+        def fake_run(batch_id, name, tickers, date, output_root):
+            assert sorted(stub_caches.requested) == ["MSFT", "NVDA", "XOM"]
+            with RunContext(run_id=f"{batch_id}-{name}", root=output_root, pointer=f"{LATEST_NAME}-{name}") as context:
+                pass
+            return {"watchlist": name, "run_id": context.run_id, "tickers": tickers, "date": date}
+
+        monkeypatch.setattr(batch, "run_watchlist", fake_run)
+        monkeypatch.setattr(batch, "ProcessPoolExecutor", inline_pool)
+        monkeypatch.setenv("MARKET_WATCH_KEEP_RUNS", "2")
+        root = str(tmp_path / "output")
+        for i in range(3):
+            with RunContext(run_id=f"20200101-00000{i}-old", root=root):
+                pass
+
+        results = run_batch(watchlists, workers=2, date="2026-01-05", output_root=root, warm=True)
+        assert [r["watchlist"] for r in results] == ["income", "tech"]
+        assert results[1]["tickers"] == ["NVDA", "MSFT"] and results[1]["date"] == "2026-01-05"
+        assert sorted(stub_caches.requested) == ["MSFT", "NVDA", "XOM"]
+        remaining = {r["run_id"] for r in list_runs(root)}
+        assert {r["run_id"] for r in results} <= remaining
+        assert "20200101-000000-old" not in remaining
+
+    def test_failed_watchlist_is_reported(self, watchlists, tmp_path, monkeypatch, inline_pool):
+        """Test one failing watchlist does not stop the others"""
+        def fake_run(batch_id, name, tickers, date, output_root):
+            if name == "tech":
+                raise RuntimeError("crew failed")
+            return {"watchlist": name}
+
+        monkeypatch.setattr(batch, "run_watchlist", fake_run)
+        monkeypatch.setattr(batch, "ProcessPoolExecutor", inline_pool)
+        results = run_batch(watchlists, output_root=str(tmp_path), warm=False)
+        assert results == [{"watchlist": "income"}, {"watchlist": "tech", "error": "crew failed"}]
@@ -0,0 +1,97 @@
+"""Tests for cassette.py"""
+import pytest
+from market_watch.tools.cassette import *
+
+
+class Counter:
+    """Callable that counts live calls."""
+
+    def __init__(self, response="live response"):
+        self.calls = 0
+        self.response = response
+
+    def __call__(self):
+        self.calls += 1
+        return self.response
+
+
+class TestCassette:
+    """Test suite for Cassette"""
+
+    def test_key_ignores_whitespace_and_order(self):
+        """Test equivalent requests share a key and different ones do not"""
+        a = request_key("llm", {"model": "m", "messages": [{"role": "user", "content": "Hello\n  world "}]})
+        b = request_key("llm", {"messages": [{"content": "Hello world", "role": "user"}], "model": "m"})
+        c = request_key("llm", {"model": "m", "messages": [{"role": "user", "content": "Hello there"}]})
+        assert a == b
+        assert a != c
+        assert a != request_key("brave", {"model": "m", "messages": [{"role": "user", "content": "Hello world"}]})
+
+    def test_off_always_calls(self, tmp_path):
+        """Test mode 'off' neither reads nor writes"""
+        cassette = Cassette(str(tmp_path), "off")
+        live = Counter()
+        cassette.through("llm", {"q": 1}, live)
+        cassette.through("llm", {"q": 1}, live)
+        assert live.calls == 2
+        assert not any(tmp_path.iterdir())
+
+    def test_record_then_replay(self, tmp_path):
+        """Test a recorded run is replayed without live calls"""
+        live = Counter()
+        assert Cassette(str(tmp_path), "record").through("llm", {"q": "x"}, live) == "live response"
+
+        replay = Cassette(str(tmp_path), "replay")
+        assert replay.through("llm", {"q": "x"}, live) == "live response"
+        assert live.calls == 1
+        assert replay.hits == 1
+
+    def test_replay_miss_raises(self, tmp_path):
+        """Test replay mode never falls through to a live call"""
+        live = Counter()
+        with pytest.raises(CassetteMiss):
+            Cassette(str(tmp_path), "replay").through("llm", {"q": "unknown"}, live)
+        assert live.calls == 0
+
+    def test_auto_records_misses(self, tmp_path):
+        """Test auto mode calls once per distinct request"""
+        cassette = Cassette(str(tmp_path), "auto")
+        live = Counter()
+        for _ in range(3):
+            cassette.through("brave", {"q": "nvda earnings"}, live)
+        assert live.calls == 1
+        assert (cassette.hits, cassette.misses) == (2, 1)
+
+    def test_structured_responses_recorded(self, tmp_path):
+        """Test JSON responses (e.g. tool calls) are recorded and replayed as-is"""
+        live = Counter(response=[{"tool": "x", "args": {"n": 1}}])
+        Cassette(str(tmp_path), "record").through("llm", {"q": 1}, live)
+        assert Cassette(str(tmp_path), "replay").through("llm", {"q": 1}, live) == [{"tool": "x", "args": {"n": 1}}]
+        assert live.calls == 1
+
+    def test_unserializable_responses_reported(self, tmp_path, capsys, caplog):
+        """Test responses that cannot be stored are counted and reported, not silently dropped"""
+        cassette = Cassette(str(tmp_path), "auto")
+        live = Counter(response=object())
+        cassette.through("llm", {"q": 1}, live)
+        cassette.through("llm", {"q": 1}, live)
+        assert live.calls == 2
+        assert cassette.unrecorded == 2
+        assert "not recorded" in caplog.text
+        assert capsys.readouterr().out == ""
+        assert not list(tmp_path.rglob("*.json"))
+
+    def test_error_responses_not_recorded(self, tmp_path):
+        """Test a transient error string is not replayed on later runs"""
+        cassette = Cassette(str(tmp_path), "auto")
+        failing = Counter(response="Error performing search: timeout")
+        assert cassette.through("brave", {"q": "nvda"}, failing).startswith("Error")
+        live = Counter()
+        assert cassette.through("brave", {"q": "nvda"}, live) == "live response"
+        assert live.calls == 1
+        assert Cassette(str(tmp_path), "replay").through("brave", {"q": "nvda"}, failing) == "live response"
+
+    def test_unknown_mode(self, tmp_path):
+        """Test invalid modes are rejected"""
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path), "sometimes")
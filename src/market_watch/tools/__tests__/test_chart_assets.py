@@ -0,0 +1,64 @@
+"""Tests for chart_assets.py"""
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from market_watch.tools.chart_assets import *
+from market_watch.tools.chart_renderer import ChartRenderer, render_chart, DEFAULT_CHART_PARAMS
+
+
+@pytest.fixture
+def chart(tmp_path):
+    index = pd.bdate_range("2025-01-01", periods=120)
+    path = str(tmp_path / "output" / "NVDA_chart.png")
+    os.makedirs(os.path.dirname(path))
+    return render_chart("NVDA", index.values, np.linspace(100, 150, 120), path, DEFAULT_CHART_PARAMS)
+
+
+class TestChartAssets:
+    """Test suite for ChartAssets"""
+
+    def test_variants_are_smaller(self, tmp_path, chart):
+        """Test every variant is resized and smaller than the source PNG"""
+        built = ChartAssets(root=str(tmp_path / "assets")).build(chart)
+        assert sorted(built) == ["print", "thumb", "web"]
+        assert built["print"]["width"] == 1200
+        assert built["thumb"]["width"] == 240
+        assert built["web"]["file"].endswith(".webp")
+        source_bytes = os.path.getsize(chart)
+        assert all(asset["bytes"] < source_bytes for asset in built.values())
+
+    def test_deduplicated_by_content(self, tmp_path, chart):
+        """Test identical charts share one set of encoded files"""
+        assets = ChartAssets(root=str(tmp_path / "assets"))
+        copy = os.path.join(os.path.dirname(chart), "AMD_chart.png")
+        with open(chart, 'rb') as src, open(copy, 'wb') as dst:
+            dst.write(src.read())
+        first = assets.build(chart)
+        mtime = os.path.getmtime(first["print"]["file"])
+        assert assets.build(copy) == first
+        assert os.path.getmtime(first["print"]["file"]) == mtime
+        assert len(os.listdir(tmp_path / "assets")) == 3
+
+    def test_publish_writes_manifest(self, tmp_path, chart):
+        """Test the manifest lists each ticker's variants relative to the output folder"""
+        output = str(tmp_path / "output")
+        ChartAssets(root=str(tmp_path / "assets")).publish({"nvda": chart}, output)
+        manifest = load_manifest(output)
+        entry = manifest["charts"]["NVDA"]
+        assert entry["source"] == "NVDA_chart.png"
+        assert os.path.exists(os.path.join(output, entry["variants"]["web"]["path"]))
+
+        prints = variant_paths(manifest, "print", output)
+        assert prints["NVDA_chart.png"].endswith("_print.png")
+        assert load_manifest(str(tmp_path / "empty")) == {"charts": {}}
+
+    def test_renderer_publishes_assets(self, tmp_path):
+        """Test ChartRenderer feeds the asset pipeline"""
+        close = pd.Series(np.linspace(10, 20, 60), index=pd.bdate_range("2025-01-01", periods=60))
+        output = str(tmp_path / "output")
+        renderer = ChartRenderer(root=str(tmp_path / "cache"), max_workers=1, assets=ChartAssets(root=str(tmp_path / "assets")))
+        renderer.render("AMD", close, output)
+        with open(os.path.join(output, MANIFEST_NAME)) as f:
+            assert "AMD" in json.load(f)["charts"]
@@ -0,0 +1,62 @@
+"""Tests for chart_renderer.py"""
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from market_watch.tools import chart_renderer
+from market_watch.tools.chart_renderer import *
+
+
+@pytest.fixture
+def close():
+    index = pd.bdate_range("2025-01-01", periods=120)
+    return pd.Series(np.linspace(100, 150, 120), index=index, name='Close')
+
+
+class TestChartKey:
+    """Test suite for chart_key"""
+
+    def test_stable_for_same_input(self, close):
+        """Test the key only depends on content"""
+        assert chart_key("NVDA", close, DEFAULT_CHART_PARAMS) == chart_key("NVDA", close.copy(), DEFAULT_CHART_PARAMS)
+
+    def test_changes_with_data_or_params(self, close):
+        """Test new bars or different plot settings produce a new key"""
+        key = chart_key("NVDA", close, DEFAULT_CHART_PARAMS)
+        changed = close.copy()
+        changed.iloc[-1] += 1
+        assert chart_key("NVDA", changed, DEFAULT_CHART_PARAMS) != key
+        assert chart_key("NVDA", close, dict(DEFAULT_CHART_PARAMS, yscale="linear")) != key
+        assert chart_key("AMD", close, DEFAULT_CHART_PARAMS) != key
+
+
+class TestChartRenderer:
+    """Test suite for ChartRenderer"""
+
+    def test_unchanged_charts_are_reused(self, tmp_path, close, monkeypatch):
+        """Test a second render of the same data draws nothing"""
+        renderer = ChartRenderer(root=str(tmp_path / "cache"), max_workers=1)
+        output = str(tmp_path / "output")
+        path = renderer.render("NVDA", close, output)
+        assert path == os.path.join(output, "NVDA_chart.png")
+        assert os.path.getsize(path) > 0
+
+        calls = []
+        monkeypatch.setattr(chart_renderer, "render_chart", lambda *args: calls.append(args))
+        renderer.render("NVDA", close, output)
+        assert calls == []
+
+    def test_render_many_in_process_pool(self, tmp_path, close):
+        """Test a batch is rendered by worker processes and published per ticker"""
+        renderer = ChartRenderer(root=str(tmp_path / "cache"), max_workers=2)
+        paths = renderer.render_many({"NVDA": close, "AMD": close * 2}, str(tmp_path / "output"))
+        assert sorted(paths) == ["AMD", "NVDA"]
+        assert all(os.path.exists(p) for p in paths.values())
+        assert len(os.listdir(tmp_path / "cache")) == 2
+
+    def test_warm_fills_cache_without_publishing(self, tmp_path, close):
+        """Test warm renders into the cache only and render_many then reuses it"""
+        renderer = ChartRenderer(root=str(tmp_path / "cache"), max_workers=1)
+        cached = renderer.warm({"NVDA": close})
+        assert os.path.exists(cached["NVDA"])
+        assert not os.path.exists(tmp_path / "output")
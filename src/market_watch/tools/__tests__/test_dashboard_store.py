@@ -0,0 +1,71 @@
+"""Tests for dashboard_store.py"""
+import gzip
+import json
+import os
+import pandas as pd
+import pytest
+from market_watch.tools.dashboard_store import *
+
+PICKS = {"short": [{"ticker": "NVDA", "reason": "Breakout"}], "long": [{"ticker": "NVDA", "reason": "AI"}, {"ticker": "PLTR", "reason": "Gov"}]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DashboardStore(str(tmp_path))
+
+
+class TestBuildShards:
+    """Test suite for build_shards"""
+
+    def test_per_ticker_details(self):
+        """Test each picked ticker gets one shard with all of its picks and data"""
+        snapshot = pd.DataFrame({"RSI_14": [70.0, float("nan")]}, index=["NVDA", "PLTR"])
+        shards = build_shards("# Report", PICKS, {"NVDA": {"source": "NVDA_chart.png"}}, snapshot, {"NVDA": {"beta": 1.7}})
+        assert sorted(shards) == ["charts", "report", "tickers/NVDA", "tickers/PLTR"]
+        nvda = shards["tickers/NVDA"]
+        assert [p["book"] for p in nvda["picks"]] == ["short", "long"]
+        assert nvda["indicators"] == {"RSI_14": 70.0}
+        assert nvda["fundamentals"] == {"beta": 1.7}
+        assert shards["tickers/PLTR"]["indicators"] == {"RSI_14": None}
+
+
+class TestDashboardStore:
+    """Test suite for DashboardStore"""
+
+    def test_publish_and_read(self, store):
+        """Test the index points at compressed shards that round-trip"""
+        index = store.publish({"top_short": PICKS["short"]}, build_shards("x" * 10000, PICKS))
+        assert index == store.load_index()
+        assert store.read_shard("report")["markdown"] == "x" * 10000
+        entry = index["shards"]["report"]
+        path = os.path.join(store.root, entry["files"]["gzip"])
+        assert os.path.getsize(path) < entry["bytes"] / 10
+        assert os.path.getsize(store.index_path) < 2000
+
+    def test_unchanged_shards_keep_etag(self, store):
+        """Test only changed shards get a new ETag and file"""
+        first = store.publish({"run": 1}, build_shards("same report", PICKS))
+        changed = dict(PICKS, short=[{"ticker": "NVDA", "reason": "New reason"}])
+        second = store.publish({"run": 2}, build_shards("same report", changed))
+        assert second["shards"]["report"] == first["shards"]["report"]
+        assert second["shards"]["tickers/PLTR"] == first["shards"]["tickers/PLTR"]
+        assert second["shards"]["tickers/NVDA"]["etag"] != first["shards"]["tickers/NVDA"]["etag"]
+        assert second["previous_etag"] == first["etag"]
+
+    def test_old_generations_collected(self, store):
+        """Test shard files are kept for one previous index and then removed"""
+        first = store.publish({}, {"report": {"markdown": "one"}})
+        store.publish({}, {"report": {"markdown": "two"}})
+        old = os.path.join(store.root, first["shards"]["report"]["files"]["gzip"])
+        assert os.path.exists(old)
+        store.publish({}, {"report": {"markdown": "three"}})
+        assert not os.path.exists(old)
+        assert len([f for f in os.listdir(store.root) if f.startswith("report.")]) == 2
+
+    def test_gzip_is_deterministic(self, store):
+        """Test identical content produces an identical file"""
+        index = store.publish({}, {"report": {"markdown": "one"}})
+        path = os.path.join(store.root, index["shards"]["report"]["files"]["gzip"])
+        with open(path, 'rb') as f:
+            assert json.loads(gzip.decompress(f.read())) == {"markdown": "one"}
+        assert shard_file_name("tickers/NVDA", "abc") == "tickers__NVDA.abc.json"
@@ -92,4 +92,14 @@ class TestGitHubPRTool:
         # TODO: Implement test
         pass
 
+    def test_incomplete_repo_config(self, monkeypatch):
+        """Test a repo without an owner is reported instead of calling /repos/None/..."""
+        monkeypatch.setenv("GITHUB_APP_ID", "1")
+        monkeypatch.setenv("GITHUB_PRIVATE_KEY_PATH", "key.pem")
+        monkeypatch.setenv("GITHUB_REPO", "widgets")
+        monkeypatch.delenv("GITHUB_OWNER", raising=False)
+        result = GitHubPRTool()._run("t", "b", "feature")
+        assert result.startswith("Error: Missing configuration")
+        assert "Owner=None" in result
+
 
@@ -0,0 +1,67 @@
+"""Tests for fundamentals_cache.py"""
+import time
+import pytest
+from market_watch.tools.fundamentals_cache import *
+
+
+@pytest.fixture
+def provider(counting_provider):
+    return counting_provider
+
+
+class TestFundamentalsCache:
+    """Test suite for FundamentalsCache"""
+
+    def test_repeat_lookups_hit_cache(self, tmp_path, provider):
+        """Test a second lookup and a new process are served from SQLite"""
+        path = str(tmp_path / "f.sqlite")
+        cache = FundamentalsCache(path=path, provider=provider)
+        first = cache.get("nvda")
+        assert first['marketCap'] == 1000
+        assert 'forwardPE' not in first
+        assert cache.get("NVDA") == first
+
+        reopened = FundamentalsCache(path=path, provider=provider)
+        assert reopened.get("NVDA") == first
+        assert provider.info_calls == ["NVDA"]
+
+    def test_per_field_ttl(self, tmp_path, provider):
+        """Test an expired fast-moving field triggers a refetch"""
+        cache = FundamentalsCache(path=str(tmp_path / "f.sqlite"), provider=provider, ttls={'marketCap': 0})
+        cache.get("AMD", fields=['sector'])
+        cache.get("AMD", fields=['sector'])
+        assert len(provider.info_calls) == 1
+        time.sleep(0.01)
+        cache.get("AMD", fields=['marketCap'])
+        assert len(provider.info_calls) == 2
+
+    def test_prefetch(self, tmp_path, provider):
+        """Test prefetch only fetches stale tickers and reports failures"""
+        cache = FundamentalsCache(path=str(tmp_path / "f.sqlite"), provider=provider)
+        cache.get("NVDA")
+        status = cache.prefetch(["NVDA", "amd", "PLTR", "BAD"])
+        assert status["NVDA"] == "cached"
+        assert status["AMD"] == status["PLTR"] == "fetched"
+        assert status["BAD"].startswith("error")
+        assert sorted(provider.info_calls) == ["AMD", "BAD", "NVDA", "PLTR"]
+
+    def test_as_of_reads_history(self, tmp_path, provider, monkeypatch):
+        """Test an as-of cache serves the values known by that date and never fetches"""
+        path = str(tmp_path / "f.sqlite")
+        live = FundamentalsCache(path=path, provider=provider)
+        monkeypatch.setattr(time, "time", lambda: 1_700_000_000.0)  # 2023-11-14
+        live.refresh("NVDA")
+        provider_info = provider.info
+        monkeypatch.setattr(provider, "info", lambda t: dict(provider_info(t), marketCap=2000))
+        monkeypatch.setattr(time, "time", lambda: 1_710_000_000.0)  # 2024-03-09
+        live.refresh("NVDA")
+        calls = len(provider.info_calls)
+
+        assert FundamentalsCache(path=path, provider=provider, as_of_date="2023-12-01").get("NVDA")['marketCap'] == 1000
+        assert FundamentalsCache(path=path, provider=provider, as_of_date="2024-03-09").get("NVDA")['marketCap'] == 2000
+        before = FundamentalsCache(path=path, provider=provider, as_of_date="2023-01-01")
+        assert before.get("NVDA") == {}
+        assert before.prefetch(["NVDA"]) == {"NVDA": "as-of"}
+        assert before.field_values("sector") == {}
+        assert FundamentalsCache(path=path, provider=provider, as_of_date="2023-12-01").field_values("sector") == {"NVDA": "Technology"}
+        assert len(provider.info_calls) == calls
@@ -0,0 +1,101 @@
+"""Tests for git_backend.py"""
+import os
+import subprocess
+import time
+import pytest
+from market_watch.tools.git_backend import *
+
+
+@pytest.fixture
+def repo(tmp_path):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "dev@example.com")
+    git("config", "user.name", "Dev")
+    (tmp_path / "README.md").write_text("hello\n")
+    git("add", "README.md")
+    git("commit", "-q", "-m", "init")
+    return tmp_path
+
+
+class TestGitBackend:
+    """Test suite for GitBackend"""
+
+    def test_add_many_files_in_one_spawn(self, repo):
+        """Hundreds of paths are staged with a single git invocation"""
+        paths = []
+        for i in range(300):
+            (repo / f"file {i}.txt").write_text(str(i))
+            paths.append(f"file {i}.txt")
+        backend = GitBackend(str(repo))
+        spawns = backend.stats["spawns"]
+        started = time.monotonic()
+        backend.commit("feat: add files", paths)
+        assert backend.stats["spawns"] - spawns == 2
+        assert time.monotonic() - started < 5
+        assert backend.status() == ""
+        tracked = subprocess.run(["git", "ls-files"], cwd=repo, capture_output=True, text=True).stdout
+        assert "file 299.txt" in tracked
+
+    def test_add_relative_to_subdirectory(self, repo):
+        """Paths are interpreted relative to the directory the backend was opened in"""
+        (repo / "pkg").mkdir()
+        (repo / "pkg" / "mod.py").write_text("x = 1\n")
+        backend = GitBackend(str(repo / "pkg"))
+        backend.add(["mod.py"])
+        assert backend.status().strip() == "A  mod.py"
+
+    def test_add_failure_raises(self, repo):
+        """A missing path surfaces git's error"""
+        with pytest.raises(GitError):
+            GitBackend(str(repo)).add(["nope.txt"])
+
+    def test_branches_from_refs(self, repo):
+        """Branch checks read refs, including packed ones, without spawning git"""
+        backend = GitBackend(str(repo))
+        backend.checkout("feature/x", create=True)
+        assert backend.current_branch() == "feature/x"
+        subprocess.run(["git", "pack-refs", "--all"], cwd=repo, check=True)
+        spawns = backend.stats["spawns"]
+        assert backend.branch_exists("main")
+        assert backend.branch_exists("feature/x")
+        assert not backend.branch_exists("feature")
+        assert not backend.branch_exists("mai")
+        assert backend.stats["spawns"] == spawns
+
+    def test_branch_names_are_validated(self, repo):
+        """Names git would reject never reach the filesystem lookup"""
+        (repo / ".git" / "refs" / "heads" / "x.lock").write_text("0" * 40)
+        backend = GitBackend(str(repo))
+        for name in ("../../config", "/main", "main/", "a..b", "x.lock", ".hidden", "a b", "-x", "a@{1}", "a:b", ""):
+            assert not valid_branch_name(name), name
+            assert not backend.branch_exists(name), name
+        assert valid_branch_name("feature/x-1.2")
+
+    def test_add_all_is_scoped_to_directory(self, repo):
+        """With no paths, only the backend's directory is staged, like `git add .`"""
+        (repo / "pkg").mkdir()
+        (repo / "pkg" / "mod.py").write_text("x = 1\n")
+        (repo / "other.txt").write_text("y\n")
+        backend = GitBackend(str(repo / "pkg"))
+        backend.add()
+        assert sorted(backend.status().splitlines()) == ["?? ../other.txt", "A  mod.py"]
+
+    def test_resolve_reuses_one_process(self, repo):
+        """Object queries go through one long-lived cat-file process"""
+        backend = GitBackend(str(repo))
+        head = backend.resolve("HEAD")
+        assert head and len(head) == 40
+        spawns = backend.stats["spawns"]
+        for _ in range(50):
+            assert backend.resolve("refs/heads/main") == head
+        assert backend.resolve("refs/heads/missing") is None
+        assert backend.stats["spawns"] == spawns
+        assert backend.stats["batch_queries"] == 52
+        backend.close()
+        assert backend.resolve("HEAD") == head
+
+    def test_get_git_backend_is_shared(self, repo):
+        """One backend per directory"""
+        assert get_git_backend(str(repo)) is get_git_backend(str(repo))
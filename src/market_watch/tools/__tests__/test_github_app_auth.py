@@ -0,0 +1,125 @@
+"""Tests for github_app_auth.py"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from market_watch.tools.github_app_auth import *
+
+
+def _app_endpoints(stub, public_key):
+    """Replies of the two GitHub App endpoints: installation lookup and token creation."""
+    def authorized(headers):
+        token = headers.get("Authorization", "").removeprefix("Bearer ")
+        try:
+            return jwt.decode(token, public_key, algorithms=["RS256"])["iss"] == "123"
+        except jwt.PyJWTError:
+            return False
+
+    def respond(method, path, headers):
+        if method == "POST":
+            time.sleep(stub.delay)
+        if not authorized(headers):
+            return 401, {}, {"message": "Bad credentials"}
+        if method == "GET":
+            if path == "/repos/acme/widgets/installation":
+                return 200, {}, {"id": 42}
+            return 404, {}, {"message": "Not Found"}
+        expires = datetime.now(timezone.utc) + timedelta(seconds=stub.token_lifetime)
+        return 201, {}, {"token": f"ghs_{len(stub.requests)}", "expires_at": expires.strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+    return respond
+
+
+@pytest.fixture
+def key_path(tmp_path):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path = tmp_path / "app.pem"
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL, serialization.NoEncryption()
+    ))
+    return str(path), key.public_key()
+
+
+@pytest.fixture
+def stub(key_path, github_stub):
+    github_stub.token_lifetime = 3600
+    github_stub.delay = 0.0
+    github_stub.respond = _app_endpoints(github_stub, key_path[1])
+    return github_stub
+
+
+class TestParseRepo:
+    """Test suite for parse_repo"""
+
+    def test_forms(self):
+        """Test owner + repo and 'owner/repo' forms"""
+        assert parse_repo("acme", "widgets") == ("acme", "widgets")
+        assert parse_repo(None, "acme/widgets") == ("acme", "widgets")
+        assert parse_repo("other", "acme/widgets") == ("acme", "widgets")
+
+
+class TestInstallationTokenManager:
+    """Test suite for InstallationTokenManager"""
+
+    def test_token_cached(self, key_path, stub):
+        """Test repeated calls reuse the installation id and the token"""
+        manager = InstallationTokenManager("123", key_path[0], api_url=stub.url)
+        tokens = {manager.token("acme", "widgets") for _ in range(5)}
+        assert len(tokens) == 1
+        assert stub.count("GET") == 1 and stub.count("POST") == 1
+        assert manager.stats["hits"] == 4
+
+    def test_key_parsed_once(self, key_path, stub, tmp_path):
+        """Test the PEM file is only read for the first JWT"""
+        auth = GitHubAppAuth("123", key_path[0], api_url=stub.url)
+        first = auth.generate_jwt()
+        (tmp_path / "app.pem").unlink()
+        assert auth.generate_jwt() == first
+        auth._jwt = None
+        assert jwt.decode(auth.generate_jwt(), key_path[1], algorithms=["RS256"])["iss"] == "123"
+
+    def test_refresh_before_expiry(self, key_path, stub):
+        """Test a token inside the refresh margin is replaced"""
+        stub.token_lifetime = 120
+        manager = InstallationTokenManager("123", key_path[0], api_url=stub.url, refresh_margin=300)
+        first = manager.token("acme", "widgets")
+        assert manager.token("acme", "widgets") != first
+        assert stub.count("POST") == 2 and stub.count("GET") == 1
+
+    def test_concurrent_callers_refresh_once(self, key_path, stub):
+        """Test simultaneous callers share one installation lookup and one token request"""
+        stub.delay = 0.2
+        manager = InstallationTokenManager("123", key_path[0], api_url=stub.url)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.token("acme", "widgets"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(results)) == 1 and len(results) == 8
+        assert stub.count("GET") == 1 and stub.count("POST") == 1
+
+    def test_persistence(self, key_path, stub, tmp_path):
+        """Test a persisted token is reused by a new manager"""
+        cache = str(tmp_path / "tokens.json")
+        token = InstallationTokenManager("123", key_path[0], api_url=stub.url, cache_path=cache).token("acme", "widgets")
+        assert oct(os.stat(cache).st_mode & 0o777) == "0o600"
+        again = InstallationTokenManager("123", key_path[0], api_url=stub.url, cache_path=cache)
+        assert again.token("acme", "widgets") == token
+        assert len(stub.requests) == 2
+
+        other_app = InstallationTokenManager("999", key_path[0], api_url=stub.url, cache_path=cache)
+        assert other_app._tokens == {}
+
+    def test_invalidate_and_errors(self, key_path, stub):
+        """Test invalidate forces a new token and API errors surface"""
+        manager = InstallationTokenManager("123", key_path[0], api_url=stub.url)
+        manager.token("acme", "widgets")
+        manager.invalidate("acme", "widgets")
+        manager.token("acme", "widgets")
+        assert stub.count("POST") == 2
+        with pytest.raises(Exception, match="Failed to get installation ID"):
+            manager.token("acme", "missing")
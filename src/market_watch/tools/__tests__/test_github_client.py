@@ -0,0 +1,111 @@
+"""Tests for github_client.py"""
+import json
+import time
+import pytest
+import requests
+from market_watch.tools.github_client import *
+
+
+class FakeTokens:
+    """Stands in for InstallationTokenManager."""
+
+    def __init__(self, api_url):
+        self.api_url = api_url
+        self.issued = 0
+        self.invalidated = 0
+
+    def token(self, owner, repo):
+        return f"tok{self.issued}"
+
+    def invalidate(self, owner, repo):
+        self.invalidated += 1
+        self.issued += 1
+
+
+@pytest.fixture
+def client(github_stub):
+    sleeps = []
+    client = GitHubClient(FakeTokens(github_stub.url), backoff=0.01, sleep=sleeps.append)
+    client.sleeps = sleeps
+    return client
+
+
+class TestGitHubClient:
+    """Test suite for GitHubClient"""
+
+    def test_keep_alive_and_headers(self, client, github_stub):
+        """Test calls reuse one connection and carry auth headers"""
+        for _ in range(3):
+            assert client.get("acme", "widgets", "/repos/acme/widgets").status_code == 200
+        assert len(github_stub.connections) == 1
+        assert github_stub.requests[0][2]["Authorization"] == "Bearer tok0"
+        assert github_stub.requests[0][2]["X-GitHub-Api-Version"] == API_VERSION
+
+    def test_conditional_get(self, client, github_stub):
+        """Test a 304 returns the cached body"""
+        github_stub.script = [(200, {"ETag": '"v1"'}, {"name": "widgets"}), (304, {"ETag": '"v1"'}, None)]
+        first = client.get("acme", "widgets", "/repos/acme/widgets")
+        second = client.get("acme", "widgets", "/repos/acme/widgets")
+        assert second.json() == {"name": "widgets"} and second is first
+        assert github_stub.requests[1][2]["If-None-Match"] == '"v1"'
+        assert client.stats["not_modified"] == 1
+
+    def test_retry_after_and_backoff(self, client, github_stub):
+        """Test rate-limited and 5xx GETs are retried with the server's delay or backoff"""
+        github_stub.script = [(429, {"Retry-After": "7"}, {}), (502, {}, {}), (200, {}, {"ok": True})]
+        assert client.get("acme", "widgets", "/x").status_code == 200
+        assert client.sleeps[0] == 7.0 and 0 < client.sleeps[1] < 1
+        assert client.stats["retries"] == 2
+
+    def test_post_not_retried_on_server_error(self, client, github_stub):
+        """Test a POST that may have been processed is not resent"""
+        github_stub.script = [(502, {}, {})]
+        assert client.create_issue("acme", "widgets", "t", "b").status_code == 502
+        assert len(github_stub.requests) == 1
+        github_stub.script = [(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()))}, {}),
+                       (201, {}, {"html_url": "u"})]
+        assert client.create_issue("acme", "widgets", "t", "b").json() == {"html_url": "u"}
+        assert json.loads(github_stub.requests[-1][3]) == {"title": "t", "body": "b"}
+
+    def test_401_refreshes_token_once(self, client, github_stub):
+        """Test an expired token is invalidated and the call repeated with a new one"""
+        github_stub.script = [(401, {}, {}), (201, {}, {})]
+        assert client.create_pull("acme", "widgets", "t", "b", "feature").status_code == 201
+        assert client.tokens.invalidated == 1
+        assert github_stub.requests[1][2]["Authorization"] == "Bearer tok1"
+
+    def test_quota_pacing(self, client, github_stub):
+        """Test a nearly spent quota spreads calls until the reset"""
+        reset = time.time() + 100
+        github_stub.script = [(200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(reset)}, {})]
+        client.get("acme", "widgets", "/x")
+        assert client.quota_delay(now=reset - 100) == pytest.approx(10.0)
+        client.get("acme", "widgets", "/y")
+        assert client.sleeps and client.sleeps[0] == pytest.approx(10.0, abs=0.5)
+
+        client.quota = {"limit": 5000, "remaining": 4000, "reset": reset}
+        assert client.quota_delay() == 0
+        client.quota = {"limit": 5000, "remaining": 0, "reset": reset}
+        assert client.quota_delay(now=reset - 30) == 30
+
+    def test_connection_refused_is_retried(self, github_stub):
+        """Test a POST to a closed port is retried, then raises"""
+        sleeps = []
+        client = GitHubClient(FakeTokens("http://127.0.0.1:9"), max_retries=2, backoff=0.01, sleep=sleeps.append)
+        with pytest.raises(requests.ConnectionError):
+            client.create_issue("acme", "widgets", "t", "b")
+        assert len(sleeps) == 2
+
+    def test_post_not_retried_once_sent(self, client, monkeypatch):
+        """Test a POST that may have reached GitHub (read timeout, dropped connection) is not resent"""
+        for error in (requests.ReadTimeout("read timed out"), requests.ConnectionError("Connection refused by peer")):
+            calls = []
+
+            def fail(*args, **kwargs):
+                calls.append(1)
+                raise error
+
+            monkeypatch.setattr(client.session, "request", fail)
+            with pytest.raises(type(error)):
+                client.create_issue("acme", "widgets", "t", "b")
+            assert len(calls) == 1
@@ -0,0 +1,77 @@
+"""Tests for indicator_engine.py"""
+import numpy as np
+import pandas as pd
+import pytest
+from market_watch.tools.indicator_engine import *
+from market_watch.tools.indicators import latest_snapshot
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(11)
+    index = pd.bdate_range("2024-01-01", periods=400)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))
+    return pd.DataFrame({'Close': close}, index=index)
+
+
+class TestWarmupPlanning:
+    """Test suite for warmup_bars and lookback_period"""
+
+    def test_sma_200_needs_200_bars(self):
+        """Test the plan covers SMA 200 (a 6 month window does not)"""
+        assert warmup_bars(["SMA_200"]) == 200
+        assert warmup_bars(DEFAULT_INDICATORS) >= 200
+        days = int(lookback_period(DEFAULT_INDICATORS)[:-1])
+        assert days > 200 * 365 / 252
+
+    def test_unknown_indicator(self):
+        """Test unsupported names are rejected"""
+        with pytest.raises(ValueError):
+            warmup_bars(["VWAP_20"])
+
+
+class TestIndicatorEngine:
+    """Test suite for IndicatorEngine"""
+
+    def test_matches_vectorized_indicators(self, tmp_path, bars):
+        """Test streamed values equal the full-history vectorized computation"""
+        engine = IndicatorEngine(root=str(tmp_path))
+        values = engine.update("NVDA", bars)
+        expected = latest_snapshot(bars[['Close']].rename(columns={'Close': 'NVDA'})).loc["NVDA"]
+        for column, value in expected.items():
+            assert values[column] == pytest.approx(value, rel=1e-9)
+
+    def test_incremental_updates_persist(self, tmp_path, bars):
+        """Test a new engine resumes from disk and only applies the new bars"""
+        IndicatorEngine(root=str(tmp_path)).update("AMD", bars.iloc[:300])
+        resumed = IndicatorEngine(root=str(tmp_path))
+        assert resumed.load("AMD").bars == 299
+
+        values = resumed.update("AMD", bars)
+        full = IndicatorEngine(root=str(tmp_path / "fresh")).update("AMD", bars)
+        assert resumed.load("AMD").bars == 399
+        for column, value in full.items():
+            assert values[column] == pytest.approx(value, rel=1e-9)
+
+    def test_forming_bar_is_not_committed(self, tmp_path, bars):
+        """Test a revised final bar replaces the provisional one"""
+        engine = IndicatorEngine(root=str(tmp_path))
+        engine.update("PLTR", bars)
+        revised = bars.copy()
+        revised.iloc[-1, 0] *= 1.05
+        assert engine.update("PLTR", revised)['Close'] == revised['Close'].iloc[-1]
+        assert engine.load("PLTR").bars == 399
+
+    def test_adjusted_history_rebuilds_state(self, tmp_path, bars):
+        """Test a split-adjusted history invalidates the stored state"""
+        engine = IndicatorEngine(root=str(tmp_path))
+        engine.update("SMCI", bars)
+        split = bars / 10
+        values = engine.update("SMCI", split)
+        assert values['SMA_50'] == pytest.approx(split['Close'].iloc[-50:].mean())
+
+    def test_short_history(self, tmp_path, bars):
+        """Test indicators without enough history are reported as None"""
+        values = IndicatorEngine(root=str(tmp_path)).update("ARM", bars.iloc[:60])
+        assert values['SMA_200'] is None
+        assert values['SMA_50'] is not None
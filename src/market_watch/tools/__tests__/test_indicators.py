@@ -0,0 +1,67 @@
+"""Tests for indicators.py"""
+import numpy as np
+import pandas as pd
+import pytest
+from market_watch.tools.indicators import *
+
+
+@pytest.fixture
+def close_panel():
+    rng = np.random.default_rng(7)
+    index = pd.bdate_range("2025-01-01", periods=260)
+    walks = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(260, 3)), axis=0))
+    return pd.DataFrame(walks, index=index, columns=["NVDA", "AMD", "PLTR"])
+
+
+def _wilder_rsi(values, length):
+    deltas = np.diff(values)
+    gains, losses = np.clip(deltas, 0, None), np.clip(-deltas, 0, None)
+    avg_gain, avg_loss = gains[0], losses[0]
+    for gain, loss in zip(gains[1:], losses[1:]):
+        avg_gain = avg_gain + (gain - avg_gain) / length
+        avg_loss = avg_loss + (loss - avg_loss) / length
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+class TestIndicators:
+    """Test suite for the vectorized indicator functions"""
+
+    def test_sma(self, close_panel):
+        """Test SMA matches a plain mean of the trailing window"""
+        result = sma(close_panel, 50)
+        assert result.iloc[:49].isna().all().all()
+        assert result.iloc[-1]["AMD"] == pytest.approx(close_panel["AMD"].iloc[-50:].mean())
+
+    def test_rsi_matches_wilder_recursion(self, close_panel):
+        """Test RSI uses Wilder smoothing column by column"""
+        result = rsi(close_panel, 14)
+        for ticker in close_panel.columns:
+            expected = _wilder_rsi(close_panel[ticker].to_numpy(), 14)
+            assert result[ticker].iloc[-1] == pytest.approx(expected)
+
+    def test_rsi_without_losses(self):
+        """Test a monotonic rise yields RSI 100"""
+        rising = pd.DataFrame({"UP": np.arange(1.0, 40.0)})
+        assert rsi(rising, 14)["UP"].iloc[-1] == 100.0
+
+    def test_macd_histogram(self, close_panel):
+        """Test the MACD histogram is line minus signal"""
+        line, signal, hist = macd(close_panel)
+        pd.testing.assert_frame_equal(hist, line - signal)
+
+
+class TestLatestSnapshot:
+    """Test suite for latest_snapshot"""
+
+    def test_one_row_per_ticker(self, close_panel):
+        """Test the snapshot has a row per ticker and every indicator column"""
+        snapshot = latest_snapshot(close_panel)
+        assert list(snapshot.index) == ["NVDA", "AMD", "PLTR"]
+        assert list(snapshot.columns) == ['Close', 'RSI_14', 'MACD_12_26_9', 'MACDs_12_26_9', 'SMA_50', 'SMA_200']
+        assert snapshot.notna().all().all()
+
+    def test_uses_last_valid_value(self, close_panel):
+        """Test a ticker missing the final session keeps its previous close"""
+        close_panel.iloc[-1, 0] = np.nan
+        snapshot = latest_snapshot(close_panel)
+        assert snapshot.loc["NVDA", "Close"] == close_panel["NVDA"].iloc[-2]
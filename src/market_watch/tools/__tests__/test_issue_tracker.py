@@ -0,0 +1,190 @@
+"""Tests for issue_tracker.py"""
+import threading
+import time
+import pytest
+from market_watch.tools.issue_tracker import *
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeClient:
+    """Stands in for GitHubClient, recording calls and peak concurrency."""
+
+    def __init__(self, existing=None, fail_titles=(), timeout_titles=()):
+        self.existing = existing or []
+        self.fail_titles = set(fail_titles)
+        # Created on GitHub, but the response is lost (read timeout).
+        self.timeout_titles = set(timeout_titles)
+        self.created = []
+        self.gets = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, owner, repo, path, **kwargs):
+        self.gets += 1
+        return FakeResponse(200, self.existing if kwargs["params"]["page"] == 1 else [])
+
+    def create_issue(self, owner, repo, title, body, **fields):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+            if title in self.fail_titles:
+                return FakeResponse(422, {"message": "Validation Failed"})
+            self.created.append({"title": title, "body": body, **fields})
+            number = len(self.created)
+            if title in self.timeout_titles:
+                self.existing.append({"number": number, "html_url": f"https://github.test/issues/{number}",
+                                      "title": title, "body": body})
+                raise TimeoutError("read timed out")
+        return FakeResponse(201, {"number": number, "html_url": f"https://github.test/issues/{number}"})
+
+
+@pytest.fixture
+def index(tmp_path):
+    return IssueIndex(str(tmp_path / "issues.sqlite"))
+
+
+def findings(n):
+    return [{"title": f"Alert {i}", "body": "b", "labels": ["bug"], "key": f"volatility|T{i}|2026-01-05"} for i in range(n)]
+
+
+class TestFingerprint:
+    """Test suite for fingerprints"""
+
+    def test_ignores_whitespace_and_case(self):
+        """Formatting differences do not change the fingerprint"""
+        assert fingerprint("TODO|a.py|# TODO: fix  it") == fingerprint("todo|a.py|# todo: fix it ")
+        assert fingerprint("a") != fingerprint("b")
+
+    def test_key_preferred_over_title(self):
+        """The key identifies a finding even when its title changes"""
+        assert finding_fingerprint({"title": "x", "key": "k"}) == finding_fingerprint({"title": "y", "key": "k"})
+        assert finding_fingerprint({"title": "x"}) == fingerprint("x")
+
+    def test_todo_fingerprint_survives_line_moves(self, tmp_path):
+        """Moving a TODO to another line keeps its fingerprint; test files are skipped"""
+        (tmp_path / "mod.py").write_text("# TODO: cache this\n")
+        (tmp_path / "test_mod.py").write_text("# TODO: ignored\n")
+        before = todo_findings(str(tmp_path))
+        (tmp_path / "mod.py").write_text("import os\n\n# TODO: cache this\n")
+        after = todo_findings(str(tmp_path))
+        assert len(before) == len(after) == 1
+        assert before[0]["title"] == "[TODO] cache this"
+        assert before[0]["labels"] == ["enhancement"]
+        assert finding_fingerprint(before[0]) == finding_fingerprint(after[0])
+        assert "line 3" in after[0]["body"]
+
+    def test_todo_only_in_comments(self, tmp_path):
+        """Strings, identifiers, DEBUG and prose mentioning TODO are not findings"""
+        (tmp_path / "mod.py").write_text(
+            'TODO_LABELS = {"TODO": 1}\n'
+            'msg = "No TODOs found # TODO: not a comment"\n'
+            'TEMPLATE = """\n# TODO: Implement test\n"""\n'
+            '# DEBUG output below\n'
+            '# the BUG tracker is external\n'
+            'x = 1  # FIXME: off by one\n'
+            '#BUG(anna) crashes on empty input\n'
+        )
+        (tmp_path / "app.ts").write_text('const url = "http://x//TODO";\n// TODO: debounce\n')
+        titles = sorted(f["title"] for f in todo_findings(str(tmp_path)))
+        assert titles == ["[BUG] (anna) crashes on empty input", "[FIXME] off by one", "[TODO] debounce"]
+
+
+class TestBulkIssueCreator:
+    """Test suite for BulkIssueCreator"""
+
+    def test_creates_concurrently_then_noop(self, index):
+        """New findings are created in parallel; a repeated scan makes no calls"""
+        client = FakeClient()
+        creator = BulkIssueCreator(client, index, max_workers=4)
+        results = creator.file("o", "r", findings(8))
+        assert sorted(r["status"] for r in results) == ["created"] * 8
+        assert client.peak > 1
+        assert all(MARKER.format(r["fingerprint"]) in c["body"] for r, c in zip(
+            sorted(results, key=lambda r: r["title"]), sorted(client.created, key=lambda c: c["title"])))
+        assert client.created[0]["labels"] == ["bug"]
+
+        gets = client.gets
+        again = creator.file("o", "r", findings(8))
+        assert [r["status"] for r in again] == ["exists"] * 8
+        assert len(client.created) == 8
+        assert client.gets == gets
+
+    def test_duplicates_in_batch_and_limit(self, index):
+        """Duplicate findings are filed once and at most `limit` issues are created"""
+        client = FakeClient()
+        results = BulkIssueCreator(client, index).file("o", "r", findings(3) + findings(3), limit=2)
+        assert len(results) == 3
+        assert sorted(r["status"] for r in results) == ["created", "created", "skipped"]
+        rerun = BulkIssueCreator(client, index).file("o", "r", findings(3), limit=2)
+        assert sorted(r["status"] for r in rerun) == ["created", "exists", "exists"]
+
+    def test_failure_releases_reservation(self, index):
+        """A failed create is retried on the next scan"""
+        client = FakeClient(fail_titles={"Alert 0"})
+        creator = BulkIssueCreator(client, index)
+        assert creator.file("o", "r", findings(1))[0]["status"] == "failed"
+        client.fail_titles.clear()
+        assert creator.file("o", "r", findings(1))[0]["status"] == "created"
+
+    def test_seeds_index_from_existing_issues(self, index):
+        """Issues filed earlier (e.g. from another machine) are found by their marker"""
+        fp = finding_fingerprint(findings(1)[0])
+        client = FakeClient(existing=[{"number": 7, "html_url": "u7", "title": "Alert 0",
+                                       "body": f"old\n\n{MARKER.format(fp)}"}])
+        results = BulkIssueCreator(client, index).file("o", "r", findings(2))
+        assert {r["title"]: r["status"] for r in results} == {"Alert 0": "exists", "Alert 1": "created"}
+        assert client.gets == 1
+
+    def test_pending_reservation_blocks_other_runs(self, index):
+        """A finding another run is filing right now is not filed twice"""
+        fp = finding_fingerprint(findings(1)[0])
+        assert index.reserve("o/r", fp, "Alert 0")
+        assert not index.reserve("o/r", fp, "Alert 0")
+        client = FakeClient()
+        index.record("o/r", "seed", 1, "u")
+        results = BulkIssueCreator(client, index).file("o", "r", findings(1))
+        assert results[0]["status"] == "exists" and client.created == []
+        assert "1 already filed" in format_results(results)
+
+    def test_expired_reservation_is_reclaimed(self, tmp_path):
+        """A reservation left by a crashed run stops blocking the finding once it expires"""
+        index = IssueIndex(str(tmp_path / "issues.sqlite"), pending_timeout=60)
+        fp = finding_fingerprint(findings(1)[0])
+        index.record("o/r", "seed", 1, "u")
+        assert index.reserve("o/r", fp, "Alert 0")
+        client = FakeClient()
+        creator = BulkIssueCreator(client, index)
+        assert creator.file("o", "r", findings(1))[0]["status"] == "exists"
+
+        index._conn.execute("UPDATE issues SET updated_at = updated_at - 120 WHERE fingerprint = ?", (fp,))
+        gets = client.gets
+        assert creator.file("o", "r", findings(1))[0]["status"] == "created"
+        assert client.gets == gets + 1
+        assert len(client.created) == 1
+
+    def test_ambiguous_failure_does_not_duplicate(self, tmp_path):
+        """An issue created despite a lost response is found by re-sync, not filed again"""
+        index = IssueIndex(str(tmp_path / "issues.sqlite"), pending_timeout=60)
+        index.record("o/r", "seed", 1, "u")
+        client = FakeClient(timeout_titles={"Alert 0"})
+        creator = BulkIssueCreator(client, index)
+        assert creator.file("o", "r", findings(1))[0]["status"] == "failed"
+        assert creator.file("o", "r", findings(1))[0]["status"] == "exists"
+
+        index._conn.execute("UPDATE issues SET updated_at = updated_at - 120")
+        result = creator.file("o", "r", findings(1))[0]
+        assert result["status"] == "exists" and result["number"] == 1
+        assert len(client.created) == 1
@@ -0,0 +1,91 @@
+"""Tests for markdown_compiler.py"""
+import time
+import pytest
+from PIL import Image
+from market_watch.tools.markdown_compiler import *
+
+REPORT = """# Market Watch Monthly
+Intro with **bold** text.
+
+## Top 5 Short-Term Picks
+- **NVDA**: Breakout above resistance.
+- AMD - Oversold bounce
+- **BRK.B**: Steady.
+
+## Top 5 Long-Term Picks
+- **PLTR**: Government contracts.
+
+## Risks
+- **TSLA**: Not a pick.
+
+| Ticker | RSI |
+|---|---|
+| NVDA | 71.2 |
+
+![NVDA Chart](NVDA_chart.png)
+---
+"""
+
+
+@pytest.fixture
+def chart(tmp_path):
+    path = tmp_path / "NVDA_chart.png"
+    Image.new("RGB", (20, 10), "white").save(path)
+    return str(path)
+
+
+class TestTokenize:
+    """Test suite for tokenize"""
+
+    def test_block_kinds(self):
+        """Test each line becomes the right token"""
+        kinds = [kind for kind, _ in tokenize("# T\n- a\n| x | y |\n![c](p.png)\n---\n\ntext")]
+        assert kinds == [HEADING, BULLET, TABLE_ROW, IMAGE, RULE, BLANK, PARAGRAPH]
+
+    def test_inline_bold(self):
+        """Test bold spans split into runs"""
+        assert list(split_bold("a **b** c")) == [("a ", False), ("b", True), (" c", False)]
+
+    def test_parse_pick(self):
+        """Test ticker and reason are extracted from bullet variants"""
+        assert parse_pick("**NVDA**: Strong") == {"ticker": "NVDA", "reason": "Strong"}
+        assert parse_pick("AMD - Oversold") == {"ticker": "AMD", "reason": "Oversold"}
+        assert parse_pick("Watch rates closely") is None
+
+
+class TestReportCompiler:
+    """Test suite for ReportCompiler"""
+
+    def test_compile(self, tmp_path, chart):
+        """Test picks, tables and markdown images come out of one compile"""
+        report = compile_report(REPORT, base_dir=str(tmp_path))
+        assert [p["ticker"] for p in report.picks["short"]] == ["NVDA", "AMD", "BRK.B"]
+        assert report.picks["long"] == [{"ticker": "PLTR", "reason": "Government contracts."}]
+        assert report.images == [chart]
+        assert len(report.document.tables) == 1
+        assert report.document.tables[0].cell(1, 1).text == "71.2"
+        assert len(report.document.inline_shapes) == 1
+
+    def test_extra_images_not_duplicated(self, tmp_path, chart):
+        """Test chart_paths already embedded in the markdown are not added again"""
+        report = compile_report(f"![c]({chart})", extra_images=[chart, "missing.png"])
+        assert report.images == [chart]
+        assert report.missing_images == ["missing.png"]
+        assert len(report.document.inline_shapes) == 1
+
+    def test_large_report(self):
+        """Test a multi-hundred-ticker report compiles quickly"""
+        lines = ["## Top 5 Short-Term Picks"] + [f"- **T{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}**: reason {i}" for i in range(500)]
+        started = time.perf_counter()
+        report = compile_report("\n".join(lines))
+        assert time.perf_counter() - started < 5
+        assert len(report.picks["short"]) == 500
+
+    def test_substitutes(self, tmp_path, chart):
+        """Test an image is embedded from its substitute (e.g. the print variant)"""
+        small = tmp_path / "small.png"
+        Image.new("RGB", (4, 2), "black").save(small)
+        report = compile_report(f"![c]({chart})", substitutes={"NVDA_chart.png": str(small)})
+        assert report.images == [chart]
+        blob = report.document.inline_shapes[0]._inline.graphic.graphicData.pic.blipFill.blip.embed
+        assert report.document.part.related_parts[blob].image.px_width == 4
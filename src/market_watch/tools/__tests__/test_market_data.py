@@ -0,0 +1,77 @@
+"""Tests for market_data.py"""
+import pandas as pd
+import pytest
+from market_watch.tools.market_data import *
+from market_watch.tools.price_cache import PriceCache
+
+
+class StubProvider(MarketDataProvider):
+    """In-memory provider standing in for yfinance."""
+
+    name = "stub"
+
+    def __init__(self):
+        index = pd.bdate_range("2024-01-01", periods=300)
+        self.frame = pd.DataFrame({'Close': range(300), 'Volume': [1] * 300}, index=index, dtype=float)
+
+    def history(self, ticker, period=None, start=None):
+        return self.frame
+
+    def info(self, ticker):
+        return {'longName': f'{ticker} Corp', 'marketCap': 1000}
+
+
+class TestCreateProvider:
+    """Test suite for create_provider"""
+
+    def test_modes(self, tmp_path, monkeypatch):
+        """Test the MARKET_DATA_PROVIDER modes"""
+        monkeypatch.setenv("MARKET_DATA_REPLAY_DIR", str(tmp_path))
+        assert isinstance(create_provider("yfinance"), YFinanceProvider)
+        assert isinstance(create_provider("replay"), ReplayProvider)
+        assert isinstance(create_provider("record"), RecordingProvider)
+        with pytest.raises(ValueError):
+            create_provider("bloomberg")
+
+
+class TestRecordAndReplay:
+    """Test suite for RecordingProvider and ReplayProvider"""
+
+    def test_round_trip(self, tmp_path):
+        """Test recorded bars and fundamentals replay offline"""
+        recorder = RecordingProvider(StubProvider(), root=str(tmp_path))
+        recorded = recorder.history("NVDA", period="1y")
+        recorder.info("NVDA")
+
+        replay = ReplayProvider(root=str(tmp_path))
+        pd.testing.assert_frame_equal(replay.history("NVDA"), recorded, check_freq=False)
+        assert replay.info("NVDA")['longName'] == 'NVDA Corp'
+        assert replay.history("MISSING").empty
+        assert replay.info("MISSING") == {}
+
+    def test_period_is_relative_to_last_bar(self, tmp_path):
+        """Test replayed periods do not depend on the wall clock"""
+        RecordingProvider(StubProvider(), root=str(tmp_path)).history("AMD")
+        replay = ReplayProvider(root=str(tmp_path))
+        month = replay.history("AMD", period="1mo")
+        assert month.index[-1] == pd.Timestamp("2025-02-21")
+        assert len(month) < 25
+
+    def test_price_cache_runs_offline(self, tmp_path):
+        """Test the price cache can be served entirely from a replay"""
+        RecordingProvider(StubProvider(), root=str(tmp_path / "rec")).history("PLTR")
+        cache = PriceCache(root=str(tmp_path / "cache"), provider=ReplayProvider(root=str(tmp_path / "rec")))
+        assert len(cache.history("PLTR", period="6mo")) > 100
+
+    def test_recording_bypasses_live_cache(self, tmp_path, monkeypatch):
+        """Test symbols already warm in the live cache are still recorded"""
+        monkeypatch.setenv("MARKET_WATCH_CACHE_DIR", str(tmp_path / "cache"))
+
+        class LiveStub(StubProvider):
+            name = "yfinance"
+
+        PriceCache(provider=LiveStub()).history("NVDA", period="6mo")
+        recorder = RecordingProvider(LiveStub(), root=str(tmp_path / "rec"))
+        assert recorder.name != "yfinance"
+        PriceCache(provider=recorder).history("NVDA", period="6mo")
+        assert not ReplayProvider(root=str(tmp_path / "rec")).history("NVDA").empty
@@ -0,0 +1,67 @@
+"""Tests for prestage.py"""
+import numpy as np
+import pandas as pd
+import pytest
+from types import SimpleNamespace
+from market_watch.tools import prestage as prestage_module
+from market_watch.tools.prestage import *
+
+KNOWN = {"NVDA", "AAPL", "BRK.B", "COIN"}
+
+
+@pytest.fixture
+def result():
+    dates = pd.bdate_range("2025-01-01", periods=260)
+    close = pd.DataFrame({"NVDA": np.linspace(100, 150, 260), "AAPL": np.linspace(200, 180, 260)}, index=dates)
+    from market_watch.tools.indicators import latest_snapshot
+    return {
+        "tickers": ["NVDA", "AAPL", "COIN"],
+        "snapshot": latest_snapshot(close),
+        "as_of": dates[-1],
+        "charts": {"NVDA": "output/NVDA_chart.png", "AAPL": "output/AAPL_chart.png"},
+        "fundamentals": {"NVDA": {"longName": "NVIDIA", "marketCap": 3_000_000, "forwardPE": 35.123},
+                         "AAPL": {}, "COIN": {"sector": "Financial Services"}},
+    }
+
+
+class TestPrestage:
+    """Test suite for the scout -> analyst pre-stage"""
+
+    def test_extract_tickers(self):
+        """Test only known symbols are picked up, once each, in order"""
+        text = "1. NVDA - AI Trend\n2. COIN - Crypto Rally ($NVDA again)\n3. BRK.B value; CEO said AI is HOT. aapl"
+        assert extract_tickers(text, known=KNOWN) == ["NVDA", "COIN", "BRK.B"]
+
+    def test_extract_tickers_limit(self):
+        """Test the ticker list is capped"""
+        assert extract_tickers("NVDA AAPL COIN", known=KNOWN, limit=2) == ["NVDA", "AAPL"]
+
+    def test_format_prestage(self, result):
+        """Test the block holds indicators, charts and fundamentals"""
+        text = format_prestage(result)
+        assert text.startswith(PRESTAGE_HEADER)
+        assert "NVDA | $150.00" in text
+        assert "No data: COIN" in text
+        assert "- AAPL: output/AAPL_chart.png" in text
+        assert "NVDA | NVIDIA | N/A | $3,000,000 | 35.12" in text
+        assert "COIN | N/A | Financial Services" in text
+
+    def test_guardrail_appends_block(self, monkeypatch, result):
+        """Test the guardrail passes and extends the scout output"""
+        monkeypatch.setattr(prestage_module, "extract_tickers", lambda raw: ["NVDA", "AAPL", "COIN"])
+        monkeypatch.setattr(prestage_module, "prestage", lambda tickers: result)
+        ok, text = prestage_guardrail(SimpleNamespace(raw="NVDA - AI Trend"))
+        assert ok
+        assert text.startswith("NVDA - AI Trend\n\n" + PRESTAGE_HEADER)
+        # Guardrail retries must not stack a second block.
+        assert prestage_guardrail(SimpleNamespace(raw=text)) == (True, text)
+
+    def test_guardrail_never_fails_task(self, monkeypatch):
+        """Test a pre-stage error is reported instead of failing the scout"""
+        def boom(tickers):
+            raise RuntimeError("offline")
+        monkeypatch.setattr(prestage_module, "extract_tickers", lambda raw: ["NVDA"])
+        monkeypatch.setattr(prestage_module, "prestage", boom)
+        ok, text = prestage_guardrail(SimpleNamespace(raw="NVDA"))
+        assert ok
+        assert "Pre-stage failed (offline)" in text
@@ -0,0 +1,177 @@
+"""Tests for price_cache.py"""
+import pandas as pd
+import pytest
+from market_watch.tools.market_data import MarketDataProvider
+from market_watch.tools.price_cache import PriceCache, period_to_offset
+
+
+def _bars(start, periods):
+    index = pd.date_range(start=start, periods=periods, freq='D', tz='America/New_York')
+    return pd.DataFrame({'Close': range(periods), 'Volume': [100] * periods}, index=index, dtype=float)
+
+
+class FakeProvider(MarketDataProvider):
+    """Records every network request the cache makes."""
+
+    name = "fake"
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+        self.bulk_calls = []
+
+    def history(self, ticker, period=None, start=None):
+        self.calls.append({'ticker': ticker, 'period': period, 'start': start})
+        if start is not None:
+            return self.frame[self.frame.index >= pd.Timestamp(start, tz=self.frame.index.tz)]
+        return self.frame
+
+    def info(self, ticker):
+        return {}
+
+    def download(self, tickers, period=None, start=None):
+        self.bulk_calls.append(list(tickers))
+        return {t: self.frame for t in tickers}
+
+
+class TestPeriodToOffset:
+    """Test suite for period_to_offset"""
+
+    def test_units(self):
+        """Test yfinance period strings map to offsets"""
+        assert period_to_offset("6mo") == pd.DateOffset(months=6)
+        assert period_to_offset("1y") == pd.DateOffset(years=1)
+        assert period_to_offset("max") is None
+
+    def test_invalid(self):
+        """Test unknown periods are rejected"""
+        with pytest.raises(ValueError):
+            period_to_offset("forever")
+
+
+class TestPriceCache:
+    """Test suite for PriceCache"""
+
+    def test_cold_then_warm(self, tmp_path):
+        """Test a warm cache serves both tools without another download"""
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=400)
+        fetch = FakeProvider(_bars(start, 401))
+        cache = PriceCache(root=str(tmp_path), provider=fetch, refresh_interval=3600)
+
+        year = cache.history("nvda", period="1y")
+        half = cache.history("NVDA", period="6mo")
+
+        assert len(fetch.calls) == 1
+        assert len(half) < len(year)
+        assert (tmp_path / "NVDA.parquet").exists()
+
+    def test_incremental_append(self, tmp_path):
+        """Test stale caches only request bars from the last cached day onwards"""
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=400)
+        full = _bars(start, 401)
+        fetch = FakeProvider(full.iloc[:-5])
+        cache = PriceCache(root=str(tmp_path), provider=fetch, refresh_interval=0)
+        cache.history("AMD")
+
+        fetch.frame = full
+        hist = cache.history("AMD")
+
+        assert fetch.calls[-1]['start'] == full.index[-7].strftime('%Y-%m-%d')
+        assert hist.index[-1] == full.index[-1].tz_localize(None)
+        assert not hist.index.duplicated().any()
+
+    def test_split_between_top_ups_replaces_history(self, tmp_path):
+        """Test a restated (split-adjusted) history is re-downloaded, not merged onto old bars"""
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=400)
+        unadjusted = _bars(start, 401)
+        unadjusted['Close'] = 100.0
+        fetch = FakeProvider(unadjusted.iloc[:-10])
+        cache = PriceCache(root=str(tmp_path), provider=fetch, refresh_interval=0)
+        cache.history("NVDA")
+
+        fetch.frame = unadjusted.iloc[:-5]
+        assert (cache.history("NVDA")['Close'] == 100.0).all()
+
+        # 10:1 split: the provider now returns every earlier bar divided by ten.
+        adjusted = unadjusted.copy()
+        adjusted['Close'] = 10.0
+        fetch.frame = adjusted
+        hist = cache.history("NVDA")
+
+        assert (hist['Close'] == 10.0).all()
+        assert hist.index[-1] == adjusted.index[-1].tz_localize(None)
+        assert fetch.calls[-1] == {'ticker': 'NVDA', 'period': '1y', 'start': None}
+        assert (cache.load("NVDA")['Close'] == 10.0).all()
+
+    def test_panel_single_bulk_download(self, tmp_path):
+        """Test a multi-ticker panel costs one bulk request for all cold symbols"""
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=400)
+        provider = FakeProvider(_bars(start, 401))
+        cache = PriceCache(root=str(tmp_path), provider=provider)
+        panel = cache.panel(["NVDA", "AMD", "PLTR"], period="1y")
+
+        assert provider.bulk_calls == [["AMD", "NVDA", "PLTR"]]
+        assert provider.calls == []
+        assert list(panel.columns) == ["AMD", "NVDA", "PLTR"]
+
+    def test_snapshot_panels_only_rereads_changed_symbols(self, tmp_path, monkeypatch):
+        """Test the consolidated panels are reused and patched per changed symbol"""
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=400)
+        cache = PriceCache(root=str(tmp_path), provider=FakeProvider(_bars(start, 401)))
+        cache.history_many(["NVDA", "AMD"])
+        panels = cache.snapshot_panels(fields=("Close", "Volume"))
+        assert list(panels['Close'].columns) == ["AMD", "NVDA"]
+        assert len(panels['Close']) == 260
+
+        reads = []
+        original = pd.read_parquet
+        monkeypatch.setattr(pd, "read_parquet", lambda path, **kw: reads.append(path) or original(path, **kw))
+        cache.snapshot_panels(fields=("Close", "Volume"))
+        assert not any(path.endswith("NVDA.parquet") for path in reads)
+
+    def test_unknown_symbol_returns_empty(self, tmp_path):
+        """Test a symbol the provider has no bars for does not break the batch"""
+        class PartialProvider(FakeProvider):
+            def download(self, tickers, period=None, start=None):
+                return {t: self.frame if t == "NVDA" else pd.DataFrame() for t in tickers}
+
+        cache = PriceCache(root=str(tmp_path), provider=PartialProvider(_bars("2024-01-01", 30)))
+        frames = cache.history_many(["NVDA", "NOPE"], period="max")
+        assert len(frames["NVDA"]) == 30
+        assert frames["NOPE"].empty
+
+    def test_no_data_is_remembered(self, tmp_path):
+        """Test a symbol without bars is not requested again until its marker expires"""
+        class EmptyProvider(FakeProvider):
+            def download(self, tickers, period=None, start=None):
+                self.bulk_calls.append(list(tickers))
+                return {}
+
+        provider = EmptyProvider(_bars("2024-01-01", 30))
+        cache = PriceCache(root=str(tmp_path), provider=provider)
+        assert cache.history_many(["GONE", "BAD"])["GONE"].empty
+        assert cache.unavailable_symbols() == ["BAD", "GONE"]
+        assert cache.history_many(["GONE", "BAD"])["BAD"].empty
+        assert len(provider.bulk_calls) == 1
+
+        expired = PriceCache(root=str(tmp_path), provider=provider, no_data_ttl=0)
+        assert expired.unavailable_symbols() == []
+        expired.history_many(["GONE", "BAD"])
+        assert len(provider.bulk_calls) == 2
+
+    def test_as_of_is_point_in_time(self, tmp_path):
+        """Test an as-of cache never fetches and cuts every read at its date"""
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=400)
+        provider = FakeProvider(_bars(start, 401))
+        PriceCache(root=str(tmp_path), provider=provider).history_many(["NVDA", "AMD"])
+        calls = len(provider.calls) + len(provider.bulk_calls)
+
+        as_of_date = (start + pd.Timedelta(days=300)).strftime('%Y-%m-%d')
+        past = PriceCache(root=str(tmp_path), provider=provider, refresh_interval=0, as_of_date=as_of_date)
+        frames = past.history_many(["NVDA", "AMD", "NEW"], period="1mo")
+        assert frames["NVDA"].index[-1] == pd.Timestamp(as_of_date)
+        assert frames["NVDA"].index[0] >= pd.Timestamp(as_of_date) - pd.DateOffset(months=1)
+        assert frames["NEW"].empty
+        panels = past.snapshot_panels(fields=("Close",))
+        assert panels["Close"].index[-1] == pd.Timestamp(as_of_date)
+        assert len(provider.calls) + len(provider.bulk_calls) == calls
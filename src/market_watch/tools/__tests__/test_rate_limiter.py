@@ -0,0 +1,101 @@
+"""Tests for rate_limiter.py"""
+import multiprocessing
+import threading
+import time
+import pytest
+from market_watch.tools.rate_limiter import *
+
+
+def _acquire_in_process(path, n):
+    limiter = RateLimiter(limits={"api": (20.0, 1.0)}, path=path)
+    for _ in range(n):
+        limiter.acquire("api")
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter"""
+
+    def test_load_limits(self, tmp_path):
+        """Test rates are normalized to tokens per second"""
+        path = tmp_path / "limits.yaml"
+        path.write_text("llm:\n  rate: 6\n  per: minute\n  burst: 2\nbrave:\n  rate: 1\n")
+        limits = load_limits(str(path))
+        assert limits["llm"] == pytest.approx((0.1, 2.0))
+        assert limits["brave"] == (1.0, 1.0)
+
+    def test_default_config_loads(self):
+        """Test the shipped config covers every backend"""
+        assert {"llm", "brave", "yfinance", "github"} <= set(load_limits())
+
+    def test_burst_then_paced(self, tmp_path):
+        """Test the burst is free and later calls wait for refill"""
+        limiter = RateLimiter(limits={"api": (20.0, 3.0)}, path=str(tmp_path / "rl.sqlite"))
+        start = time.monotonic()
+        for _ in range(3):
+            assert limiter.acquire("api") < 0.02
+        for _ in range(4):
+            limiter.acquire("api")
+        assert time.monotonic() - start >= 0.15
+
+    def test_unlimited_names_never_wait(self, tmp_path):
+        """Test backends without a bucket are not throttled or recorded"""
+        limiter = RateLimiter(limits={"llm": (0.001, 1.0)}, path=str(tmp_path / "rl.sqlite"))
+        limiter.acquire("llm")
+        start = time.monotonic()
+        for _ in range(100):
+            assert limiter.acquire("local") == 0.0
+        assert time.monotonic() - start < 1
+        assert set(limiter.stats()) == {"llm"}
+
+    def test_threads_share_bucket(self, tmp_path):
+        """Test concurrent threads cannot exceed the rate"""
+        limiter = RateLimiter(limits={"api": (50.0, 1.0)}, path=str(tmp_path / "rl.sqlite"))
+        start = time.monotonic()
+        threads = [threading.Thread(target=lambda: [limiter.acquire("api") for _ in range(5)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 20 acquisitions, 1 free, 19 at 50/s.
+        assert time.monotonic() - start >= 19 / 50 * 0.9
+        assert limiter.stats()["api"]["acquired"] == 20
+
+    def test_processes_share_bucket(self, tmp_path):
+        """Test separate processes draw from the same bucket and stats"""
+        path = str(tmp_path / "rl.sqlite")
+        RateLimiter(limits={"api": (20.0, 1.0)}, path=path)
+        start = time.monotonic()
+        procs = [multiprocessing.Process(target=_acquire_in_process, args=(path, 3)) for _ in range(2)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        assert time.monotonic() - start >= 5 / 20 * 0.9
+        stats = RateLimiter(limits={"api": (20.0, 1.0)}, path=path).stats()
+        assert stats["api"]["acquired"] == 6
+        assert stats["api"]["max_wait"] > 0
+
+    def test_oversized_request_rejected(self, tmp_path):
+        """Test asking for more tokens than the burst raises"""
+        limiter = RateLimiter(limits={"api": (1.0, 1.0)}, path=str(tmp_path / "rl.sqlite"))
+        with pytest.raises(ValueError):
+            limiter.acquire("api", tokens=2)
+
+    def test_stats_scoped_to_run(self, tmp_path, monkeypatch):
+        """Test each run reports only its own acquisitions"""
+        path = str(tmp_path / "rl.sqlite")
+        limiter = RateLimiter(limits={"api": (1000.0, 10.0)}, path=path)
+        monkeypatch.setenv("MARKET_WATCH_RUN_ID", "run-a")
+        for _ in range(3):
+            limiter.acquire("api")
+        monkeypatch.setenv("MARKET_WATCH_RUN_ID", "run-b")
+        limiter.acquire("api")
+        assert limiter.stats()["api"]["acquired"] == 1
+        assert RateLimiter(limits={"api": (1000.0, 10.0)}, path=path).stats("run-a")["api"]["acquired"] == 3
+        assert "1 calls" in limiter.format_stats("run-b")
+
+        limiter.reset_stats("run-a")
+        assert limiter.stats("run-a") == {}
+        assert limiter.stats("run-b")["api"]["acquired"] == 1
+        limiter.reset_stats()
+        assert limiter.stats("run-b") == {}
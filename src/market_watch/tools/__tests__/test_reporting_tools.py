@@ -1,7 +1,23 @@
 """Tests for reporting_tools.py"""
 import pytest
+from market_watch.tools import reporting_tools
 from market_watch.tools.reporting_tools import *
 
+REPORT = "# Market Watch\n\n## Top 5 Short-Term Picks\n- **NVDA**: Momentum.\n\n## Top 5 Long-Term Picks\n- **MSFT**: Trend.\n"
+
+
+@pytest.fixture
+def report_env(tmp_path, monkeypatch):
+    class HistoryStub:
+        def record_run(self, *args):
+            return 1
+
+    monkeypatch.setenv("MARKET_WATCH_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.delenv("MARKET_WATCH_RUN_ID", raising=False)
+    monkeypatch.setattr(reporting_tools, "pick_data", lambda picks: (None, {}))
+    monkeypatch.setattr(reporting_tools, "get_run_history", lambda: HistoryStub())
+    return tmp_path
+
 
 class TestWordReportToolInput:
     """Test suite for WordReportToolInput"""
@@ -20,4 +36,17 @@ class TestWordReportTool:
         # TODO: Implement test
         pass
 
+    def test_legacy_dashboard_file_is_opt_in(self, report_env, monkeypatch):
+        """Test only the sharded dashboard is written unless the legacy file is requested"""
+        monkeypatch.delenv("MARKET_WATCH_LEGACY_DASHBOARD", raising=False)
+        result = WordReportTool()._run(REPORT)
+        assert not result.startswith("Error"), result
+        assert (report_env / "dashboard" / "index.json").exists()
+        assert not (report_env / "dashboard_data.json").exists()
+
+        monkeypatch.setenv("MARKET_WATCH_LEGACY_DASHBOARD", "1")
+        WordReportTool()._run(REPORT)
+        legacy = (report_env / "dashboard_data.json").read_text()
+        assert "\n" not in legacy and '"NVDA"' in legacy
+
 
@@ -0,0 +1,105 @@
+"""Tests for run_context.py"""
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+import pytest
+from market_watch.tools import storage
+from market_watch.tools.run_context import *
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.delenv("MARKET_WATCH_RUN_ID", raising=False)
+    monkeypatch.setenv("MARKET_WATCH_OUTPUT_DIR", str(tmp_path / "output"))
+    return str(tmp_path / "output")
+
+
+def finished_run(root, run_id, started_at="2026-01-01T09:00:00"):
+    workspace = os.path.join(root, "runs", run_id)
+    os.makedirs(workspace)
+    with open(os.path.join(workspace, RUN_FILE), 'w') as f:
+        json.dump({"run_id": run_id, "status": "finished", "started_at": started_at}, f)
+
+
+class TestRunContext:
+    """Test suite for RunContext"""
+
+    def test_outputs_resolve_into_workspace(self, root):
+        """Test output_dir points into the run's workspace only while the run is active"""
+        with RunContext("run-a") as context:
+            assert storage.output_dir() == os.path.join(root, "runs", "run-a")
+            assert storage.output_dir("charts") == context.path("charts")
+        assert storage.output_dir() == root
+        assert "MARKET_WATCH_RUN_ID" not in os.environ
+        assert read_run(context.workspace)["status"] == "finished"
+
+    def test_latest_pointer(self, root):
+        """Test LATEST moves to each successful run but not to a failed one"""
+        with RunContext("run-a"):
+            pass
+        assert latest_run(root) == "run-a"
+        with pytest.raises(RuntimeError):
+            with RunContext("run-b"):
+                raise RuntimeError("boom")
+        assert latest_run(root) == "run-a"
+        assert read_run(os.path.join(root, "runs", "run-b"))["status"] == "failed"
+        if os.path.islink(os.path.join(root, LATEST_LINK)):
+            assert os.path.realpath(os.path.join(root, LATEST_LINK)).endswith("run-a")
+
+    def test_concurrent_processes_are_isolated(self, root):
+        """Test two runs in parallel processes write to separate workspaces"""
+        script = (
+            "import sys; from market_watch.tools.run_context import RunContext; from market_watch.tools import storage\n"
+            "with RunContext(sys.argv[1]):\n"
+            "    open(storage.output_dir() + '/market_watch_report.docx', 'w').write(sys.argv[1])\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        procs = [subprocess.Popen([sys.executable, "-c", script, rid], env=env) for rid in ("p1", "p2")]
+        assert [p.wait() for p in procs] == [0, 0]
+        for rid in ("p1", "p2"):
+            with open(os.path.join(root, "runs", rid, "market_watch_report.docx")) as f:
+                assert f.read() == rid
+
+
+class TestGcRuns:
+    """Test suite for gc_runs"""
+
+    def test_keeps_newest_and_latest(self, root):
+        """Test old runs are removed but LATEST and the newest are kept"""
+        for i in range(5):
+            finished_run(root, f"2026010{i + 1}-090000-aaaaaa")
+        with open(os.path.join(root, LATEST_NAME), 'w') as f:
+            f.write("20260101-090000-aaaaaa")
+        removed = gc_runs(root, keep=2)
+        assert sorted(removed) == ["20260102-090000-aaaaaa", "20260103-090000-aaaaaa"]
+        assert [r["run_id"][:8] for r in list_runs(root)] == ["20260105", "20260104", "20260101"]
+
+    def test_max_age_and_live_runs(self, root):
+        """Test runs older than max_age_days go, unless their process is still running"""
+        finished_run(root, "old", started_at="2025-01-01T09:00:00")
+        workspace = os.path.join(root, "runs", "live")
+        os.makedirs(workspace)
+        with open(os.path.join(workspace, RUN_FILE), 'w') as f:
+            json.dump({"run_id": "live", "status": "running", "pid": os.getpid(), "started_at": "2025-01-01T09:00:00"}, f)
+        removed = gc_runs(root, keep=10, max_age_days=30, now=datetime(2026, 1, 1))
+        assert removed == ["old"]
+        assert os.path.isdir(workspace)
+
+    def test_new_run_id_sorts_by_time(self):
+        """Test run ids sort chronologically and do not collide"""
+        a = new_run_id(datetime(2026, 1, 1, 9))
+        b = new_run_id(datetime(2026, 1, 1, 10))
+        assert a < b and new_run_id() != new_run_id()
+
+    def test_named_pointers_are_kept(self, root):
+        """Test a per-watchlist pointer is written and protects its run from collection"""
+        with RunContext("20260101-090000-desk", pointer="LATEST-desk"):
+            pass
+        for i in range(3):
+            finished_run(root, f"2026010{i + 2}-090000-other")
+        assert latest_run(root, "LATEST-desk") == "20260101-090000-desk"
+        assert latest_run(root) is None
+        gc_runs(root, keep=1)
+        assert os.path.isdir(os.path.join(root, "runs", "20260101-090000-desk"))
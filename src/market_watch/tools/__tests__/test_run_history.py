@@ -0,0 +1,79 @@
+"""Tests for run_history.py"""
+import time
+import pandas as pd
+import pytest
+from market_watch.tools.run_history import *
+
+
+@pytest.fixture
+def history(tmp_path):
+    return RunHistory(path=str(tmp_path / "history.sqlite"))
+
+
+def picks(short, long=()):
+    return {
+        "short": [{"ticker": t, "reason": f"{t} short"} for t in short],
+        "long": [{"ticker": t, "reason": f"{t} long"} for t in long],
+    }
+
+
+class TestRunHistory:
+    """Test suite for RunHistory"""
+
+    def test_record_and_query_picks(self, history):
+        """Test every pick of a ticker is returned across runs and books"""
+        history.record_run(picks(["NVDA", "AMD"], ["MSFT"]), run_date="2026-01-02")
+        history.record_run(picks(["TSLA"], ["nvda"]), run_date="2026-01-05")
+        history.record_run(picks(["AMD"]), run_date="2026-01-06")
+
+        nvda = history.picks_for("nvda")
+        assert list(nvda["run_date"]) == ["2026-01-02", "2026-01-05"]
+        assert list(nvda["book"]) == ["short", "long"]
+        assert list(history.picks_on("2026-01-02")["ticker"]) == ["MSFT", "NVDA", "AMD"]
+        assert len(history.runs("2026-01-03", "2026-01-31")) == 2
+
+    def test_append_only(self, history):
+        """Test a second run on the same date keeps the first one"""
+        first = history.record_run(picks(["NVDA"]), run_date="2026-01-02", report_markdown="first")
+        second = history.record_run(picks(["AMD"]), run_date="2026-01-02", report_markdown="second")
+        assert second > first
+        assert list(history.runs()["run_id"]) == [first, second]
+        assert list(history.picks_on("2026-01-02")["ticker"]) == ["NVDA", "AMD"]
+
+    def test_snapshots_and_fundamentals(self, history):
+        """Test indicator snapshots and fundamentals round-trip per run"""
+        snapshot = pd.DataFrame(
+            {"Close": [100.0], "RSI_14": [72.5], "MACD_12_26_9": [1.5], "MACDs_12_26_9": [1.0],
+             "SMA_50": [95.0], "SMA_200": [float("nan")]},
+            index=["NVDA"],
+        )
+        fundamentals = {"NVDA": {"trailingPE": 45.2, "sector": "Technology", "beta": None}}
+        history.record_run(picks(["NVDA"]), snapshot, fundamentals, run_date="2026-01-02")
+
+        snaps = history.snapshots_for("NVDA")
+        assert snaps.loc[0, "rsi_14"] == 72.5
+        assert pd.isna(snaps.loc[0, "sma_200"])
+        funds = history.fundamentals_for("NVDA")
+        assert funds.loc[0, "trailingPE"] == 45.2
+        assert funds.loc[0, "sector"] == "Technology"
+        assert history.fundamentals_for("AMD").empty
+
+    def test_picks_frame(self, history):
+        """Test picks_frame matches the backtest input format"""
+        history.record_run(picks(["NVDA"], ["MSFT"]), run_date="2026-01-02")
+        history.record_run(picks(["NVDA"]), run_date="2026-01-02")
+        frame = history.picks_frame()
+        assert list(frame.columns) == ["date", "ticker", "book"]
+        assert len(frame) == 2
+        assert frame["date"].iloc[0] == pd.Timestamp("2026-01-02")
+
+    def test_ticker_lookup_is_fast(self, history):
+        """Test 'every time X was picked' stays fast over years of runs"""
+        dates = pd.bdate_range("2020-01-01", periods=1500).strftime('%Y-%m-%d')
+        for i, day in enumerate(dates):
+            history.record_run(picks([f"T{i % 200}", f"T{(i + 7) % 200}"], ["NVDA" if i % 10 == 0 else "AMD"]), run_date=day)
+
+        started = time.perf_counter()
+        nvda = history.picks_for("NVDA")
+        assert time.perf_counter() - started < 0.05
+        assert len(nvda) == 150
@@ -0,0 +1,115 @@
+"""Tests for scanner_tools.py"""
+import pandas as pd
+import pytest
+from pandas.tseries.holiday import USFederalHolidayCalendar
+from market_watch.tools import scanner_tools
+from market_watch.tools.market_data import MarketDataProvider, period_to_offset
+from market_watch.tools.price_cache import PriceCache
+from market_watch.tools.scanner_tools import *
+
+
+class UniverseStub:
+    """Stands in for the universe registry."""
+
+    symbols = ["LIVE", "DELISTED"]
+
+    def label_series(self, label):
+        return pd.Series({"LIVE": "Tech", "DELISTED": "Tech"})
+
+
+class PartialProvider(MarketDataProvider):
+    """Has bars for LIVE only; counts bulk downloads."""
+
+    name = "partial"
+
+    def __init__(self):
+        self.downloads = []
+
+    def history(self, ticker, period=None, start=None):
+        return self.download([ticker])[ticker] if ticker == "LIVE" else pd.DataFrame()
+
+    def info(self, ticker):
+        return {}
+
+    def download(self, tickers, period=None, start=None):
+        self.downloads.append(list(tickers))
+        index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=260)
+        bars = pd.DataFrame({'Open': 10.0, 'Close': 10.0, 'Volume': 1e7}, index=index)
+        return {t: bars for t in tickers if t == "LIVE"}
+
+
+class PeriodProvider(MarketDataProvider):
+    """Returns only the business days inside the requested period, like a real "1y" download."""
+
+    name = "period"
+
+    def __init__(self, symbols, max_bars=None):
+        self.symbols = symbols
+        self.max_bars = max_bars
+        self.downloads = []
+
+    def _bars(self, period):
+        end = pd.Timestamp.now().normalize()
+        trading_days = pd.offsets.CustomBusinessDay(calendar=USFederalHolidayCalendar())
+        index = pd.date_range(end - period_to_offset(period) + pd.Timedelta(days=1), end, freq=trading_days)
+        index = index[-(self.max_bars or 0):]
+        close = pd.Series(range(1, len(index) + 1), index=index, dtype=float) + 10
+        return pd.DataFrame({'Open': close, 'Close': close, 'Volume': 1e7}, index=index)
+
+    def history(self, ticker, period=None, start=None):
+        return self.download([ticker], period)[ticker]
+
+    def info(self, ticker):
+        return {}
+
+    def download(self, tickers, period=None, start=None):
+        self.downloads.append((list(tickers), period))
+        return {t: self._bars(period) for t in tickers}
+
+
+class TestMarketScreenerTool:
+    """Test suite for MarketScreenerTool"""
+
+    def test_symbols_without_data_are_not_refetched(self, tmp_path, monkeypatch):
+        """Test a second screen makes no provider call for symbols that had no data"""
+        provider = PartialProvider()
+        cache = PriceCache(root=str(tmp_path), provider=provider)
+        monkeypatch.setattr(scanner_tools, "get_price_cache", lambda: cache)
+        monkeypatch.setattr(scanner_tools, "get_universe", lambda: UniverseStub())
+        monkeypatch.setattr(scanner_tools, "_sector_map", lambda: pd.Series({"LIVE": "Tech"}))
+
+        first = MarketScreenerTool()._run(top_n=1)
+        assert "LIVE" in first
+        assert provider.downloads == [["DELISTED", "LIVE"]]
+
+        MarketScreenerTool()._run(top_n=1)
+        assert provider.downloads == [["DELISTED", "LIVE"]]
+
+    def test_one_year_return_on_realistic_history(self, tmp_path, monkeypatch):
+        """Test symbols cached with a "1y" download (~251 bars) are topped up so ret_252d is defined"""
+        provider = PeriodProvider(["LIVE", "DELISTED"])
+        cache = PriceCache(root=str(tmp_path), provider=provider)
+        assert len(cache.history_many(["LIVE", "DELISTED"], period="1y")["LIVE"]) < 253
+        monkeypatch.setattr(scanner_tools, "get_price_cache", lambda: cache)
+        monkeypatch.setattr(scanner_tools, "get_universe", lambda: UniverseStub())
+        monkeypatch.setattr(scanner_tools, "_sector_map", lambda: pd.Series({"LIVE": "Tech", "DELISTED": "Tech"}))
+
+        output = MarketScreenerTool()._run(top_n=2)
+        assert provider.downloads[-1] == (["DELISTED", "LIVE"], "2y")
+        assert "nan" not in output
+        assert "1y N/A" not in output
+
+        MarketScreenerTool()._run(top_n=2)
+        assert len(provider.downloads) == 2
+
+    def test_missing_return_formatted_as_na(self, tmp_path, monkeypatch):
+        """Test a symbol with under a year of bars (a new listing) shows N/A, not nan"""
+        provider = PeriodProvider(["LIVE"], max_bars=200)
+        cache = PriceCache(root=str(tmp_path), provider=provider)
+        monkeypatch.setattr(scanner_tools, "get_price_cache", lambda: cache)
+        monkeypatch.setattr(scanner_tools, "get_universe", lambda: UniverseStub())
+        monkeypatch.setattr(scanner_tools, "_sector_map", lambda: pd.Series({"LIVE": "Tech"}))
+
+        output = MarketScreenerTool()._run(top_n=1)
+        assert "1y N/A" in output
+        assert "nan" not in output
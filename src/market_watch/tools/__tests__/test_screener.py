@@ -0,0 +1,64 @@
+"""Tests for screener.py"""
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from market_watch.tools.screener import *
+
+
+def _panels(n_symbols, n_days=260, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2025-01-01", periods=n_days)
+    tickers = [f"T{i:04d}" for i in range(n_symbols)]
+    close = pd.DataFrame(50 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_days, n_symbols)), axis=0)), index=index, columns=tickers)
+    open_ = close.shift(1).fillna(close) * (1 + rng.normal(0, 0.005, (n_days, n_symbols)))
+    volume = pd.DataFrame(rng.integers(100_000, 200_000, (n_days, n_symbols)), index=index, columns=tickers, dtype=float)
+    return {'Open': open_, 'Close': close, 'Volume': volume}
+
+
+class TestComputeMetrics:
+    """Test suite for compute_metrics"""
+
+    def test_known_values(self):
+        """Test metrics on a hand-built panel"""
+        index = pd.bdate_range("2025-01-01", periods=30)
+        close = pd.DataFrame({'UP': np.arange(100.0, 130.0)}, index=index)
+        open_ = close.copy()
+        open_.iloc[-1] = close.iloc[-2] * 1.02
+        volume = pd.DataFrame({'UP': [1000.0] * 29 + [3000.0]}, index=index)
+
+        metrics = compute_metrics(open_, close, volume)
+        assert metrics.loc['UP', 'ret_5d'] == pytest.approx(129 / 124 - 1)
+        assert metrics.loc['UP', 'volume_surge'] == pytest.approx(3.0)
+        assert metrics.loc['UP', 'gap'] == pytest.approx(0.02)
+        assert np.isnan(metrics.loc['UP', 'ret_252d'])
+
+
+class TestScreen:
+    """Test suite for screen"""
+
+    def test_top_n_per_sector(self):
+        """Test each sector yields at most top_n candidates per horizon"""
+        panels = _panels(40)
+        sectors = pd.Series({t: 'Tech' if i % 2 else 'Energy' for i, t in enumerate(panels['Close'].columns)})
+        result = screen(panels, sectors, top_n=3, min_dollar_volume=0)
+        for horizon in ('short', 'long'):
+            assert result[horizon].groupby('sector').size().to_dict() == {'Energy': 3, 'Tech': 3}
+        tech = result['short'][result['short']['sector'] == 'Tech']
+        assert tech['short_score'].is_monotonic_decreasing
+
+    def test_illiquid_symbols_are_dropped(self):
+        """Test the liquidity filter"""
+        panels = _panels(5)
+        panels['Volume'].iloc[:, 0] = 1.0
+        result = screen(panels, pd.Series(dtype=object), top_n=10)
+        assert 'T0000' not in result['short'].index
+        assert set(result['short']['sector']) == {'Unknown'}
+
+    def test_full_universe_is_fast(self):
+        """Test a 5000 symbol universe ranks well under a second"""
+        panels = _panels(5000)
+        sectors = pd.Series({t: f"S{i % 11}" for i, t in enumerate(panels['Close'].columns)})
+        started = time.perf_counter()
+        screen(panels, sectors)
+        assert time.perf_counter() - started < 1.0
@@ -0,0 +1,145 @@
+"""Tests for search_cache.py"""
+import threading
+import time
+import pytest
+from market_watch.tools.search_cache import *
+
+
+class SlowSearch:
+    """Fake search backend that counts calls."""
+
+    def __init__(self, delay=0.0, response='[{"url": "u", "title": "t"}]'):
+        self.delay = delay
+        self.response = response
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(path=str(tmp_path / "search.sqlite"))
+
+
+class TestSearchCache:
+    """Test suite for SearchCache"""
+
+    def test_query_tokens(self):
+        """Test case, punctuation, stopwords and possessives are normalized"""
+        assert query_tokens("What's the latest on NVIDIA's earnings?") == query_tokens("nvidia latest earnings")
+        assert query_tokens("BRK.B news") == frozenset({"brk.b", "news"})
+
+    def test_exact_and_near_duplicate_hits(self, cache):
+        """Test reworded queries on the same date reuse the first result"""
+        search = SlowSearch()
+        cache.get_or_fetch("NVDA stock news today", search, day="2026-01-02")
+        cache.get_or_fetch("nvda stock news, today", search, day="2026-01-02")
+        cache.get_or_fetch("the NVDA stock news for today", search, day="2026-01-02")
+        assert search.calls == 1
+        assert cache.stats["hits"] == 2
+
+        cache.get_or_fetch("NVDA stock news today Reuters", search, day="2026-01-02")
+        assert search.calls == 1
+        assert cache.stats["near_hits"] == 1
+
+        cache.get_or_fetch("AMD lawsuit", search, day="2026-01-02")
+        assert search.calls == 2
+
+    def test_different_tickers_never_share_results(self, cache):
+        """Test queries that differ only in the ticker are fetched separately"""
+        template = "latest analyst ratings, price target changes and upgrades or downgrades for {} stock"
+        assert jaccard(query_tokens(template.format("NVDA")), query_tokens(template.format("AMD"))) >= DEFAULT_SIMILARITY
+        search = SlowSearch()
+        cache.get_or_fetch(template.format("NVDA"), search, day="2026-01-02")
+        cache.get_or_fetch(template.format("AMD"), search, day="2026-01-02")
+        cache.get_or_fetch(template.format("amd"), search, day="2026-01-02")
+        cache.get_or_fetch("NVDA Q3 2025 earnings call highlights summary", search, day="2026-01-02")
+        cache.get_or_fetch("NVDA Q4 2025 earnings call highlights summary", search, day="2026-01-02")
+        assert search.calls == 4
+        assert cache.stats["near_hits"] == 0
+
+    def test_different_tickers_not_coalesced(self, cache):
+        """Test a query is not coalesced onto an in-flight query for another ticker"""
+        template = "latest analyst ratings, price target changes and upgrades or downgrades for {} stock"
+        search = SlowSearch(delay=0.2)
+        threads = [
+            threading.Thread(target=cache.get_or_fetch, args=(template.format(t), search), kwargs={"day": "2026-01-02"})
+            for t in ("NVDA", "AMD")
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert search.calls == 2
+        assert cache.stats["coalesced"] == 0
+
+    def test_scoped_by_date_and_options(self, cache):
+        """Test results are not shared across dates or search options"""
+        search = SlowSearch()
+        cache.get_or_fetch("NVDA news", search, day="2026-01-02")
+        cache.get_or_fetch("NVDA news", search, day="2026-01-03")
+        cache.get_or_fetch("NVDA news", search, day="2026-01-03", options={"freshness": "pd"})
+        assert search.calls == 3
+
+    def test_ttl_and_persistence(self, tmp_path):
+        """Test entries survive a restart but expire after the TTL"""
+        path = str(tmp_path / "search.sqlite")
+        search = SlowSearch()
+        SearchCache(path=path).get_or_fetch("NVDA news", search, day="2026-01-02")
+        SearchCache(path=path).get_or_fetch("NVDA news", search, day="2026-01-02")
+        assert search.calls == 1
+
+        expired = SearchCache(path=path, ttl=0)
+        time.sleep(0.01)
+        expired.get_or_fetch("NVDA news", search, day="2026-01-02")
+        assert search.calls == 2
+        assert expired.purge(now=time.time() + 1) >= 1
+
+    def test_single_flight(self, cache):
+        """Test concurrent identical queries trigger one request"""
+        search = SlowSearch(delay=0.2)
+        results = []
+        threads = [
+            threading.Thread(target=lambda q=q: results.append(cache.get_or_fetch(q, search, day="2026-01-02")))
+            for q in ["NVDA news"] * 4 + ["nvda NEWS?"] * 2
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert search.calls == 1
+        assert len(results) == 6 and len(set(results)) == 1
+        assert cache.stats["misses"] == 1
+
+    def test_errors_not_cached(self, cache):
+        """Test failed searches are retried next time"""
+        search = SlowSearch(response="Error performing search: timeout")
+        cache.get_or_fetch("NVDA news", search, day="2026-01-02")
+        cache.get_or_fetch("NVDA news", search, day="2026-01-02")
+        assert search.calls == 2
+
+    def test_exception_propagates_to_waiters(self, cache):
+        """Test an exception in the in-flight request reaches every waiter"""
+        def boom():
+            time.sleep(0.1)
+            raise RuntimeError("down")
+
+        errors = []
+
+        def run():
+            try:
+                cache.get_or_fetch("NVDA news", boom, day="2026-01-02")
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=run) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == ["down"] * 3
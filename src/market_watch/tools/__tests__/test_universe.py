@@ -0,0 +1,98 @@
+"""Tests for universe.py"""
+import os
+import numpy as np
+import pytest
+from market_watch.tools.universe import *
+
+CSV = """symbol,name,sector,industry,exchange,market_cap_bucket
+nvda,NVIDIA,Technology,Semiconductors,NASDAQ,mega
+SMCI,Super Micro,Technology,Computer Hardware,NASDAQ,large
+AAPL,Apple,Technology,Consumer Electronics,NASDAQ,mega
+XOM,Exxon,Energy,Oil & Gas Integrated,NYSE,mega
+COP,Conoco,Energy,Oil & Gas E&P,NYSE,large
+"""
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "universe.csv"
+    path.write_text(CSV)
+    return str(path)
+
+
+class TestUniverseRegistry:
+    """Test suite for UniverseRegistry"""
+
+    def test_lookup(self, source):
+        """Test symbol lookups through the hash table"""
+        registry = UniverseRegistry.from_file(source)
+        assert len(registry) == 5
+        assert registry.get("NVDA") == {
+            "symbol": "NVDA", "sector": "Technology", "industry": "Semiconductors",
+            "exchange": "NASDAQ", "market_cap_bucket": "mega",
+        }
+        assert "xom" in registry
+        assert registry.index_of("TSLA") == -1
+        assert registry.get("TSLA") is None
+
+    def test_sector_index(self, source):
+        """Test per-sector rows are prebuilt, largest bucket first"""
+        registry = UniverseRegistry.from_file(source)
+        assert registry.sectors() == ["Energy", "Technology"]
+        assert registry.members("Technology") == ["AAPL", "NVDA", "SMCI"]
+        assert registry.members("Energy") == ["XOM", "COP"]
+        assert registry.members("Utilities") == []
+        assert registry.label_series("sector")["COP"] == "Energy"
+
+    def test_snapshot_is_memory_mapped(self, source, tmp_path):
+        """Test the second load maps the binary snapshot instead of parsing the CSV"""
+        snapshot = str(tmp_path / "snapshot")
+        UniverseRegistry.load(source, snapshot)
+        loaded = UniverseRegistry.load(source, snapshot)
+        assert isinstance(loaded.symbols, np.memmap)
+        assert loaded.get("SMCI")["industry"] == "Computer Hardware"
+
+    def test_snapshot_rebuilt_when_source_changes(self, source, tmp_path):
+        """Test editing the universe file invalidates the snapshot"""
+        snapshot = str(tmp_path / "snapshot")
+        UniverseRegistry.load(source, snapshot)
+        with open(source, 'a') as f:
+            f.write("TSLA,Tesla,Consumer Cyclical,Auto Manufacturers,NASDAQ,mega\n")
+        assert "TSLA" in UniverseRegistry.load(source, snapshot)
+
+    def test_concurrent_snapshot_writes(self, source, tmp_path):
+        """Test parallel rebuilds of one snapshot never leave temp files or torn arrays"""
+        import threading
+        snapshot = str(tmp_path / "snapshot")
+        registry = UniverseRegistry.from_file(source)
+        errors = []
+
+        def rebuild():
+            try:
+                for _ in range(10):
+                    registry.save_snapshot(snapshot)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=rebuild) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert not [name for name in os.listdir(snapshot) if ".tmp" in name]
+        assert UniverseRegistry.load_snapshot(snapshot).members("Energy") == ["XOM", "COP"]
+
+    def test_large_universe(self):
+        """Test thousands of symbols resolve to the right rows"""
+        import pandas as pd
+        symbols = [f"S{i:05d}" for i in range(5000)]
+        frame = pd.DataFrame({"symbol": symbols, "sector": [f"Sector{i % 11}" for i in range(5000)]})
+        registry = UniverseRegistry.from_frame(frame)
+        assert all(registry.index_of(s) == i for i, s in enumerate(symbols))
+        assert sum(len(registry.sector_rows(s)) for s in registry.sectors()) == 5000
+
+    def test_shipped_universe_loads(self):
+        """Test config/universe.csv is valid"""
+        registry = UniverseRegistry.from_file(DEFAULT_UNIVERSE_PATH)
+        assert registry.get("PLTR")["sector"] == "Technology"
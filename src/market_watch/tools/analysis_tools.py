@@ -1,11 +1,12 @@
-import yfinance as yf
 import pandas as pd
-import pandas_ta as ta
-import matplotlib.pyplot as plt
-import os
 from crewai.tools import BaseTool
-from typing import Type
+from typing import Type, List
 from pydantic import BaseModel, Field
+from .price_cache import get_price_cache
+from .indicators import latest_snapshot
+from .indicator_engine import get_indicator_engine
+from .chart_renderer import get_chart_renderer
+from .fundamentals_cache import get_fundamentals_cache, prefetch_fundamentals
 
 class ChartGenerationToolInput(BaseModel):
     ticker: str = Field(..., description="The stock ticker symbol (e.g., 'NVDA', 'AAPL').")
@@ -13,44 +14,52 @@ class ChartGenerationToolInput(BaseModel):
 class ChartGenerationTool(BaseTool):
     name: str = "Chart Generation Tool"
     description: str = (
-        "Generates a 1-year logarithmic price chart for a given stock ticker using yfinance and matplotlib. "
+        "Generates a 1-year logarithmic price chart for a given stock ticker using matplotlib. "
         "Saves the chart as a PNG file in the 'output' directory and returns the file path."
     )
     args_schema: Type[BaseModel] = ChartGenerationToolInput
 
     def _run(self, ticker: str) -> str:
         try:
-            # Fetch data
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="1y")
+            # Fetch data (served from the local price cache when warm)
+            hist = get_price_cache().history(ticker, period="1y")
             
             if hist.empty:
                 return f"Error: No data found for ticker {ticker}"
 
-            # Ensure output directory exists
-            output_dir = "output"
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-
-            # Create Plot
-            plt.figure(figsize=(10, 6))
-            plt.plot(hist.index, hist['Close'], label=f'{ticker} Close Price')
-            plt.yscale('log')
-            plt.title(f'{ticker} Price History (1 Year Logarithmic)')
-            plt.xlabel('Date')
-            plt.ylabel('Price (Log Scale)')
-            plt.legend()
-            plt.grid(True, which="both", ls="-", alpha=0.2)
-
-            # Save Plot
-            file_path = os.path.join(output_dir, f"{ticker}_chart.png")
-            plt.savefig(file_path)
-            plt.close()
+            # Render (or reuse the cached PNG when the series is unchanged)
+            file_path = get_chart_renderer().render(ticker, hist['Close'])
 
             return f"Chart saved successfully at: {file_path}"
         except Exception as e:
             return f"Error generating chart for {ticker}: {str(e)}"
 
+class BatchChartGenerationToolInput(BaseModel):
+    tickers: List[str] = Field(..., description="List of stock ticker symbols to chart in one call.")
+
+class BatchChartGenerationTool(BaseTool):
+    name: str = "Batch Chart Generation Tool"
+    description: str = (
+        "Generates 1-year logarithmic price charts for a whole list of tickers at once, "
+        "rendering in parallel and reusing charts whose data has not changed. "
+        "Returns the PNG path for each ticker."
+    )
+    args_schema: Type[BaseModel] = BatchChartGenerationToolInput
+
+    def _run(self, tickers: List[str]) -> str:
+        try:
+            frames = get_price_cache().history_many(tickers, period="1y")
+            series = {t: df['Close'] for t, df in frames.items() if not df.empty}
+            paths = get_chart_renderer().render_many(series)
+
+            lines = [f"- {ticker}: {path}" for ticker, path in paths.items()]
+            missing = [t for t, df in frames.items() if df.empty]
+            if missing:
+                lines.append(f"No data: {', '.join(missing)}")
+            return "Charts saved:\n" + "\n".join(lines)
+        except Exception as e:
+            return f"Error generating charts: {str(e)}"
+
 class TechnicalAnalysisToolInput(BaseModel):
     ticker: str = Field(..., description="The stock ticker symbol.")
 
@@ -64,22 +73,15 @@ class TechnicalAnalysisTool(BaseTool):
 
     def _run(self, ticker: str) -> str:
         try:
-            stock = yf.Ticker(ticker)
-            df = stock.history(period="6mo")
+            # Only bars newer than the persisted indicator state are processed;
+            # the lookback covers the warm-up of every indicator (incl. SMA 200).
+            engine = get_indicator_engine()
+            df = get_price_cache().history(ticker, period=engine.lookback_period())
             
             if df.empty:
                 return f"No data for {ticker}"
 
-            # Calculate Indicators
-            # RSI
-            df.ta.rsi(length=14, append=True)
-            # MACD
-            df.ta.macd(append=True)
-            # SMA
-            df.ta.sma(length=50, append=True)
-            df.ta.sma(length=200, append=True)
-
-            latest = df.iloc[-1]
+            latest = engine.update(ticker, df)
             
             # Format Output
             rsi = latest['RSI_14']
@@ -90,16 +92,73 @@ class TechnicalAnalysisTool(BaseTool):
             price = latest['Close']
 
             analysis = f"Technical Analysis for {ticker} (Price: ${price:.2f}):\n"
-            analysis += f"- RSI (14): {rsi:.2f} ({'Overbought' if rsi>70 else 'Oversold' if rsi<30 else 'Neutral'})\n"
-            analysis += f"- MACD: {macd:.4f} (Signal: {macdsignal:.4f}) -> {'Bullish' if macd > macdsignal else 'Bearish'} Crossover\n"
-            analysis += f"- SMA 50: ${sma50:.2f} | SMA 200: ${sma200:.2f}\n"
-            analysis += f"- Trend: {'Bullish' if price > sma200 else 'Bearish'} (vs 200 SMA)"
+            if rsi is not None:
+                analysis += f"- RSI (14): {rsi:.2f} ({'Overbought' if rsi>70 else 'Oversold' if rsi<30 else 'Neutral'})\n"
+            if macd is not None and macdsignal is not None:
+                analysis += f"- MACD: {macd:.4f} (Signal: {macdsignal:.4f}) -> {'Bullish' if macd > macdsignal else 'Bearish'} Crossover\n"
+            sma50_text = f"${sma50:.2f}" if sma50 is not None else "N/A"
+            sma200_text = f"${sma200:.2f}" if sma200 is not None else "N/A (insufficient history)"
+            analysis += f"- SMA 50: {sma50_text} | SMA 200: {sma200_text}\n"
+            if sma200 is not None:
+                analysis += f"- Trend: {'Bullish' if price > sma200 else 'Bearish'} (vs 200 SMA)"
 
             return analysis
 
         except Exception as e:
             return f"Error performing TA on {ticker}: {str(e)}"
 
+class BulkTechnicalAnalysisToolInput(BaseModel):
+    tickers: List[str] = Field(..., description="List of stock ticker symbols to analyze in one call.")
+
+class BulkTechnicalAnalysisTool(BaseTool):
+    name: str = "Bulk Technical Analysis Tool"
+    description: str = (
+        "Performs technical analysis (RSI, MACD, SMA 50/200) on a whole list of tickers at once. "
+        "Returns one compact table with a row per ticker. Prefer this over calling "
+        "Technical Analysis Tool once per ticker."
+    )
+    args_schema: Type[BaseModel] = BulkTechnicalAnalysisToolInput
+
+    def _run(self, tickers: List[str]) -> str:
+        try:
+            # One bulk download for every ticker missing from the cache, then
+            # all indicators computed column-wise on the dates x tickers panel.
+            close = get_price_cache().panel(tickers, period="1y", field="Close")
+            if close.empty:
+                return f"No data for any of: {', '.join(tickers)}"
+
+            snapshot = latest_snapshot(close)
+            return format_snapshot_table(snapshot, as_of=close.index[-1], requested=tickers)
+
+        except Exception as e:
+            return f"Error performing bulk TA: {str(e)}"
+
+def format_snapshot_table(snapshot: pd.DataFrame, as_of, requested: List[str]) -> str:
+    """Renders an indicator snapshot (one row per ticker) as a compact pipe table."""
+    def fmt(value, pattern):
+        return 'N/A' if pd.isna(value) else pattern.format(value)
+
+    lines = [
+        f"Bulk Technical Analysis ({len(snapshot)} tickers, as of {as_of:%Y-%m-%d}):",
+        "Ticker | Price | RSI 14 | MACD / Signal | SMA 50 | SMA 200 | Trend (vs 200 SMA)",
+    ]
+    for ticker, row in snapshot.iterrows():
+        rsi, macd, signal = row['RSI_14'], row['MACD_12_26_9'], row['MACDs_12_26_9']
+        price, sma200 = row['Close'], row['SMA_200']
+        rsi_label = 'N/A' if pd.isna(rsi) else 'Overbought' if rsi > 70 else 'Oversold' if rsi < 30 else 'Neutral'
+        cross = '' if pd.isna(macd) or pd.isna(signal) else (' Bullish' if macd > signal else ' Bearish')
+        trend = 'N/A' if pd.isna(sma200) else ('Bullish' if price > sma200 else 'Bearish')
+        lines.append(
+            f"{ticker} | {fmt(price, '${:.2f}')} | {fmt(rsi, '{:.1f}')} {rsi_label} | "
+            f"{fmt(macd, '{:.4f}')} / {fmt(signal, '{:.4f}')}{cross} | "
+            f"{fmt(row['SMA_50'], '${:.2f}')} | {fmt(sma200, '${:.2f}')} | {trend}"
+        )
+
+    missing = sorted({t.upper() for t in requested} - set(snapshot.index))
+    if missing:
+        lines.append(f"No data: {', '.join(missing)}")
+    return "\n".join(lines)
+
 class FundamentalDataToolInput(BaseModel):
     ticker: str = Field(..., description="The stock ticker symbol.")
 
@@ -113,8 +172,7 @@ class FundamentalDataTool(BaseTool):
 
     def _run(self, ticker: str) -> str:
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            info = get_fundamentals_cache().get(ticker)
             
             return (
                 f"Fundamentals for {ticker}:\n"
@@ -128,3 +186,27 @@ class FundamentalDataTool(BaseTool):
             )
         except Exception as e:
             return f"Error fetching fundamentals for {ticker}: {str(e)}"
+
+class FundamentalsPrefetchToolInput(BaseModel):
+    tickers: List[str] = Field(..., description="List of stock ticker symbols to prefetch fundamentals for.")
+
+class FundamentalsPrefetchTool(BaseTool):
+    name: str = "Fundamentals Prefetch Tool"
+    description: str = (
+        "Warms the local fundamentals cache for a whole list of tickers concurrently. "
+        "Call it once with all candidates before using Fundamental Data Tool per ticker."
+    )
+    args_schema: Type[BaseModel] = FundamentalsPrefetchToolInput
+
+    def _run(self, tickers: List[str]) -> str:
+        try:
+            status = prefetch_fundamentals(tickers)
+            fetched = [t for t, s in status.items() if s == "fetched"]
+            cached = [t for t, s in status.items() if s == "cached"]
+            failed = [f"{t} ({s})" for t, s in status.items() if s.startswith("error")]
+            summary = f"Fundamentals ready: {len(fetched)} fetched, {len(cached)} already cached."
+            if failed:
+                summary += f"\nFailed: {', '.join(failed)}"
+            return summary
+        except Exception as e:
+            return f"Error prefetching fundamentals: {str(e)}"
@@ -0,0 +1,177 @@
+import glob
+import json
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .market_data import period_to_offset
+from .price_cache import get_price_cache
+from .run_history import get_run_history
+
+DEFAULT_HORIZONS = (1, 5, 20, 60)
+DEFAULT_BENCHMARK = "SPY"
+BOOKS = {"top_short": "short", "top_long": "long"}
+# Periods tried, shortest first, when sizing the price panel to the oldest pick.
+PANEL_PERIODS = ("1y", "2y", "5y", "10y")
+# Extra history before the oldest pick, so a weekend or holiday pick has an entry bar.
+ENTRY_MARGIN = pd.Timedelta(days=10)
+
+
+def load_picks(root: str = "output") -> pd.DataFrame:
+    """Collects every published pick from the dashboard_data.json files under `root`.
+
+    Returns one row per (date, ticker, book); the date is the run's as-of date, or
+    the day it was generated for live runs.
+    """
+    rows = []
+    paths = glob.glob(os.path.join(root, "**", "dashboard_data.json"), recursive=True)
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        date = data.get("as_of") or str(data.get("generated_at", ""))[:10]
+        if not date:
+            continue
+        for key, book in BOOKS.items():
+            for pick in data.get(key, []):
+                ticker = str(pick.get("ticker", "")).upper()
+                if ticker:
+                    rows.append((pd.Timestamp(date), ticker, book))
+    picks = pd.DataFrame(rows, columns=["date", "ticker", "book"])
+    return picks.drop_duplicates().sort_values(["date", "book", "ticker"]).reset_index(drop=True)
+
+
+def panel_period(earliest: pd.Timestamp) -> str:
+    """Shortest period whose panel reaches back to `earliest`; the cache serves it
+    without a download whenever it already covers that much (it keeps at least "1y")."""
+    now = pd.Timestamp.now()
+    for period in PANEL_PERIODS:
+        if now - period_to_offset(period) <= earliest - ENTRY_MARGIN:
+            return period
+    return "max"
+
+
+def forward_returns(
+    close: pd.DataFrame,
+    picks: pd.DataFrame,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    benchmark: Optional[str] = DEFAULT_BENCHMARK,
+) -> pd.DataFrame:
+    """Scores every pick at once on a dates x tickers close panel.
+
+    Entry is the close of the last trading day on or before the pick date. For each
+    horizon h (in trading days) adds `ret_{h}d`, `excess_{h}d` (vs. the benchmark)
+    and `mdd_{h}d` (worst drawdown from the running peak within the first h days).
+    Horizons that run past the end of the panel are NaN.
+    """
+    horizons = sorted(horizons)
+    result = picks.copy()
+    if close.empty or picks.empty:
+        for h in horizons:
+            result[f"ret_{h}d"] = result[f"excess_{h}d"] = result[f"mdd_{h}d"] = np.nan
+        return result
+
+    close = close.sort_index().ffill()
+    prices = close.to_numpy(dtype='float64')
+    n_days = prices.shape[0]
+    columns = {t: i for i, t in enumerate(close.columns)}
+
+    entry = np.searchsorted(close.index.values, picks["date"].to_numpy(dtype='datetime64[ns]'), side='right') - 1
+    col = picks["ticker"].map(columns).to_numpy(dtype='float64')
+    valid = (entry >= 0) & ~np.isnan(col)
+    entry = np.where(valid, entry, 0)
+    col = np.where(valid, col, 0).astype(np.int64)
+
+    # (picks x days) price paths from entry to the longest horizon, NaN past the panel end.
+    max_h = horizons[-1]
+    offsets = np.arange(max_h + 1)
+    rows = entry[:, None] + offsets[None, :]
+    inside = rows < n_days
+    paths = prices[np.minimum(rows, n_days - 1), col[:, None]]
+    paths[~inside] = np.nan
+    paths[~valid] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel = paths / paths[:, :1]
+        peak = np.fmax.accumulate(rel, axis=1)
+        drawdown = np.fmin.accumulate(rel / peak - 1, axis=1)
+
+        bench = None
+        if benchmark is not None and benchmark in columns:
+            b = prices[:, columns[benchmark]]
+            bench = b[np.minimum(rows, n_days - 1)] / b[entry][:, None]
+            bench[~inside] = np.nan
+
+    for h in horizons:
+        ret = rel[:, h] - 1
+        result[f"ret_{h}d"] = ret
+        result[f"excess_{h}d"] = ret - (bench[:, h] - 1) if bench is not None else np.nan
+        result[f"mdd_{h}d"] = np.where(np.isnan(ret), np.nan, drawdown[:, h])
+    return result
+
+
+def summarize(results: pd.DataFrame, horizons: Sequence[int] = DEFAULT_HORIZONS) -> pd.DataFrame:
+    """Aggregates scored picks per book and horizon: count, mean/median return, hit rate,
+    excess return, benchmark hit rate and drawdowns."""
+    records = []
+    for book, group in results.groupby("book", sort=True):
+        for h in sorted(horizons):
+            ret = group[f"ret_{h}d"].dropna()
+            excess = group[f"excess_{h}d"].dropna()
+            mdd = group[f"mdd_{h}d"].dropna()
+            records.append({
+                "book": book,
+                "horizon": f"{h}d",
+                "picks": len(ret),
+                "mean_return": ret.mean(),
+                "median_return": ret.median(),
+                "hit_rate": (ret > 0).mean() if len(ret) else np.nan,
+                "mean_excess": excess.mean(),
+                "beat_benchmark": (excess > 0).mean() if len(excess) else np.nan,
+                "mean_drawdown": mdd.mean(),
+                "worst_drawdown": mdd.min(),
+            })
+    return pd.DataFrame.from_records(records)
+
+
+def run_backtest(
+    root: Optional[str] = None,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    benchmark: Optional[str] = DEFAULT_BENCHMARK,
+    picks: Optional[pd.DataFrame] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Loads all published picks (unless given), scores them on the cached price panel and summarizes.
+
+    Picks come from the run history store, which keeps every run; pass `root` to
+    read dashboard_data.json files instead (old run workspaces are garbage
+    collected, so a folder only holds the most recent runs).
+    """
+    if picks is None:
+        picks = load_picks(root) if root else get_run_history().picks_frame()
+    if picks.empty:
+        return forward_returns(pd.DataFrame(), picks, horizons), pd.DataFrame()
+    tickers: List[str] = sorted(set(picks["ticker"]) | ({benchmark} if benchmark else set()))
+    close = get_price_cache().panel(tickers, period=panel_period(picks["date"].min()), field="Close")
+    results = forward_returns(close, picks, horizons, benchmark)
+    return results, summarize(results, horizons)
+
+
+def format_summary(summary: pd.DataFrame, benchmark: Optional[str] = DEFAULT_BENCHMARK) -> str:
+    if summary.empty:
+        return "No published picks to backtest."
+
+    def pct(value):
+        return 'N/A' if pd.isna(value) else f"{value * 100:+.2f}%"
+
+    lines = [f"Book | Horizon | Picks | Mean | Median | Hit Rate | Excess vs {benchmark} | Beat {benchmark} | Avg DD | Worst DD"]
+    for _, row in summary.iterrows():
+        lines.append(
+            f"{row['book']} | {row['horizon']} | {row['picks']} | {pct(row['mean_return'])} | "
+            f"{pct(row['median_return'])} | {pct(row['hit_rate'])} | {pct(row['mean_excess'])} | "
+            f"{pct(row['beat_benchmark'])} | {pct(row['mean_drawdown'])} | {pct(row['worst_drawdown'])}"
+        )
+    return "\n".join(lines)
+
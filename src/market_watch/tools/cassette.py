@@ -0,0 +1,118 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .storage import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CASSETTE_DIR = "cassettes"
+MODES = ("off", "record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+def _normalize(value: Any) -> Any:
+    # Whitespace differences (indentation, trailing newlines) must not change the key.
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return str(value)
+
+
+def request_key(kind: str, request: dict) -> str:
+    """Content hash of a normalized request."""
+    payload = json.dumps({"kind": kind, "request": _normalize(request)}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """Records request/response pairs of slow external calls and replays them from disk.
+
+    Modes (MARKET_WATCH_CASSETTE): 'off' (default), 'record' (always call and save),
+    'replay' (serve from disk only, raise CassetteMiss otherwise) and 'auto' (serve
+    hits, record misses). Entries live at `<root>/<kind>/<key>.json`.
+    """
+
+    def __init__(self, root: Optional[str] = None, mode: Optional[str] = None):
+        self.root = root or os.getenv("MARKET_WATCH_CASSETTE_DIR", DEFAULT_CASSETTE_DIR)
+        self.mode = (mode or os.getenv("MARKET_WATCH_CASSETTE", "off")).lower()
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown MARKET_WATCH_CASSETTE mode: {self.mode}")
+        self.hits = 0
+        self.misses = 0
+        self.unrecorded = 0
+        self._lock = threading.Lock()
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, kind, f"{key}.json")
+
+    def load(self, kind: str, key: str) -> Optional[dict]:
+        path = self._path(kind, key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, kind: str, key: str, request: dict, response: Any) -> None:
+        entry = {"kind": kind, "recorded_at": time.time(), "request": _normalize(request), "response": response}
+        atomic_write_bytes(self._path(kind, key), json.dumps(entry, indent=2).encode('utf-8'))
+
+    def _record(self, kind: str, key: str, request: dict, response: Any) -> None:
+        # Error strings (e.g. a failed search) are transient; replaying them would make them permanent.
+        if isinstance(response, str) and response.startswith("Error"):
+            return
+        try:
+            self.save(kind, key, request, response)
+        except (TypeError, ValueError):
+            # Not JSON serializable (e.g. a pydantic model): replay would miss this request.
+            with self._lock:
+                self.unrecorded += 1
+            logger.warning(
+                "%s response of type %s not recorded; replaying this run will raise CassetteMiss for request %s",
+                kind, type(response).__name__, key[:12],
+            )
+
+    def through(self, kind: str, request: dict, call: Callable[[], Any]) -> Any:
+        """Returns the recorded response for `request`, or runs `call` and records its JSON-serializable,
+        non-error response."""
+        if self.mode == "off":
+            return call()
+        key = request_key(kind, request)
+        if self.mode in ("replay", "auto"):
+            entry = self.load(kind, key)
+            if entry is not None:
+                with self._lock:
+                    self.hits += 1
+                return entry["response"]
+            if self.mode == "replay":
+                raise CassetteMiss(f"No recorded {kind} response for request {key[:12]}")
+        with self._lock:
+            self.misses += 1
+        response = call()
+        self._record(kind, key, request, response)
+        return response
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette:
+    """Returns the process-wide Cassette."""
+    global _cassette
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette()
+        return _cassette
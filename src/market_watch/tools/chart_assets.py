@@ -0,0 +1,149 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+from typing import Dict, Optional
+
+from PIL import Image
+
+from .storage import atomic_write_bytes, cache_dir, output_dir as default_output_dir
+
+MANIFEST_NAME = "chart_manifest.json"
+ASSETS_DIR = "charts"
+# print: 6in wide at 200 dpi for the DOCX; web: dashboard detail view; thumb: dashboard grid.
+# Bump "version" whenever a variant's settings change so cached assets are rebuilt.
+DEFAULT_VARIANTS = {
+    "version": 1,
+    "print": {"width": 1200, "format": "PNG", "colors": 256},
+    "web": {"width": 800, "format": "WEBP", "quality": 80},
+    "thumb": {"width": 240, "format": "WEBP", "quality": 70},
+}
+EXTENSIONS = {"PNG": "png", "WEBP": "webp"}
+
+
+def content_hash(path: str, variants: dict) -> str:
+    """Hash of the source PNG bytes plus the variant settings."""
+    digest = hashlib.sha256(json.dumps(variants, sort_keys=True).encode('utf-8'))
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def encode_variant(image: Image.Image, spec: dict) -> bytes:
+    """Downscales to spec['width'] (never upscales) and encodes with the spec's compression."""
+    if image.width > spec["width"]:
+        height = round(image.height * spec["width"] / image.width)
+        image = image.resize((spec["width"], height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    if spec["format"] == "PNG":
+        # Charts are flat line art: a palette PNG is a fraction of the RGBA size with no visible loss.
+        if spec.get("colors"):
+            image = image.convert("RGB").quantize(colors=spec["colors"], method=Image.Quantize.MEDIANCUT)
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.save(buffer, format=spec["format"], quality=spec.get("quality", 80), method=6)
+    return buffer.getvalue()
+
+
+def load_manifest(output_dir: Optional[str] = None) -> dict:
+    """Reads the chart manifest of an output folder; empty when none was written yet."""
+    path = os.path.join(output_dir or default_output_dir(), MANIFEST_NAME)
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"charts": {}}
+
+
+def variant_paths(manifest: dict, variant: str, output_dir: str) -> Dict[str, str]:
+    """Maps each chart's source file name (e.g. 'NVDA_chart.png') to the path of one variant."""
+    paths = {}
+    for entry in manifest.get("charts", {}).values():
+        asset = entry.get("variants", {}).get(variant)
+        if asset:
+            paths[os.path.basename(entry["source"])] = os.path.join(output_dir, asset["path"])
+    return paths
+
+
+class ChartAssets:
+    """Builds print / web / thumbnail variants of rendered charts.
+
+    Variants are stored once per content hash in the cache, so identical charts
+    (same pixels, same settings) are encoded once and shared. Each output folder
+    gets a copy of its variants under charts/ and a chart_manifest.json listing
+    them, which WordReportTool and the dashboard read.
+    """
+
+    def __init__(self, root: Optional[str] = None, variants: Optional[dict] = None):
+        self.root = root or cache_dir("chart_assets")
+        os.makedirs(self.root, exist_ok=True)
+        self.variants = dict(variants or DEFAULT_VARIANTS)
+        self._lock = threading.Lock()
+
+    def _specs(self) -> Dict[str, dict]:
+        return {name: spec for name, spec in self.variants.items() if isinstance(spec, dict)}
+
+    def build(self, source: str) -> Dict[str, dict]:
+        """Encodes (or reuses) every variant of one chart; returns name -> {file, width, height, bytes}."""
+        key = content_hash(source, self.variants)[:16]
+        built = {}
+        image = None
+        for name, spec in self._specs().items():
+            cached = os.path.join(self.root, f"{key}_{name}.{EXTENSIONS[spec['format']]}")
+            if not os.path.exists(cached):
+                if image is None:
+                    image = Image.open(source)
+                    image.load()
+                atomic_write_bytes(cached, encode_variant(image, spec))
+            with Image.open(cached) as variant:
+                width, height = variant.size
+            built[name] = {"file": cached, "width": width, "height": height, "bytes": os.path.getsize(cached)}
+        return built
+
+    def publish(self, charts: Dict[str, str], output_dir: Optional[str] = None) -> dict:
+        """Builds variants for {ticker: source png}, copies them to the output folder and updates the manifest."""
+        output_dir = output_dir or default_output_dir()
+        assets_dir = os.path.join(output_dir, ASSETS_DIR)
+        os.makedirs(assets_dir, exist_ok=True)
+
+        entries = {}
+        for ticker, source in charts.items():
+            variants = {}
+            for name, asset in self.build(source).items():
+                file_name = os.path.basename(asset["file"])
+                target = os.path.join(assets_dir, file_name)
+                if not os.path.exists(target):
+                    shutil.copyfile(asset["file"], target)
+                variants[name] = {
+                    "path": os.path.join(ASSETS_DIR, file_name),
+                    "width": asset["width"],
+                    "height": asset["height"],
+                    "bytes": asset["bytes"],
+                }
+            entries[ticker.upper()] = {"source": os.path.relpath(source, output_dir), "variants": variants}
+
+        with self._lock:
+            manifest = load_manifest(output_dir)
+            manifest.setdefault("charts", {}).update(entries)
+            manifest["version"] = self.variants.get("version")
+            atomic_write_bytes(
+                os.path.join(output_dir, MANIFEST_NAME),
+                json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'),
+            )
+        return manifest
+
+
+_assets: Optional[ChartAssets] = None
+_assets_lock = threading.Lock()
+
+
+def get_chart_assets() -> ChartAssets:
+    """Returns the process-wide ChartAssets."""
+    global _assets
+    with _assets_lock:
+        if _assets is None:
+            _assets = ChartAssets()
+        return _assets
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .chart_assets import ChartAssets, get_chart_assets
+from .storage import cache_dir, output_dir as default_output_dir
+
+# Bump "version" whenever the drawing code changes so cached PNGs are invalidated.
+# 150 dpi gives a 1500px source, enough for the 1200px print variant in chart_assets.py.
+DEFAULT_CHART_PARAMS = {"version": 2, "figsize": [10, 6], "dpi": 150, "yscale": "log", "title": "1 Year Logarithmic"}
+
+
+def chart_key(ticker: str, close: pd.Series, params: dict) -> str:
+    """Content hash of everything that determines a chart's pixels."""
+    digest = hashlib.sha256()
+    digest.update(ticker.upper().encode('utf-8'))
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    digest.update(np.ascontiguousarray(close.index.values.astype('datetime64[ns]').view('int64')).tobytes())
+    digest.update(np.ascontiguousarray(close.to_numpy(dtype='float64')).tobytes())
+    return digest.hexdigest()
+
+
+def render_chart(ticker: str, dates: np.ndarray, closes: np.ndarray, path: str, params: dict) -> str:
+    """Draws one chart with the object-oriented Figure API (no pyplot global state).
+
+    Module-level so it can run inside worker processes.
+    """
+    fig = Figure(figsize=tuple(params["figsize"]), dpi=params["dpi"])
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.plot(dates, closes, label=f'{ticker} Close Price')
+    ax.set_yscale(params["yscale"])
+    ax.set_title(f'{ticker} Price History ({params["title"]})')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price (Log Scale)' if params["yscale"] == "log" else 'Price')
+    ax.legend()
+    ax.grid(True, which="both", ls="-", alpha=0.2)
+
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".png")
+    os.close(fd)
+    try:
+        fig.savefig(tmp_path, format="png")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+class ChartRenderer:
+    """Renders price charts into a content-addressed cache and publishes them to the output folder."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        params: Optional[dict] = None,
+        max_workers: Optional[int] = None,
+        assets: Optional[ChartAssets] = None,
+    ):
+        self.root = root or cache_dir("charts")
+        self.assets = assets
+        os.makedirs(self.root, exist_ok=True)
+        self.params = dict(params or DEFAULT_CHART_PARAMS)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def cached_path(self, ticker: str, key: str) -> str:
+        return os.path.join(self.root, f"{ticker.upper()}_{key[:16]}.png")
+
+    def _publish(self, ticker: str, source: str, output_dir: str) -> str:
+        os.makedirs(output_dir, exist_ok=True)
+        target = os.path.join(output_dir, f"{ticker}_chart.png")
+        fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix=".tmp-", suffix=".png")
+        os.close(fd)
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+        return target
+
+    def render(self, ticker: str, close: pd.Series, output_dir: Optional[str] = None) -> str:
+        """Renders (or reuses) a single chart in-process and returns its output path."""
+        return self.render_many({ticker: close}, output_dir)[ticker]
+
+    def warm(self, series: Dict[str, pd.Series]) -> Dict[str, str]:
+        """Renders charts for many tickers into the cache only, skipping unchanged ones and
+        fanning the rest out over a process pool. Returns the cached PNG per ticker."""
+        jobs = {}
+        cached = {}
+        for ticker, close in series.items():
+            path = cached[ticker] = self.cached_path(ticker, chart_key(ticker, close, self.params))
+            if not os.path.exists(path):
+                jobs[ticker] = (ticker, close.index.values, close.to_numpy(dtype='float64'), path, self.params)
+
+        workers = min(self.max_workers, len(jobs))
+        if workers > 1:
+            # spawn, not fork: this runs inside the threaded crew, and a forked child
+            # could inherit a lock (SQLite caches, logging) held by another thread.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = [pool.submit(render_chart, *job) for job in jobs.values()]
+                for future in futures:
+                    future.result()
+        else:
+            for job in jobs.values():
+                render_chart(*job)
+        return cached
+
+    def render_many(self, series: Dict[str, pd.Series], output_dir: Optional[str] = None) -> Dict[str, str]:
+        """Renders (or reuses) charts for many tickers and publishes them to the output folder."""
+        output_dir = output_dir or default_output_dir()
+        cached = self.warm(series)
+        published = {ticker: self._publish(ticker, path, output_dir) for ticker, path in cached.items()}
+        # Sized, compressed variants + chart_manifest.json for the report and the dashboard.
+        (self.assets or get_chart_assets()).publish(published, output_dir)
+        return published
+
+
+_renderer: Optional[ChartRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    """Returns the process-wide ChartRenderer."""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = ChartRenderer()
+        return _renderer
@@ -0,0 +1,134 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from .storage import atomic_write_bytes, output_dir as default_output_dir
+
+try:
+    import brotli
+except ImportError:  # optional: shards are always written gzip, brotli only when installed
+    brotli = None
+
+DASHBOARD_DIR = "dashboard"
+INDEX_NAME = "index.json"
+# Shard files of the previous index are kept so a reader holding it can still fetch them.
+KEEP_GENERATIONS = 2
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def etag(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def shard_file_name(name: str, tag: str) -> str:
+    """'tickers/NVDA' + tag -> 'tickers__NVDA.<tag>.json'; the tag makes each version immutable."""
+    return f"{name.replace('/', '__')}.{tag}.json"
+
+
+class DashboardStore:
+    """Dashboard API on disk: a small index.json plus content-addressed, compressed shards.
+
+    The index holds the picks, timestamps and, for every shard, its ETag and file
+    names. Shards (report body, per-ticker details, chart manifest) are written as
+    `<name>.<etag>.json.gz` (and `.br` when brotli is installed), so an unchanged
+    shard keeps its file and a client only refetches shards whose ETag moved.
+    Every file is written atomically and the index is written last.
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, keep_generations: int = KEEP_GENERATIONS):
+        self.root = os.path.join(output_dir or default_output_dir(), DASHBOARD_DIR)
+        os.makedirs(self.root, exist_ok=True)
+        self.keep_generations = keep_generations
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, INDEX_NAME)
+
+    def load_index(self) -> dict:
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_shard(self, name: str, value) -> dict:
+        data = _dumps(value)
+        tag = etag(data)
+        base = shard_file_name(name, tag)
+        files = {"gzip": base + ".gz"}
+        if brotli is not None:
+            files["br"] = base + ".br"
+        for encoding, file_name in files.items():
+            path = os.path.join(self.root, file_name)
+            if os.path.exists(path):
+                continue
+            # mtime=0 keeps gzip output byte-identical for identical content.
+            body = gzip.compress(data, compresslevel=9, mtime=0) if encoding == "gzip" else brotli.compress(data)
+            atomic_write_bytes(path, body)
+        return {"etag": tag, "bytes": len(data), "files": files}
+
+    def publish(self, summary: dict, shards: Dict[str, object]) -> dict:
+        """Writes every shard, then the index: `summary` fields plus {'etag', 'shards'}."""
+        with self._lock:
+            previous = self.load_index()
+            entries = {name: self._write_shard(name, value) for name, value in shards.items()}
+            index = dict(summary)
+            index["shards"] = entries
+            index["etag"] = etag(_dumps({"summary": summary, "shards": {n: e["etag"] for n, e in entries.items()}}))
+            index["previous_etag"] = previous.get("etag")
+            current = sorted(f for entry in entries.values() for f in entry["files"].values())
+            index["generations"] = [current] + previous.get("generations", [])[: self.keep_generations - 1]
+            atomic_write_bytes(self.index_path, _dumps(index))
+            self._collect(index)
+            return index
+
+    def _collect(self, index: dict) -> int:
+        """Deletes shard files no longer referenced by the last `keep_generations` indexes."""
+        live = {INDEX_NAME} | {f for gen in index["generations"] for f in gen}
+        removed = 0
+        for file_name in os.listdir(self.root):
+            if file_name not in live and not file_name.startswith(".tmp-"):
+                os.remove(os.path.join(self.root, file_name))
+                removed += 1
+        return removed
+
+    def read_shard(self, name: str, index: Optional[dict] = None):
+        """Loads one shard through the index (used by tests and Python consumers)."""
+        index = index or self.load_index()
+        entry = index["shards"][name]
+        with open(os.path.join(self.root, entry["files"]["gzip"]), 'rb') as f:
+            return json.loads(gzip.decompress(f.read()))
+
+
+def build_shards(
+    report_markdown: str,
+    picks: Dict[str, List[dict]],
+    chart_assets: Optional[dict] = None,
+    snapshot=None,
+    fundamentals: Optional[Dict[str, dict]] = None,
+) -> Dict[str, object]:
+    """Splits one run into shards: 'report', 'charts' and one 'tickers/<T>' per picked ticker."""
+    shards: Dict[str, object] = {"report": {"markdown": report_markdown}, "charts": chart_assets or {}}
+    details: Dict[str, dict] = {}
+    for book, items in picks.items():
+        for rank, pick in enumerate(items, start=1):
+            ticker = pick["ticker"].upper()
+            detail = details.setdefault(ticker, {"ticker": ticker, "picks": []})
+            detail["picks"].append({"book": book, "rank": rank, "reason": pick.get("reason")})
+    for ticker, detail in details.items():
+        if snapshot is not None and ticker in snapshot.index:
+            row = snapshot.loc[ticker]
+            detail["indicators"] = {k: (None if v != v else float(v)) for k, v in row.items()}
+        if fundamentals and ticker in fundamentals:
+            detail["fundamentals"] = fundamentals[ticker]
+        if chart_assets and ticker in chart_assets:
+            detail["chart"] = chart_assets[ticker]
+        shards[f"tickers/{ticker}"] = detail
+    return shards
@@ -1,9 +1,8 @@
-import subprocess
-import os
 from crewai.tools import BaseTool
 from typing import Type, List
 from pydantic import BaseModel, Field
 from datetime import datetime
+from .git_backend import GitError, get_git_backend, valid_branch_name
 
 
 class GitStatusToolInput(BaseModel):
@@ -16,15 +15,10 @@ class GitStatusTool(BaseTool):
 
     def _run(self) -> str:
         try:
-            result = subprocess.run(
-                ['git', 'status', '--short'],
-                capture_output=True,
-                text=True,
-                cwd=os.getcwd()
-            )
-            if result.returncode == 0:
-                return f"Git Status:\n{result.stdout}" if result.stdout else "Working tree clean"
-            return f"Error: {result.stderr}"
+            status = get_git_backend().status()
+            return f"Git Status:\n{status}" if status else "Working tree clean"
+        except GitError as e:
+            return f"Error: {str(e)}"
         except Exception as e:
             return f"Error checking git status: {str(e)}"
 
@@ -39,29 +33,21 @@ class GitBranchTool(BaseTool):
 
     def _run(self, branch_name: str) -> str:
         try:
-            # Check if branch exists
-            check_result = subprocess.run(
-                ['git', 'branch', '--list', branch_name],
-                capture_output=True,
-                text=True,
-                cwd=os.getcwd()
-            )
-            
-            if branch_name in check_result.stdout:
+            if not valid_branch_name(branch_name):
+                return f"Error: '{branch_name}' is not a valid branch name"
+            git = get_git_backend()
+            # Check the ref directly rather than parsing `git branch --list`
+            if git.branch_exists(branch_name):
                 # Switch to existing branch
-                subprocess.run(['git', 'checkout', branch_name], cwd=os.getcwd())
+                git.checkout(branch_name)
                 return f"Branch '{branch_name}' already exists. Switched to it."
-            
+
             # Create and switch to new branch
-            result = subprocess.run(
-                ['git', 'checkout', '-b', branch_name],
-                capture_output=True,
-                text=True,
-                cwd=os.getcwd()
-            )
-            if result.returncode == 0:
-                return f"Successfully created and switched to branch '{branch_name}'"
-            return f"Error creating branch: {result.stderr}"
+            try:
+                git.checkout(branch_name, create=True)
+            except GitError as e:
+                return f"Error creating branch: {str(e)}"
+            return f"Successfully created and switched to branch '{branch_name}'"
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -81,23 +67,12 @@ class GitCommitTool(BaseTool):
 
     def _run(self, message: str, files: List[str] = []) -> str:
         try:
-            # Stage files
-            if files:
-                for file in files:
-                    subprocess.run(['git', 'add', file], cwd=os.getcwd())
-            else:
-                subprocess.run(['git', 'add', '.'], cwd=os.getcwd())
-
-            # Commit
-            result = subprocess.run(
-                ['git', 'commit', '-m', message],
-                capture_output=True,
-                text=True,
-                cwd=os.getcwd()
-            )
-            if result.returncode == 0:
-                return f"Commit successful: {message}\n{result.stdout}"
-            return f"Commit failed: {result.stderr}"
+            # Stages all files in one git invocation, then commits
+            try:
+                output = get_git_backend().commit(message, files)
+            except GitError as e:
+                return f"Commit failed: {str(e)}"
+            return f"Commit successful: {message}\n{output}"
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -113,22 +88,10 @@ class GitPushTool(BaseTool):
 
     def _run(self, branch_name: str, set_upstream: bool = True) -> str:
         try:
-            cmd = ['git', 'push']
-            if set_upstream:
-                cmd.extend(['-u', 'origin', branch_name])
-            else:
-                cmd.append('origin')
-                cmd.append(branch_name)
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=os.getcwd()
-            )
-            if result.returncode == 0:
-                return f"Successfully pushed to {branch_name}"
-            return f"Push failed: {result.stderr}"
+            get_git_backend().push(branch_name, set_upstream=set_upstream)
+            return f"Successfully pushed to {branch_name}"
+        except GitError as e:
+            return f"Push failed: {str(e)}"
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -149,32 +112,17 @@ class GitHubPRTool(BaseTool):
 
     def _run(self, title: str, body: str, head_branch: str, base_branch: str = "main") -> str:
         try:
-            from .github_app_auth import get_installation_token
-            import requests
-
-            # Get repo from .env
-            repo_full_name = os.getenv("GITHUB_REPO")
-            if not repo_full_name:
-                return "Error: GITHUB_REPO not set in .env"
-
-            # Get auth token
-            token = get_installation_token()
-
-            # Create PR
-            url = f"https://api.github.com/repos/{repo_full_name}/pulls"
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28"
-            }
-            data = {
-                "title": title,
-                "body": body,
-                "head": head_branch,
-                "base": base_branch
-            }
-
-            response = requests.post(url, headers=headers, json=data)
+            from .github_client import get_github_client
+            from .github_tools import configured_repo
+
+            # Same configuration check as the issue tools (owner, repo and app credentials)
+            target, error = configured_repo()
+            if error:
+                return error
+            owner, repo = target
+
+            # Create PR (pooled, paced client; auth token cached until shortly before expiry)
+            response = get_github_client().create_pull(owner, repo, title, body, head_branch, base_branch)
             if response.status_code == 201:
                 pr_url = response.json().get('html_url')
                 return f"Pull Request created successfully: {pr_url}"
@@ -0,0 +1,202 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from .market_data import MarketDataProvider, get_provider
+from .storage import as_of, cache_dir
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Per-field time-to-live in seconds. Prices move intraday, identity fields almost never.
+FIELD_TTLS = {
+    'marketCap': HOUR,
+    'forwardPE': HOUR,
+    'trailingPE': HOUR,
+    'currentPrice': HOUR,
+    'fiftyTwoWeekHigh': HOUR,
+    'fiftyTwoWeekLow': HOUR,
+    'trailingEps': DAY,
+    'forwardEps': DAY,
+    'dividendYield': DAY,
+    'longName': 30 * DAY,
+    'shortName': 30 * DAY,
+    'sector': 30 * DAY,
+    'industry': 30 * DAY,
+}
+DEFAULT_TTL = DAY
+
+# Fields the Fundamental Data Tool reports on.
+REPORT_FIELDS = ['longName', 'sector', 'marketCap', 'forwardPE', 'trailingEps', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow']
+
+
+class FundamentalsCache:
+    """SQLite-backed cache of `info` fundamentals with a TTL per field.
+
+    Rows are mirrored in an in-process dict so repeated lookups never touch disk.
+    Every refresh is also appended to `fundamentals_history`; with an `as_of` date
+    (MARKET_WATCH_AS_OF) lookups return the last values fetched by the end of that
+    day and never refresh.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        provider: Optional[MarketDataProvider] = None,
+        ttls: Optional[Dict[str, int]] = None,
+        as_of_date: Optional[str] = None,
+    ):
+        self.provider = provider or get_provider()
+        if path is None:
+            directory = cache_dir() if self.provider.name == "yfinance" else cache_dir(self.provider.name)
+            path = os.path.join(directory, "fundamentals.sqlite")
+        self.path = path
+        self.ttls = dict(FIELD_TTLS, **(ttls or {}))
+        as_of_date = as_of_date or as_of()
+        # Point-in-time cutoff: the end of the as-of day, in epoch seconds.
+        self.as_of_cutoff = (
+            datetime.strptime(as_of_date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() + DAY
+            if as_of_date else None
+        )
+        self._lock = threading.Lock()
+        self._memo: Dict[str, Dict[str, tuple]] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fundamentals ("
+            " ticker TEXT NOT NULL, field TEXT NOT NULL, value TEXT, fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (ticker, field)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fundamentals_history ("
+            " ticker TEXT NOT NULL, field TEXT NOT NULL, fetched_at REAL NOT NULL, value TEXT,"
+            " PRIMARY KEY (ticker, field, fetched_at)) WITHOUT ROWID"
+        )
+        if self._conn.execute("SELECT 1 FROM fundamentals_history LIMIT 1").fetchone() is None:
+            # Caches created before the history table: seed it with the current values.
+            self._conn.execute(
+                "INSERT OR IGNORE INTO fundamentals_history (ticker, field, fetched_at, value)"
+                " SELECT ticker, field, fetched_at, value FROM fundamentals"
+            )
+        self._conn.commit()
+
+    def _rows(self, ticker: str) -> Dict[str, tuple]:
+        with self._lock:
+            rows = self._memo.get(ticker)
+            if rows is None:
+                if self.as_of_cutoff is None:
+                    cursor = self._conn.execute(
+                        "SELECT field, value, fetched_at FROM fundamentals WHERE ticker = ?", (ticker,)
+                    )
+                else:
+                    cursor = self._conn.execute(
+                        "SELECT field, value, MAX(fetched_at) FROM fundamentals_history"
+                        " WHERE ticker = ? AND fetched_at < ? GROUP BY field",
+                        (ticker, self.as_of_cutoff),
+                    )
+                rows = {field: (json.loads(value), fetched_at) for field, value, fetched_at in cursor}
+                self._memo[ticker] = rows
+            return rows
+
+    def _is_fresh(self, rows: Dict[str, tuple], fields: List[str], now: float) -> bool:
+        for field in fields:
+            row = rows.get(field)
+            if row is None or now - row[1] > self.ttls.get(field, DEFAULT_TTL):
+                return False
+        return True
+
+    def is_fresh(self, ticker: str, fields: Optional[List[str]] = None) -> bool:
+        return self._is_fresh(self._rows(ticker.upper()), fields or REPORT_FIELDS, time.time())
+
+    def refresh(self, ticker: str) -> Dict[str, tuple]:
+        """Fetches `info` from the provider and stores every scalar field."""
+        ticker = ticker.upper()
+        info = self.provider.info(ticker) or {}
+        now = time.time()
+        rows = {
+            field: (value, now) for field, value in info.items()
+            if value is None or isinstance(value, (str, int, float, bool))
+        }
+        # Remember known fields the provider does not have, so they are not refetched every call.
+        for field in set(self.ttls) | set(REPORT_FIELDS):
+            rows.setdefault(field, (None, now))
+
+        records = [(ticker, field, json.dumps(value), fetched_at) for field, (value, fetched_at) in rows.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fundamentals (ticker, field, value, fetched_at) VALUES (?, ?, ?, ?)", records
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fundamentals_history (ticker, field, value, fetched_at) VALUES (?, ?, ?, ?)",
+                records,
+            )
+            self._conn.commit()
+            self._memo[ticker] = rows
+        return rows
+
+    def get(self, ticker: str, fields: Optional[List[str]] = None) -> dict:
+        """Returns the requested fields (omitting unknown ones), refreshing if any has expired."""
+        ticker = ticker.upper()
+        fields = fields or REPORT_FIELDS
+        rows = self._rows(ticker)
+        if self.as_of_cutoff is None and not self._is_fresh(rows, fields, time.time()):
+            rows = self.refresh(ticker)
+        return {field: rows[field][0] for field in fields if field in rows and rows[field][0] is not None}
+
+    def field_values(self, field: str) -> Dict[str, object]:
+        """Returns the cached value of one field for every ticker, without fetching."""
+        with self._lock:
+            if self.as_of_cutoff is None:
+                cursor = self._conn.execute(
+                    "SELECT ticker, value FROM fundamentals WHERE field = ? AND value != 'null'", (field,)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "SELECT ticker, value, MAX(fetched_at) FROM fundamentals_history"
+                    " WHERE field = ? AND fetched_at < ? GROUP BY ticker",
+                    (field, self.as_of_cutoff),
+                )
+            return {row[0]: json.loads(row[1]) for row in cursor if row[1] != 'null'}
+
+    def prefetch(self, tickers: List[str], fields: Optional[List[str]] = None, max_workers: int = 8) -> Dict[str, str]:
+        """Warms the cache for many tickers concurrently. Returns a status per ticker."""
+        symbols = sorted({t.upper() for t in tickers})
+        if self.as_of_cutoff is not None:
+            return {t: "as-of" for t in symbols}
+        stale = [t for t in symbols if not self.is_fresh(t, fields)]
+        status = {t: "cached" for t in symbols if t not in stale}
+
+        def fetch(ticker):
+            try:
+                self.refresh(ticker)
+                return ticker, "fetched"
+            except Exception as e:
+                return ticker, f"error: {str(e)}"
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(stale))) as pool:
+                status.update(pool.map(fetch, stale))
+        return status
+
+
+_cache: Optional[FundamentalsCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_fundamentals_cache() -> FundamentalsCache:
+    """Returns the process-wide FundamentalsCache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FundamentalsCache()
+        return _cache
+
+
+def prefetch_fundamentals(tickers: List[str]) -> Dict[str, str]:
+    """Warms the shared fundamentals cache before the fundamental analyst starts."""
+    return get_fundamentals_cache().prefetch(tickers)
@@ -0,0 +1,172 @@
+import atexit
+import os
+import re
+import subprocess
+import threading
+from typing import Dict, List, Optional
+
+
+_BAD_REF_CHARS = re.compile(r"[\x00-\x20\x7f~^:?*\[\\]")
+
+
+class GitError(Exception):
+    """A git command failed; the message is git's stderr."""
+
+
+def valid_branch_name(name: str) -> bool:
+    """Whether `name` is a legal branch name (the rules of `git check-ref-format --branch`).
+
+    Checked before a name is turned into a ref path, so '../..' never escapes the refs directory.
+    """
+    if not name or name == "@" or name.startswith(("-", "/")) or name.endswith(("/", ".")):
+        return False
+    if ".." in name or "//" in name or "@{" in name or _BAD_REF_CHARS.search(name):
+        return False
+    return not any(part.startswith(".") or part.endswith(".lock") for part in name.split("/"))
+
+
+class GitBackend:
+    """Git operations for one working tree with as few process spawns as possible.
+
+    - staging is one `git add` for any number of paths (pathspecs go over stdin)
+    - HEAD and branch lookups read the ref files in-process; object and ref
+      queries that need git go to one long-lived `git cat-file --batch-check`
+    - the repository layout is resolved once, not per call
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.stats = {"spawns": 0, "batch_queries": 0}
+        self._lock = threading.Lock()
+        self._cat_file: Optional[subprocess.Popen] = None
+        cwd = os.path.abspath(path or os.getcwd())
+        toplevel, git_dir, common_dir = self.run(
+            "rev-parse", "--show-toplevel", "--absolute-git-dir", "--git-common-dir", cwd=cwd
+        ).splitlines()
+        self.cwd = cwd
+        self.toplevel = toplevel
+        self.git_dir = git_dir
+        # Shared by all worktrees: refs and packed-refs live here.
+        self.common_dir = os.path.normpath(os.path.join(cwd, common_dir))
+
+    def run(self, *args: str, input: Optional[str] = None, cwd: Optional[str] = None, check: bool = True) -> str:
+        """Runs one git command and returns its stdout; raises GitError on failure when `check`."""
+        with self._lock:
+            self.stats["spawns"] += 1
+        result = subprocess.run(
+            ["git", *args], input=input, capture_output=True, text=True, cwd=cwd or self.cwd
+        )
+        if check and result.returncode != 0:
+            raise GitError(result.stderr.strip() or f"git {args[0]} exited with {result.returncode}")
+        return result.stdout
+
+    # --- queries -----------------------------------------------------------
+
+    def _batch(self, query: str) -> str:
+        """One round trip to the persistent `git cat-file --batch-check` process."""
+        with self._lock:
+            if self._cat_file is None or self._cat_file.poll() is not None:
+                self.stats["spawns"] += 1
+                self._cat_file = subprocess.Popen(
+                    ["git", "cat-file", "--batch-check"],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=self.toplevel,
+                )
+            self.stats["batch_queries"] += 1
+            self._cat_file.stdin.write(query + "\n")
+            self._cat_file.stdin.flush()
+            return self._cat_file.stdout.readline().rstrip("\n")
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """Object id of `rev` (a ref, sha or rev expression), or None if it does not exist."""
+        if "\n" in rev:
+            return None
+        line = self._batch(rev)
+        if not line:
+            return None
+        return None if line.endswith(" missing") or line.endswith(" ambiguous") else line.split(" ", 1)[0]
+
+    def _read_ref(self, ref: str) -> Optional[str]:
+        """A ref from the files backend (loose file, then packed-refs); None if absent."""
+        try:
+            with open(os.path.join(self.common_dir, ref), 'r') as f:
+                return f.read().strip() or None
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(os.path.join(self.common_dir, "packed-refs"), 'r') as f:
+                for line in f:
+                    if line.rstrip("\n").endswith(f" {ref}"):
+                        return line.split(" ", 1)[0]
+        except OSError:
+            pass
+        return None
+
+    def ref_exists(self, ref: str) -> bool:
+        """Whether a fully qualified ref (refs/heads/main) exists."""
+        if os.path.isdir(os.path.join(self.common_dir, "reftable")):
+            return self.resolve(ref) is not None
+        return self._read_ref(ref) is not None
+
+    def branch_exists(self, name: str) -> bool:
+        """Whether branch `name` exists; False for names git would reject."""
+        return valid_branch_name(name) and self.ref_exists(f"refs/heads/{name}")
+
+    def current_branch(self) -> Optional[str]:
+        """Checked-out branch name, or None on a detached HEAD."""
+        with open(os.path.join(self.git_dir, "HEAD"), 'r') as f:
+            head = f.read().strip()
+        return head[len("ref: refs/heads/"):] if head.startswith("ref: refs/heads/") else None
+
+    def status(self) -> str:
+        """`git status --short` output."""
+        return self.run("status", "--short")
+
+    # --- changes -----------------------------------------------------------
+
+    def add(self, paths: Optional[List[str]] = None) -> None:
+        """Stages `paths` in one git invocation; everything under the backend's directory if empty.
+
+        Paths, like `git add .`, are relative to the directory the backend was opened in.
+        """
+        if not paths:
+            self.run("add", ".")
+            return
+        self.run("add", "--pathspec-from-file=-", "--pathspec-file-nul", input="\0".join(paths))
+
+    def checkout(self, branch: str, create: bool = False) -> None:
+        self.run("checkout", *(["-b"] if create else []), branch)
+
+    def commit(self, message: str, paths: Optional[List[str]] = None) -> str:
+        """Stages `paths` (see `add`) and commits: two git invocations however many files."""
+        self.add(paths)
+        return self.run("commit", "-m", message)
+
+    def push(self, branch: str, remote: str = "origin", set_upstream: bool = True) -> str:
+        return self.run("push", *(["-u"] if set_upstream else []), remote, branch)
+
+    def close(self) -> None:
+        with self._lock:
+            process, self._cat_file = self._cat_file, None
+        if process is not None and process.poll() is None:
+            process.stdin.close()
+            process.wait(timeout=5)
+
+
+_backends: Dict[str, GitBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_git_backend(path: Optional[str] = None) -> GitBackend:
+    """Returns the process-wide GitBackend for the working tree containing `path` (default: cwd)."""
+    key = os.path.abspath(path or os.getcwd())
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = _backends[key] = GitBackend(key)
+        return backend
+
+
+@atexit.register
+def _close_backends() -> None:
+    with _backends_lock:
+        for backend in _backends.values():
+            backend.close()
@@ -1,63 +1,256 @@
 import jwt
+import json
 import time
+import threading
 import requests
 import os
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from cryptography.hazmat.primitives import serialization
 from dotenv import load_dotenv
+from .rate_limiter import get_rate_limiter
+from .storage import atomic_write_bytes
 
 load_dotenv()
 
+DEFAULT_API_URL = "https://api.github.com"
+# Installation tokens live for an hour; refresh this many seconds before they expire.
+DEFAULT_REFRESH_MARGIN = 300
+# App JWTs may live at most 10 minutes; we sign for 9 and reuse them until 1 minute is left.
+JWT_LIFETIME = 9 * 60
+JWT_REUSE_MARGIN = 60
+
+
+def parse_repo(owner: Optional[str], repo: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Accepts GITHUB_OWNER + GITHUB_REPO or a single 'owner/repo' in GITHUB_REPO."""
+    if repo and "/" in repo:
+        parts = repo.split("/")
+        if len(parts) == 2:
+            return parts[0], parts[1]
+    return owner, repo
+
+
 class GitHubAppAuth:
-    def __init__(self, app_id: str, private_key_path: str):
+    def __init__(self, app_id: str, private_key_path: str, api_url: Optional[str] = None):
         self.app_id = app_id
         self.private_key_path = private_key_path
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+        self._private_key = None
+        self._jwt: Optional[Tuple[str, float]] = None
+        self._lock = threading.Lock()
+
+    def private_key(self):
+        """The parsed private key; the PEM file is read and parsed once."""
+        if self._private_key is None:
+            with open(self.private_key_path, 'rb') as f:
+                self._private_key = serialization.load_pem_private_key(f.read(), password=None)
+        return self._private_key
 
     def generate_jwt(self) -> str:
-        """Generates a JWT for GitHub App authentication."""
-        with open(self.private_key_path, 'r') as f:
-            private_key = f.read()
-
-        payload = {
-            # Issued at time, 60 seconds in the past to allow for clock drift
-            'iat': int(time.time()) - 60,
-            # JWT expiration time (10 minute maximum, using 9 to be safe)
-            'exp': int(time.time()) + (9 * 60),
-            # GitHub App's identifier
-            'iss': self.app_id
-        }
+        """Generates a JWT for GitHub App authentication, reusing it until shortly before it expires."""
+        with self._lock:
+            now = time.time()
+            if self._jwt and self._jwt[1] - now > JWT_REUSE_MARGIN:
+                return self._jwt[0]
 
-        encoded_jwt = jwt.encode(payload, private_key, algorithm='RS256')
-        return encoded_jwt
+            payload = {
+                # Issued at time, 60 seconds in the past to allow for clock drift
+                'iat': int(now) - 60,
+                # JWT expiration time (10 minute maximum, using 9 to be safe)
+                'exp': int(now) + JWT_LIFETIME,
+                # GitHub App's identifier
+                'iss': self.app_id
+            }
 
-    def get_installation_access_token(self, installation_id: str) -> str:
-        """Exchanges the JWT for an installation access token."""
-        jwt_token = self.generate_jwt()
-        headers = {
-            'Authorization': f'Bearer {jwt_token}',
+            encoded_jwt = jwt.encode(payload, self.private_key(), algorithm='RS256')
+            self._jwt = (encoded_jwt, payload['exp'])
+            return encoded_jwt
+
+    def _headers(self) -> dict:
+        return {
+            'Authorization': f'Bearer {self.generate_jwt()}',
             'Accept': 'application/vnd.github+json',
             'X-GitHub-Api-Version': '2022-11-28'
         }
-        
-        url = f'https://api.github.com/app/installations/{installation_id}/access_tokens'
-        response = requests.post(url, headers=headers)
-        
+
+    def create_installation_access_token(self, installation_id: str) -> dict:
+        """Exchanges the JWT for an installation access token; returns GitHub's {'token', 'expires_at', ...}."""
+        url = f'{self.api_url}/app/installations/{installation_id}/access_tokens'
+        get_rate_limiter().acquire("github")
+        response = requests.post(url, headers=self._headers())
+
         if response.status_code == 201:
-            return response.json()['token']
+            return response.json()
         else:
             raise Exception(f"Failed to get installation token: {response.status_code} {response.text}")
-    
+
+    def get_installation_access_token(self, installation_id: str) -> str:
+        """Exchanges the JWT for an installation access token."""
+        return self.create_installation_access_token(installation_id)['token']
+
     def get_installation_id(self, owner: str, repo: str) -> str:
         """Gets the installation ID for a specific repository."""
-        jwt_token = self.generate_jwt()
-        headers = {
-            'Authorization': f'Bearer {jwt_token}',
-            'Accept': 'application/vnd.github+json',
-            'X-GitHub-Api-Version': '2022-11-28'
-        }
-        
-        url = f'https://api.github.com/repos/{owner}/{repo}/installation'
-        response = requests.get(url, headers=headers)
-        
+        url = f'{self.api_url}/repos/{owner}/{repo}/installation'
+        get_rate_limiter().acquire("github")
+        response = requests.get(url, headers=self._headers())
+
         if response.status_code == 200:
             return response.json()['id']
         else:
              raise Exception(f"Failed to get installation ID for repo {owner}/{repo}: {response.status_code} {response.text}")
+
+
+def _expiry(expires_at: Optional[str]) -> float:
+    """GitHub's ISO-8601 expires_at ('2026-01-05T10:00:00Z') as epoch seconds; an hour from now if absent."""
+    if not expires_at:
+        return time.time() + 3600
+    return datetime.fromisoformat(expires_at.replace("Z", "+00:00")).timestamp()
+
+
+class InstallationTokenManager:
+    """Caches what a GitHub App call needs so tools stop re-authenticating on every call.
+
+    - the parsed private key and the app JWT (via GitHubAppAuth)
+    - the installation id per owner/repo
+    - the installation token per installation, until `refresh_margin` seconds
+      before it expires
+
+    Refreshes are serialized per installation, so concurrent callers trigger a
+    single token request. With `cache_path` the ids and tokens are persisted
+    (owner-only file mode) and survive restarts.
+    """
+
+    def __init__(
+        self,
+        app_id: str,
+        private_key_path: str,
+        api_url: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        refresh_margin: int = DEFAULT_REFRESH_MARGIN,
+    ):
+        self.auth = GitHubAppAuth(app_id, private_key_path, api_url)
+        self.cache_path = cache_path
+        self.refresh_margin = refresh_margin
+        self.stats = {"hits": 0, "refreshes": 0, "installation_lookups": 0}
+        self._installations: Dict[str, str] = {}
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self._load()
+
+    @property
+    def api_url(self) -> str:
+        return self.auth.api_url
+
+    def _load(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("app_id") != self.auth.app_id or data.get("api_url") != self.api_url:
+            return
+        self._installations = dict(data.get("installations", {}))
+        self._tokens = {k: (v["token"], v["expires"]) for k, v in data.get("tokens", {}).items()}
+
+    def _save(self) -> None:
+        if not self.cache_path:
+            return
+        data = {
+            "app_id": self.auth.app_id,
+            "api_url": self.api_url,
+            "installations": self._installations,
+            "tokens": {k: {"token": token, "expires": expires} for k, (token, expires) in self._tokens.items()},
+        }
+        atomic_write_bytes(self.cache_path, json.dumps(data).encode('utf-8'))
+        os.chmod(self.cache_path, 0o600)
+
+    def installation_id(self, owner: str, repo: str) -> str:
+        key = f"{owner}/{repo}".lower()
+        with self._lock:
+            cached = self._installations.get(key)
+            if cached is not None:
+                return cached
+            lookup_lock = self._refresh_locks.setdefault(f"repo:{key}", threading.Lock())
+
+        with lookup_lock:
+            with self._lock:
+                cached = self._installations.get(key)
+                if cached is not None:
+                    return cached
+            installation_id = str(self.auth.get_installation_id(owner, repo))
+            with self._lock:
+                self.stats["installation_lookups"] += 1
+                self._installations[key] = installation_id
+                self._save()
+            return installation_id
+
+    def _fresh(self, installation_id: str) -> Optional[str]:
+        cached = self._tokens.get(installation_id)
+        if cached and cached[1] - time.time() > self.refresh_margin:
+            return cached[0]
+        return None
+
+    def token(self, owner: str, repo: str) -> str:
+        """A valid installation token for owner/repo, refreshed only when close to expiry."""
+        installation_id = self.installation_id(owner, repo)
+        with self._lock:
+            token = self._fresh(installation_id)
+            if token:
+                self.stats["hits"] += 1
+                return token
+            refresh_lock = self._refresh_locks.setdefault(installation_id, threading.Lock())
+
+        with refresh_lock:
+            with self._lock:
+                token = self._fresh(installation_id)
+                if token:
+                    self.stats["hits"] += 1
+                    return token
+            response = self.auth.create_installation_access_token(installation_id)
+            with self._lock:
+                self.stats["refreshes"] += 1
+                self._tokens[installation_id] = (response['token'], _expiry(response.get('expires_at')))
+                self._save()
+                return response['token']
+
+    def invalidate(self, owner: str, repo: str) -> None:
+        """Drops the cached installation and token, e.g. after a 401 or an app reinstall."""
+        with self._lock:
+            installation_id = self._installations.pop(f"{owner}/{repo}".lower(), None)
+            if installation_id is not None:
+                self._tokens.pop(installation_id, None)
+            self._save()
+
+
+_manager: Optional[InstallationTokenManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_token_manager() -> InstallationTokenManager:
+    """Returns the process-wide InstallationTokenManager configured from the environment.
+
+    GITHUB_TOKEN_CACHE (a file path) turns on persistence; it is off by default
+    because the file holds live tokens.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            app_id = os.getenv("GITHUB_APP_ID")
+            private_key_path = os.getenv("GITHUB_PRIVATE_KEY_PATH")
+            if not app_id or not private_key_path:
+                raise Exception("GITHUB_APP_ID and GITHUB_PRIVATE_KEY_PATH must be set")
+            _manager = InstallationTokenManager(
+                app_id, private_key_path, cache_path=os.getenv("GITHUB_TOKEN_CACHE") or None
+            )
+        return _manager
+
+
+def get_installation_token(owner: Optional[str] = None, repo: Optional[str] = None) -> str:
+    """Installation token for owner/repo (defaults: GITHUB_OWNER / GITHUB_REPO)."""
+    owner, repo = parse_repo(owner or os.getenv("GITHUB_OWNER"), repo or os.getenv("GITHUB_REPO"))
+    if not owner or not repo:
+        raise Exception(f"Missing GitHub repository configuration. Owner={owner}, Repo={repo}")
+    return get_token_manager().token(owner, repo)
@@ -0,0 +1,217 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .rate_limiter import get_rate_limiter
+
+API_VERSION = "2022-11-28"
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+# Below this share of the hourly quota, calls are spread evenly until the reset.
+DEFAULT_PACE_BELOW = 0.2
+# GitHub's secondary limits answer 403/429 with Retry-After; 5xx are transient.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ETAGS = 512
+
+
+def _never_sent(error: Exception) -> bool:
+    """Whether a requests error happened before the request was sent (connect timeout or refused)."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    # requests wraps urllib3's MaxRetryError, whose .reason is the underlying error.
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, NewConnectionError)
+
+
+class GitHubClient:
+    """One pooled, rate-limit-aware client for every GitHub REST call.
+
+    - keep-alive connections from a shared requests.Session
+    - conditional GETs: responses are cached by ETag and revalidated with
+      If-None-Match, so unchanged resources come back as 304 (free of quota)
+    - retries with exponential backoff, honouring Retry-After and
+      X-RateLimit-Reset; POSTs are only retried when GitHub did not process them
+      (rate limited, or the connection never opened)
+    - pacing from X-RateLimit-Remaining / -Reset on top of the 'github' token
+      bucket, so a nearly spent quota is stretched until the reset
+    - one token refresh on 401
+
+    `tokens` is anything with token(owner, repo), invalidate(owner, repo) and
+    api_url, normally the InstallationTokenManager.
+    """
+
+    def __init__(
+        self,
+        tokens,
+        session: Optional[requests.Session] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        pace_below: float = DEFAULT_PACE_BELOW,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.tokens = tokens
+        self.session = session or requests.Session()
+        if session is None:
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pace_below = pace_below
+        self.sleep = sleep
+        self.quota: Optional[Dict[str, float]] = None
+        self.stats = {"requests": 0, "not_modified": 0, "retries": 0, "paced_seconds": 0.0}
+        self._etags: Dict[str, Tuple[str, requests.Response]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def api_url(self) -> str:
+        return self.tokens.api_url
+
+    def _headers(self, owner: str, repo: str) -> dict:
+        return {
+            "Authorization": f"Bearer {self.tokens.token(owner, repo)}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": API_VERSION,
+        }
+
+    def _observe(self, response: requests.Response) -> None:
+        headers = response.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        try:
+            quota = {
+                "limit": float(headers.get("X-RateLimit-Limit", 5000)),
+                "remaining": float(headers["X-RateLimit-Remaining"]),
+                "reset": float(headers.get("X-RateLimit-Reset", time.time() + 3600)),
+            }
+        except ValueError:
+            return
+        with self._lock:
+            self.quota = quota
+
+    def quota_delay(self, now: Optional[float] = None) -> float:
+        """Seconds to wait before the next call, given the last quota headers seen."""
+        with self._lock:
+            quota = self.quota
+        if not quota:
+            return 0.0
+        until_reset = max(0.0, quota["reset"] - (now or time.time()))
+        if quota["remaining"] <= 0:
+            return until_reset
+        if quota["remaining"] < quota["limit"] * self.pace_below:
+            return until_reset / quota["remaining"]
+        return 0.0
+
+    def _pace(self) -> None:
+        delay = self.quota_delay()
+        if delay > 0:
+            with self._lock:
+                self.stats["paced_seconds"] += delay
+            self.sleep(delay)
+        get_rate_limiter().acquire("github")
+
+    def _retry_delay(self, response: Optional[requests.Response], attempt: int) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                reset = float(response.headers.get("X-RateLimit-Reset", 0))
+                return max(0.0, reset - time.time()) + 1
+        return self.backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+
+    @staticmethod
+    def _rate_limited(response: requests.Response) -> bool:
+        return response.status_code == 429 or (
+            response.status_code == 403
+            and (response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers)
+        )
+
+    def request(self, method: str, owner: str, repo: str, path: str, **kwargs) -> requests.Response:
+        """Calls `{api_url}{path}` for owner/repo's installation; `path` starts with '/'."""
+        method = method.upper()
+        url = f"{self.api_url}{path}"
+        cache_key = f"{url}?{sorted((kwargs.get('params') or {}).items())}" if method == "GET" else None
+        refreshed = False
+        attempt = 0
+
+        while True:
+            headers = self._headers(owner, repo)
+            with self._lock:
+                cached = self._etags.get(cache_key) if cache_key else None
+            if cached:
+                headers["If-None-Match"] = cached[0]
+
+            self._pace()
+            response = None
+            try:
+                with self._lock:
+                    self.stats["requests"] += 1
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A write is only safe to resend if it never reached GitHub.
+                retryable = method == "GET" or _never_sent(e)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+            else:
+                self._observe(response)
+                if response.status_code == 304 and cached:
+                    with self._lock:
+                        self.stats["not_modified"] += 1
+                    return cached[1]
+                if response.status_code == 401 and not refreshed:
+                    self.tokens.invalidate(owner, repo)
+                    refreshed = True
+                    continue
+                retryable = self._rate_limited(response) or (
+                    method == "GET" and response.status_code in RETRY_STATUSES
+                )
+                if not retryable or attempt >= self.max_retries:
+                    if cache_key and response.status_code == 200 and response.headers.get("ETag"):
+                        with self._lock:
+                            if len(self._etags) >= MAX_ETAGS:
+                                self._etags.pop(next(iter(self._etags)))
+                            self._etags[cache_key] = (response.headers["ETag"], response)
+                    return response
+
+            with self._lock:
+                self.stats["retries"] += 1
+            self.sleep(self._retry_delay(response, attempt))
+            attempt += 1
+
+    def get(self, owner: str, repo: str, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", owner, repo, path, **kwargs)
+
+    def post(self, owner: str, repo: str, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", owner, repo, path, **kwargs)
+
+    def create_issue(self, owner: str, repo: str, title: str, body: str, **fields) -> requests.Response:
+        return self.post(owner, repo, f"/repos/{owner}/{repo}/issues", json={"title": title, "body": body, **fields})
+
+    def create_pull(self, owner: str, repo: str, title: str, body: str, head: str, base: str = "main") -> requests.Response:
+        return self.post(owner, repo, f"/repos/{owner}/{repo}/pulls",
+                         json={"title": title, "body": body, "head": head, "base": base})
+
+
+_client: Optional[GitHubClient] = None
+_client_lock = threading.Lock()
+
+
+def get_github_client() -> GitHubClient:
+    """Returns the process-wide GitHubClient, authenticated through the GitHub App token manager."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from .github_app_auth import get_token_manager
+            _client = GitHubClient(get_token_manager())
+        return _client
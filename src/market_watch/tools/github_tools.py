@@ -1,11 +1,25 @@
 from crewai.tools import BaseTool
 import os
-import requests
-from .github_app_auth import GitHubAppAuth
+from typing import List, Optional, Type
+from pydantic import BaseModel, Field
+from .github_app_auth import parse_repo
+from .github_client import get_github_client
+from .issue_tracker import format_results, get_bulk_issue_creator, todo_findings
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def configured_repo():
+    """(owner, repo) from the environment, or an error message when the GitHub App is not configured."""
+    app_id = os.getenv("GITHUB_APP_ID")
+    private_key_path = os.getenv("GITHUB_PRIVATE_KEY_PATH")
+    owner, repo = parse_repo(os.getenv("GITHUB_OWNER"), os.getenv("GITHUB_REPO"))
+    if not all([app_id, private_key_path, owner, repo]):
+        return None, f"Error: Missing configuration. Found: AppID={bool(app_id)}, KeyPath={bool(private_key_path)}, Owner={owner}, Repo={repo}"
+    return (owner, repo), None
+
+
 class GitHubIssueCreatorTool(BaseTool):
     name: str = "Create GitHub Issue"
     description: str = (
@@ -15,43 +29,15 @@ class GitHubIssueCreatorTool(BaseTool):
     )
 
     def _run(self, title: str, body: str) -> str:
-        # Load credentials
-        app_id = os.getenv("GITHUB_APP_ID")
-        private_key_path = os.getenv("GITHUB_PRIVATE_KEY_PATH")
-        
-        # Handle Owner/Repo
-        owner = os.getenv("GITHUB_OWNER")
-        repo = os.getenv("GITHUB_REPO")
-        
-        if repo and "/" in repo and not owner:
-            # If repo is "owner/repo" and owner is missing, parse it
-            parts = repo.split("/")
-            if len(parts) == 2:
-                owner = parts[0]
-                repo = parts[1]
-
-        if not all([app_id, private_key_path, owner, repo]):
-            return f"Error: Missing configuration. Found: AppID={bool(app_id)}, KeyPath={bool(private_key_path)}, Owner={owner}, Repo={repo}"
+        target, error = configured_repo()
+        if error:
+            return error
+        owner, repo = target
 
         try:
-            # Authenticate
-            auth = GitHubAppAuth(app_id, private_key_path)
-            installation_id = auth.get_installation_id(owner, repo)
-            token = auth.get_installation_access_token(installation_id)
-
-            # Create Issue
-            url = f"https://api.github.com/repos/{owner}/{repo}/issues"
-            headers = {
-                "Authorization": f"Token {token}",
-                "Accept": "application/vnd.github+json"
-            }
-            data = {
-                "title": title,
-                "body": body
-            }
-
-            response = requests.post(url, headers=headers, json=data)
-            
+            # Pooled, paced client; authentication is cached by the token manager
+            response = get_github_client().create_issue(owner, repo, title, body)
+
             if response.status_code == 201:
                 issue_url = response.json().get("html_url")
                 return f"Successfully created GitHub issue: {issue_url}"
@@ -60,3 +46,64 @@ class GitHubIssueCreatorTool(BaseTool):
 
         except Exception as e:
             return f"Error creating GitHub issue: {str(e)}"
+
+
+class IssueFinding(BaseModel):
+    title: str = Field(..., description="Issue title")
+    body: str = Field(default="", description="Issue body (markdown)")
+    labels: List[str] = Field(default_factory=list, description="Labels, e.g. ['bug']")
+    key: Optional[str] = Field(
+        default=None,
+        description="Stable identity of the finding, e.g. 'volatility|NVDA|2026-01-05'; defaults to the title",
+    )
+
+
+class GitHubBulkIssueCreatorToolInput(BaseModel):
+    issues: List[IssueFinding] = Field(..., description="Findings to file as issues")
+    limit: Optional[int] = Field(default=None, description="Maximum number of new issues to create")
+
+
+class GitHubBulkIssueCreatorTool(BaseTool):
+    name: str = "Create GitHub Issues In Bulk"
+    description: str = (
+        "Files many alerts or findings at once. Findings already filed (same key, or same title "
+        "when no key is given) are skipped using a local index, the rest are created concurrently. "
+        "Calling it again with the same findings creates nothing."
+    )
+    args_schema: Type[BaseModel] = GitHubBulkIssueCreatorToolInput
+
+    def _run(self, issues: List[dict], limit: Optional[int] = None) -> str:
+        target, error = configured_repo()
+        if error:
+            return error
+        try:
+            findings = [i.model_dump() if isinstance(i, BaseModel) else dict(i) for i in issues]
+            return format_results(get_bulk_issue_creator().file(*target, findings, limit=limit))
+        except Exception as e:
+            return f"Error creating GitHub issues: {str(e)}"
+
+
+class TodoIssueSyncToolInput(BaseModel):
+    directory: str = Field(default=".", description="Directory to scan for TODO/FIXME/BUG comments")
+    limit: Optional[int] = Field(default=5, description="Maximum number of new issues to create")
+
+
+class TodoIssueSyncTool(BaseTool):
+    name: str = "File TODO Issues"
+    description: str = (
+        "Scans the codebase (test files excluded) for TODO, FIXME and BUG comments and files one "
+        "GitHub issue per comment not tracked yet, labelled 'enhancement' or 'bug'."
+    )
+    args_schema: Type[BaseModel] = TodoIssueSyncToolInput
+
+    def _run(self, directory: str = ".", limit: Optional[int] = 5) -> str:
+        target, error = configured_repo()
+        if error:
+            return error
+        try:
+            findings = todo_findings(directory)
+            if not findings:
+                return "No TODOs or issues found in codebase."
+            return format_results(get_bulk_issue_creator().file(*target, findings, limit=limit))
+        except Exception as e:
+            return f"Error filing TODO issues: {str(e)}"
@@ -0,0 +1,331 @@
+import copy
+import json
+import math
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .storage import as_of, atomic_write_bytes, cache_dir
+
+DEFAULT_INDICATORS = ["RSI_14", "MACD_12_26_9", "SMA_50", "SMA_200"]
+# Residual weight of the seed value below which an exponential state counts as warmed up.
+WARMUP_TOLERANCE = 1e-3
+TRADING_DAYS_PER_YEAR = 252
+
+
+def _ewm_warmup(alpha: float, length: int) -> int:
+    return max(length, math.ceil(math.log(WARMUP_TOLERANCE) / math.log(1 - alpha)))
+
+
+# --- STATES ---
+# Each state consumes one value per bar in O(1) and reproduces the vectorized
+# functions in indicators.py (pandas ewm(adjust=False) / rolling mean).
+
+class EMAState:
+    def __init__(self, length: int, alpha: Optional[float] = None):
+        self.length = length
+        self.alpha = alpha if alpha is not None else 2 / (length + 1)
+        self.value: Optional[float] = None
+        self.count = 0
+
+    def update(self, x: float) -> Optional[float]:
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        self.count += 1
+        return self.current()
+
+    def current(self) -> Optional[float]:
+        return self.value if self.count >= self.length else None
+
+    def to_dict(self) -> dict:
+        return {"length": self.length, "alpha": self.alpha, "value": self.value, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EMAState":
+        state = cls(data["length"], data["alpha"])
+        state.value, state.count = data["value"], data["count"]
+        return state
+
+
+class SMAState:
+    def __init__(self, length: int):
+        self.length = length
+        self.window: deque = deque(maxlen=length)
+        self.total = 0.0
+        self.count = 0
+
+    def update(self, x: float) -> Optional[float]:
+        if len(self.window) == self.length:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        self.count += 1
+        if self.count % self.length == 0:
+            # Re-sum once per window to stop floating point drift (amortized O(1)).
+            self.total = math.fsum(self.window)
+        return self.current()
+
+    def current(self) -> Optional[float]:
+        return self.total / self.length if len(self.window) == self.length else None
+
+    def to_dict(self) -> dict:
+        return {"length": self.length, "window": list(self.window), "count": self.count}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SMAState":
+        state = cls(data["length"])
+        state.window.extend(data["window"])
+        state.total = math.fsum(state.window)
+        state.count = data["count"]
+        return state
+
+
+class RSIState:
+    """Wilder RSI: gains and losses smoothed with alpha = 1 / length."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.prev_close: Optional[float] = None
+        self.avg_gain = EMAState(length, alpha=1 / length)
+        self.avg_loss = EMAState(length, alpha=1 / length)
+
+    def update(self, x: float) -> Optional[float]:
+        if self.prev_close is not None:
+            delta = x - self.prev_close
+            self.avg_gain.update(max(delta, 0.0))
+            self.avg_loss.update(max(-delta, 0.0))
+        self.prev_close = x
+        return self.current()
+
+    def current(self) -> Optional[float]:
+        gain, loss = self.avg_gain.current(), self.avg_loss.current()
+        if gain is None or loss is None:
+            return None
+        if loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + gain / loss)
+
+    def to_dict(self) -> dict:
+        return {
+            "length": self.length, "prev_close": self.prev_close,
+            "avg_gain": self.avg_gain.to_dict(), "avg_loss": self.avg_loss.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RSIState":
+        state = cls(data["length"])
+        state.prev_close = data["prev_close"]
+        state.avg_gain = EMAState.from_dict(data["avg_gain"])
+        state.avg_loss = EMAState.from_dict(data["avg_loss"])
+        return state
+
+
+class MACDState:
+    def __init__(self, fast: int, slow: int, signal: int):
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+        self.line: Optional[float] = None
+
+    def update(self, x: float):
+        fast, slow = self.fast.update(x), self.slow.update(x)
+        if fast is not None and slow is not None:
+            self.line = fast - slow
+            self.signal.update(self.line)
+        return self.current()
+
+    def current(self):
+        return self.line, self.signal.current()
+
+    def to_dict(self) -> dict:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(), "signal": self.signal.to_dict(), "line": self.line}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MACDState":
+        state = cls(1, 1, 1)
+        state.fast = EMAState.from_dict(data["fast"])
+        state.slow = EMAState.from_dict(data["slow"])
+        state.signal = EMAState.from_dict(data["signal"])
+        state.line = data["line"]
+        return state
+
+
+_STATE_TYPES = {"EMA": EMAState, "SMA": SMAState, "RSI": RSIState, "MACD": MACDState}
+
+
+def _parse(name: str):
+    kind, *params = name.upper().split("_")
+    if kind not in _STATE_TYPES or not params:
+        raise ValueError(f"Unsupported indicator: {name}")
+    return kind, [int(p) for p in params]
+
+
+def _new_state(name: str):
+    kind, params = _parse(name)
+    return _STATE_TYPES[kind](*params)
+
+
+def warmup_bars(indicators: List[str]) -> int:
+    """Number of bars needed before every requested indicator is defined and converged."""
+    needed = 0
+    for name in indicators:
+        kind, params = _parse(name)
+        if kind == "SMA":
+            bars = params[0]
+        elif kind == "EMA":
+            bars = _ewm_warmup(2 / (params[0] + 1), params[0])
+        elif kind == "RSI":
+            bars = _ewm_warmup(1 / params[0], params[0]) + 1
+        else:
+            fast, slow, signal = params
+            bars = _ewm_warmup(2 / (slow + 1), slow) + _ewm_warmup(2 / (signal + 1), signal)
+        needed = max(needed, bars)
+    return needed
+
+
+def lookback_period(indicators: List[str]) -> str:
+    """yfinance-style period ('NNNd') covering the warm-up of the requested indicators."""
+    calendar_days = math.ceil(warmup_bars(indicators) * 365 / TRADING_DAYS_PER_YEAR) + 10
+    return f"{calendar_days}d"
+
+
+class SymbolState:
+    """All indicator states for one symbol, committed up to `last_ts`."""
+
+    def __init__(self, indicators: List[str]):
+        self.indicators = list(indicators)
+        self.states = {name: _new_state(name) for name in self.indicators}
+        self.last_ts: Optional[str] = None
+        self.last_close: Optional[float] = None
+        self.bars = 0
+
+    def update(self, close: float) -> None:
+        for state in self.states.values():
+            state.update(close)
+        self.bars += 1
+
+    def values(self, close: float) -> Dict[str, Optional[float]]:
+        result: Dict[str, Optional[float]] = {"Close": close}
+        for name, state in self.states.items():
+            if isinstance(state, MACDState):
+                line, signal = state.current()
+                suffix = name.split("_", 1)[1]
+                result[f"MACD_{suffix}"] = line
+                result[f"MACDs_{suffix}"] = signal
+            else:
+                result[name] = state.current()
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "indicators": self.indicators, "last_ts": self.last_ts, "last_close": self.last_close,
+            "bars": self.bars, "states": {name: s.to_dict() for name, s in self.states.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SymbolState":
+        state = cls(data["indicators"])
+        state.last_ts, state.last_close, state.bars = data["last_ts"], data["last_close"], data["bars"]
+        state.states = {
+            name: _STATE_TYPES[_parse(name)[0]].from_dict(s) for name, s in data["states"].items()
+        }
+        return state
+
+
+class IndicatorEngine:
+    """Keeps persisted per-symbol indicator states and advances them one bar at a time."""
+
+    def __init__(self, indicators: Optional[List[str]] = None, root: Optional[str] = None):
+        self.indicators = list(indicators or DEFAULT_INDICATORS)
+        self.root = root or cache_dir("indicators")
+        os.makedirs(self.root, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def lookback_period(self) -> str:
+        return lookback_period(self.indicators)
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker.upper()}.json")
+
+    def load(self, ticker: str) -> Optional[SymbolState]:
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get("indicators") != self.indicators:
+            return None
+        return SymbolState.from_dict(data)
+
+    def _save(self, ticker: str, state: SymbolState) -> None:
+        atomic_write_bytes(self._path(ticker), json.dumps(state.to_dict()).encode('utf-8'))
+
+    def update(self, ticker: str, bars: pd.DataFrame) -> Dict[str, Optional[float]]:
+        """Advances the symbol's state with any bars newer than its last commit and
+        returns indicator values as of the final bar.
+
+        The final bar is never committed since intraday it is still forming; it is
+        applied to a copy of the state instead, so each call costs O(new bars).
+        """
+        ticker = ticker.upper()
+        closes = bars['Close'].dropna()
+        if closes.empty:
+            raise ValueError(f"No bars for {ticker}")
+
+        with self._lock(ticker):
+            state = self.load(ticker)
+            if state is not None and not self._consistent(state, closes):
+                state = None
+            if state is None:
+                state = SymbolState(self.indicators)
+                pending = closes
+            else:
+                pending = closes[closes.index > pd.Timestamp(state.last_ts)]
+
+            if pending.empty:
+                # Nothing newer than the last commit: the final bar is the committed one.
+                return state.values(state.last_close)
+
+            for ts, close in pending.iloc[:-1].items():
+                state.update(float(close))
+                state.last_ts, state.last_close = ts.isoformat(), float(close)
+            self._save(ticker, state)
+
+            provisional = copy.deepcopy(state)
+            final_close = float(pending.iloc[-1])
+            provisional.update(final_close)
+            return provisional.values(final_close)
+
+    def _consistent(self, state: SymbolState, closes: pd.Series) -> bool:
+        # The committed bar must still be present with the same price; a changed
+        # close means the history was split/dividend adjusted and we must rebuild.
+        if state.last_ts is None:
+            return False
+        ts = pd.Timestamp(state.last_ts)
+        if ts not in closes.index:
+            return False
+        return math.isclose(float(closes.loc[ts]), state.last_close, rel_tol=1e-9)
+
+
+_engine: Optional[IndicatorEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """Returns the process-wide IndicatorEngine with the default indicator set.
+
+    Point-in-time (backfill) runs keep their states apart from the live ones.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            date = as_of()
+            _engine = IndicatorEngine(root=cache_dir("indicators", f"as_of-{date}") if date else None)
+        return _engine
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+# Vectorized indicators. Every function accepts a Series or a wide dates x tickers
+# DataFrame and computes all columns at once; column names follow pandas_ta.
+
+
+def sma(close: pd.DataFrame, length: int) -> pd.DataFrame:
+    """Simple moving average."""
+    return close.rolling(length, min_periods=length).mean()
+
+
+def ema(close: pd.DataFrame, length: int) -> pd.DataFrame:
+    """Exponential moving average (span = length)."""
+    return close.ewm(span=length, adjust=False, min_periods=length).mean()
+
+
+def rsi(close: pd.DataFrame, length: int = 14) -> pd.DataFrame:
+    """Wilder's Relative Strength Index."""
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    avg_gain = gain.ewm(alpha=1 / length, adjust=False, min_periods=length).mean()
+    avg_loss = loss.ewm(alpha=1 / length, adjust=False, min_periods=length).mean()
+    rs = avg_gain / avg_loss.replace(0, np.nan)
+    values = 100 - 100 / (1 + rs)
+    # No losses in the window means maximal strength, not undefined.
+    return values.mask(avg_loss.eq(0) & avg_gain.notna(), 100.0)
+
+
+def macd(close: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9):
+    """Returns (macd line, signal line, histogram)."""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return line, signal_line, line - signal_line
+
+
+def latest_snapshot(close: pd.DataFrame) -> pd.DataFrame:
+    """Computes RSI-14, MACD(12,26,9) and SMA-50/200 for every column of a close panel.
+
+    Returns one row per ticker with the most recent value of each indicator.
+    """
+    macd_line, macd_signal, _ = macd(close)
+    columns = {
+        'Close': close,
+        'RSI_14': rsi(close, 14),
+        'MACD_12_26_9': macd_line,
+        'MACDs_12_26_9': macd_signal,
+        'SMA_50': sma(close, 50),
+        'SMA_200': sma(close, 200),
+    }
+    # Tickers can miss the final session (halts, holidays abroad), so use each
+    # column's last valid observation instead of the panel's last row.
+    snapshot = pd.DataFrame({name: frame.ffill().iloc[-1] for name, frame in columns.items()})
+    snapshot.index.name = 'Ticker'
+    return snapshot
@@ -0,0 +1,296 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import tokenize
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .storage import cache_dir
+
+DEFAULT_MAX_WORKERS = 4
+# A 'pending' reservation older than this belongs to a run that crashed or lost
+# its connection mid-request; it is re-checked against GitHub and then reclaimed.
+DEFAULT_PENDING_TIMEOUT = 15 * 60
+SCAN_EXTENSIONS = ('.py', '.ts', '.tsx', '.js', '.jsx')
+SKIP_DIRS = {'node_modules', '.venv', '__pycache__', '.git'}
+TODO_LABELS = {"TODO": ["enhancement"], "FIXME": ["bug"], "BUG": ["bug"]}
+# Hidden marker in every issue body, so the index can be rebuilt from GitHub itself.
+MARKER = "<!-- market-watch-fingerprint: {} -->"
+_MARKER_RE = re.compile(r"<!-- market-watch-fingerprint: ([0-9a-f]{16,64}) -->")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(key: str) -> str:
+    """Stable id of a finding: whitespace and case do not matter."""
+    return hashlib.sha256(_SPACE_RE.sub(" ", key).strip().lower().encode('utf-8')).hexdigest()[:32]
+
+
+def finding_fingerprint(finding: dict) -> str:
+    """Uses the finding's 'key' (e.g. 'volatility|NVDA|2026-01-05') or, failing that, its title."""
+    return finding.get("fingerprint") or fingerprint(finding.get("key") or finding["title"])
+
+
+_SLASH_COMMENT_RE = re.compile(r"(?:^|\s)//(.*)$")
+
+
+def _comments(path: str) -> Iterator[Tuple[int, str, str]]:
+    """(line number, comment text, source line) for each comment in a source file.
+
+    Python files are tokenized, so '#' inside strings (e.g. templates) is not a
+    comment; JS/TS use '//' at the start of a line or after whitespace.
+    """
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.readlines()
+    if path.endswith('.py'):
+        try:
+            for token in tokenize.generate_tokens(iter(lines).__next__):
+                if token.type == tokenize.COMMENT:
+                    yield token.start[0], token.string[1:], token.line
+        except (tokenize.TokenError, SyntaxError):
+            return
+        return
+    for line_num, line in enumerate(lines, 1):
+        match = _SLASH_COMMENT_RE.search(line)
+        if match:
+            yield line_num, match.group(1), line
+
+
+def todo_findings(directory: str = ".", patterns: Optional[List[str]] = None, include_tests: bool = False) -> List[dict]:
+    """TODO/FIXME/BUG comments as findings.
+
+    Only comments that open with the marker word count, so string literals,
+    identifiers (TODO_LABELS), words like DEBUG and prose that merely mentions
+    a TODO are not filed as issues.
+
+    The key is pattern + path + comment text, without the line number, so a
+    comment keeps its fingerprint when code above it moves.
+    """
+    patterns = patterns or list(TODO_LABELS)
+    # The marker must open the comment and be a whole word ("# TODO: ...", "// FIXME(x)").
+    marker = re.compile(rf"^\s*({'|'.join(re.escape(p) for p in patterns)})\b(?!_)")
+    findings = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for file in sorted(files):
+            if not file.endswith(SCAN_EXTENSIONS):
+                continue
+            path = os.path.join(root, file)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            if not include_tests and ("__tests__" in relative or file.startswith("test_")):
+                continue
+            for line_num, comment, line in _comments(path):
+                match = marker.search(comment)
+                if match is None:
+                    continue
+                pattern = match.group(1)
+                text = line.strip()
+                note = comment[match.end():].lstrip(":-) ").strip() or text
+                findings.append({
+                    "title": f"[{pattern}] {note[:80]}",
+                    "body": f"Found in `{relative}` line {line_num}:\n\n```\n{text}\n```",
+                    "labels": TODO_LABELS.get(pattern, []),
+                    "key": f"{pattern}|{relative}|{text}",
+                })
+    return findings
+
+
+class IssueIndex:
+    """Local SQLite index of filed issues by (repo, fingerprint).
+
+    A fingerprint is reserved (state 'pending') before its issue is created, so
+    concurrent runs never file the same finding twice. Reservations expire after
+    `pending_timeout` seconds.
+    """
+
+    def __init__(self, path: Optional[str] = None, pending_timeout: float = DEFAULT_PENDING_TIMEOUT):
+        self.path = path or os.path.join(cache_dir(), "github_issues.sqlite")
+        self.pending_timeout = pending_timeout
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS issues ("
+            " repo TEXT NOT NULL, fingerprint TEXT NOT NULL, state TEXT NOT NULL,"
+            " number INTEGER, url TEXT, title TEXT, updated_at REAL NOT NULL,"
+            " PRIMARY KEY (repo, fingerprint))"
+        )
+        self._conn.commit()
+
+    def known(self, repo: str, fingerprints: Iterable[str]) -> Dict[str, dict]:
+        """Indexed fingerprints among `fingerprints`, in one query; expired reservations are flagged."""
+        fingerprints = list(fingerprints)
+        if not fingerprints:
+            return {}
+        known = {}
+        with self._lock:
+            for start in range(0, len(fingerprints), 500):
+                chunk = fingerprints[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT fingerprint, state, number, url, updated_at FROM issues"
+                    f" WHERE repo = ? AND fingerprint IN ({','.join('?' * len(chunk))})",
+                    (repo, *chunk),
+                ).fetchall()
+                known.update({
+                    fp: {"state": state, "number": number, "url": url, "expired": self._expired(state, updated_at)}
+                    for fp, state, number, url, updated_at in rows
+                })
+        return known
+
+    def _expired(self, state: str, updated_at: float) -> bool:
+        return state == "pending" and time.time() - updated_at > self.pending_timeout
+
+    def reserve(self, repo: str, fp: str, title: str) -> bool:
+        """Claims a fingerprint (or takes over an expired reservation); False when it is filed or being filed."""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO issues (repo, fingerprint, state, title, updated_at) VALUES (?, ?, 'pending', ?, ?)",
+                (repo, fp, title, now),
+            )
+            if cursor.rowcount == 1:
+                return True
+            cursor = self._conn.execute(
+                "UPDATE issues SET title = ?, updated_at = ? WHERE repo = ? AND fingerprint = ?"
+                " AND state = 'pending' AND updated_at < ?",
+                (title, now, repo, fp, now - self.pending_timeout),
+            )
+            return cursor.rowcount == 1
+
+    def record(self, repo: str, fp: str, number: Optional[int], url: Optional[str], title: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO issues (repo, fingerprint, state, number, url, title, updated_at) VALUES (?, ?, 'filed', ?, ?, ?, ?)"
+                " ON CONFLICT (repo, fingerprint) DO UPDATE SET state = 'filed', number = excluded.number,"
+                " url = excluded.url, title = COALESCE(excluded.title, issues.title), updated_at = excluded.updated_at",
+                (repo, fp, number, url, title, time.time()),
+            )
+
+    def release(self, repo: str, fp: str) -> None:
+        """Drops a reservation whose issue was definitely not created."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM issues WHERE repo = ? AND fingerprint = ? AND state = 'pending'", (repo, fp))
+
+    def count(self, repo: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM issues WHERE repo = ?", (repo,)).fetchone()[0]
+
+
+class BulkIssueCreator:
+    """Files many findings at once: fingerprint, filter against the local index,
+    then create only the new issues concurrently through the GitHub client
+    (which keeps them within the rate limit)."""
+
+    def __init__(self, client, index: Optional[IssueIndex] = None, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.client = client
+        self.index = index or IssueIndex()
+        self.max_workers = max_workers
+
+    def sync(self, owner: str, repo: str, max_pages: int = 10) -> int:
+        """Indexes issues already on GitHub that carry a fingerprint marker; returns how many.
+
+        One paginated list call (ETag-revalidated by the client), not a search per finding.
+        """
+        full_name = f"{owner}/{repo}".lower()
+        added = 0
+        for page in range(1, max_pages + 1):
+            response = self.client.get(owner, repo, f"/repos/{owner}/{repo}/issues",
+                                       params={"state": "all", "per_page": 100, "page": page})
+            if response.status_code != 200:
+                break
+            issues = response.json()
+            for issue in issues:
+                match = _MARKER_RE.search(issue.get("body") or "")
+                if match:
+                    self.index.record(full_name, match.group(1), issue.get("number"), issue.get("html_url"), issue.get("title"))
+                    added += 1
+            if len(issues) < 100:
+                break
+        return added
+
+    def _create(self, owner: str, repo: str, fp: str, finding: dict) -> dict:
+        full_name = f"{owner}/{repo}".lower()
+        body = f"{finding.get('body', '')}\n\n{MARKER.format(fp)}"
+        fields = {"labels": finding["labels"]} if finding.get("labels") else {}
+        try:
+            response = self.client.create_issue(owner, repo, finding["title"], body, **fields)
+        except Exception as e:
+            # The request may have reached GitHub (e.g. a read timeout): keep the
+            # reservation; once it expires the next run re-syncs before refiling.
+            return {"fingerprint": fp, "title": finding["title"], "status": "failed", "error": str(e)}
+        if response.status_code != 201:
+            if response.status_code < 500:
+                # Rejected (validation, permissions): nothing was created.
+                self.index.release(full_name, fp)
+            return {"fingerprint": fp, "title": finding["title"], "status": "failed",
+                    "error": f"{response.status_code} {response.text[:200]}"}
+        issue = response.json()
+        self.index.record(full_name, fp, issue.get("number"), issue.get("html_url"), finding["title"])
+        return {"fingerprint": fp, "title": finding["title"], "status": "created",
+                "number": issue.get("number"), "url": issue.get("html_url")}
+
+    def file(self, owner: str, repo: str, findings: List[dict], limit: Optional[int] = None) -> List[dict]:
+        """Creates issues for the findings not filed yet (at most `limit` new ones).
+
+        Returns one result per distinct finding: created, exists, skipped (over the
+        limit) or failed. A repeated scan makes no API calls at all. The index is
+        synced from GitHub when it is empty, and before reclaiming expired
+        reservations, whose issues may have been created after all.
+        """
+        full_name = f"{owner}/{repo}".lower()
+        if self.index.count(full_name) == 0:
+            self.sync(owner, repo)
+
+        unique: Dict[str, dict] = {}
+        for finding in findings:
+            unique.setdefault(finding_fingerprint(finding), finding)
+        known = self.index.known(full_name, unique)
+        if any(row["expired"] for row in known.values()):
+            self.sync(owner, repo)
+            known = self.index.known(full_name, unique)
+        known = {fp: row for fp, row in known.items() if not row.pop("expired")}
+
+        results = []
+        to_create = []
+        for fp, finding in unique.items():
+            if fp in known:
+                results.append({"fingerprint": fp, "title": finding["title"], "status": "exists", **known[fp]})
+            elif limit is not None and len(to_create) >= limit:
+                results.append({"fingerprint": fp, "title": finding["title"], "status": "skipped"})
+            elif self.index.reserve(full_name, fp, finding["title"]):
+                to_create.append((fp, finding))
+            else:
+                results.append({"fingerprint": fp, "title": finding["title"], "status": "exists", "state": "pending"})
+
+        if to_create:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(to_create))) as pool:
+                results.extend(pool.map(lambda item: self._create(owner, repo, *item), to_create))
+        return results
+
+
+def format_results(results: List[dict]) -> str:
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("created", "exists", "skipped", "failed")}
+    lines = [f"Issues: {counts['created']} created, {counts['exists']} already filed, "
+             f"{counts['skipped']} over the limit, {counts['failed']} failed."]
+    for r in results:
+        if r["status"] == "created":
+            lines.append(f"- created #{r.get('number')}: {r['title']} ({r.get('url')})")
+        elif r["status"] == "failed":
+            lines.append(f"- failed: {r['title']} ({r.get('error')})")
+    return "\n".join(lines)
+
+
+_creator: Optional[BulkIssueCreator] = None
+_creator_lock = threading.Lock()
+
+
+def get_bulk_issue_creator() -> BulkIssueCreator:
+    """Returns the process-wide BulkIssueCreator on top of the shared GitHub client."""
+    global _creator
+    with _creator_lock:
+        if _creator is None:
+            from .github_client import get_github_client
+            _creator = BulkIssueCreator(get_github_client())
+        return _creator
@@ -0,0 +1,234 @@
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from docx import Document
+from docx.shared import Inches
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+REPORT_TITLE = 'Market Watch Daily Report'
+# Any line containing one of these markers opens the matching pick book.
+PICK_SECTIONS = {"Top 5 Short-Term Picks": "short", "Top 5 Long-Term Picks": "long"}
+IMAGE_WIDTH = Inches(6)
+
+# Token kinds
+HEADING, BULLET, TABLE_ROW, IMAGE, RULE, PARAGRAPH, BLANK = (
+    "heading", "bullet", "table_row", "image", "rule", "paragraph", "blank"
+)
+
+
+def _parse_image(line: str) -> Optional[Tuple[str, str]]:
+    """`![alt](path)` on a line of its own -> (alt, path)."""
+    if not (line.startswith('![') and line.endswith(')')):
+        return None
+    close = line.find('](')
+    if close < 0:
+        return None
+    return line[2:close], line[close + 2:-1].strip()
+
+
+def _table_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip('|').split('|')]
+
+
+def _is_table_separator(cells: List[str]) -> bool:
+    return all(cell and not cell.strip('-: ') for cell in cells)
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, object]]:
+    """Streams (kind, value) block tokens from markdown in one pass over the text.
+
+    Lines are classified by their leading characters; nothing is split or
+    matched twice.
+    """
+    pos, end = 0, len(text)
+    while pos <= end:
+        newline = text.find('\n', pos)
+        if newline < 0:
+            newline = end
+        raw = text[pos:newline]
+        pos = newline + 1
+        line = raw.strip()
+
+        if not line:
+            yield BLANK, None
+        elif line[0] == '#':
+            level = len(line) - len(line.lstrip('#'))
+            if level <= 6 and line[level:level + 1] == ' ':
+                yield HEADING, (level, line[level + 1:].strip())
+            else:
+                yield PARAGRAPH, line
+        elif line == '---' or line == '***':
+            yield RULE, None
+        elif line[0] in '-*+' and line[1:2] == ' ':
+            yield BULLET, line[2:].strip()
+        elif line[0] == '|':
+            yield TABLE_ROW, _table_cells(line)
+        elif line[0] == '!' and _parse_image(line):
+            yield IMAGE, _parse_image(line)
+        else:
+            yield PARAGRAPH, line
+
+
+def split_bold(text: str) -> Iterator[Tuple[str, bool]]:
+    """Splits inline `**bold**` spans into (text, bold) runs."""
+    bold, start = False, 0
+    while True:
+        marker = text.find('**', start)
+        if marker < 0:
+            break
+        if marker > start:
+            yield text[start:marker], bold
+        bold, start = not bold, marker + 2
+    if start < len(text):
+        yield text[start:], bold
+
+
+def parse_pick(item: str) -> Optional[Dict[str, str]]:
+    """'**NVDA**: Reason...' or 'NVDA - Reason...' -> {'ticker', 'reason'}."""
+    i = 2 if item.startswith('**') else 0
+    start = i
+    while i < len(item) and (item[i].isupper() or (item[i] == '.' and i > start)):
+        i += 1
+    ticker = item[start:i].rstrip('.')
+    if not ticker or not item[start].isalpha():
+        return None
+    if i < len(item) and item[i] not in ' :*-':
+        return None
+    return {"ticker": ticker, "reason": item[i:].lstrip('*:- \t')}
+
+
+class CompiledReport:
+    """Output of one compile: the DOCX document, the extracted picks and the images."""
+
+    def __init__(self, document, picks: Dict[str, List[dict]], images: List[str], missing_images: List[str]):
+        self.document = document
+        self.picks = picks
+        self.images = images
+        self.missing_images = missing_images
+
+
+class ReportCompiler:
+    """Single-pass markdown compiler.
+
+    Consumes the token stream once and, for every token, writes the DOCX body
+    (headings, paragraphs with inline bold, bullets, tables, page breaks, embedded
+    `![alt](path)` images) and extracts the picks of the short/long sections.
+    """
+
+    def __init__(
+        self,
+        base_dir: Optional[str] = None,
+        title: str = REPORT_TITLE,
+        substitutes: Optional[Dict[str, str]] = None,
+    ):
+        self.base_dir = base_dir
+        self.title = title
+        # Image file name -> file actually embedded (e.g. the chart's print variant).
+        self.substitutes = substitutes or {}
+
+    def _resolve(self, path: str) -> Optional[str]:
+        if os.path.exists(path):
+            return path
+        if self.base_dir and not os.path.isabs(path):
+            for candidate in (os.path.join(self.base_dir, path), os.path.join(self.base_dir, os.path.basename(path))):
+                if os.path.exists(candidate):
+                    return candidate
+        return None
+
+    def _add_runs(self, paragraph, text: str) -> None:
+        for chunk, bold in split_bold(text):
+            run = paragraph.add_run(chunk)
+            if bold:
+                run.bold = True
+
+    def _add_image(self, doc, path: str, caption: str, images: List[str], missing: List[str]) -> None:
+        resolved = self._resolve(path)
+        if resolved is None:
+            missing.append(path)
+            doc.add_paragraph(f"[Missing Image: {path}]", style='Quote')
+            return
+        embedded = self.substitutes.get(os.path.basename(resolved))
+        doc.add_picture(embedded if embedded and os.path.exists(embedded) else resolved, width=IMAGE_WIDTH)
+        doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        doc.add_paragraph(f"Figure: {caption or os.path.basename(resolved)}", style='Caption')
+        images.append(resolved)
+
+    def _add_table(self, doc, rows: List[List[str]]) -> None:
+        has_header = len(rows) > 1 and _is_table_separator(rows[1])
+        body = [row for row in rows if not _is_table_separator(row)]
+        if not body:
+            return
+        table = doc.add_table(rows=len(body), cols=max(len(row) for row in body))
+        table.style = 'Table Grid'
+        for index, (row, cells) in enumerate(zip(table.rows, body)):
+            for cell, text in zip(row.cells, cells):
+                paragraph = cell.paragraphs[0]
+                self._add_runs(paragraph, text)
+                if has_header and index == 0:
+                    for run in paragraph.runs:
+                        run.bold = True
+
+    def compile(self, markdown: str, extra_images: Optional[List[str]] = None) -> CompiledReport:
+        """Compiles `markdown`; `extra_images` not already embedded go under 'Market Visuals'."""
+        doc = Document()
+        doc.add_heading(self.title, 0).alignment = WD_ALIGN_PARAGRAPH.CENTER
+        # Paragraph.style= scans the whole style table on every call; resolve the id
+        # once and set it on the underlying <w:p> element instead.
+        bullet_style_id = doc.styles['List Bullet'].style_id
+        picks: Dict[str, List[dict]] = {book: [] for book in PICK_SECTIONS.values()}
+        images: List[str] = []
+        missing: List[str] = []
+        embedded = set()
+        section: Optional[str] = None
+        table: List[List[str]] = []
+
+        for kind, value in tokenize(markdown):
+            if table and kind != TABLE_ROW:
+                self._add_table(doc, table)
+                table = []
+
+            if kind == TABLE_ROW:
+                table.append(value)
+            elif kind == HEADING:
+                level, text = value
+                section = next((book for marker, book in PICK_SECTIONS.items() if marker in text), None)
+                doc.add_heading(text.replace('**', ''), level=min(level, 9))
+            elif kind == BULLET:
+                if section:
+                    pick = parse_pick(value)
+                    if pick:
+                        picks[section].append(pick)
+                paragraph = doc.add_paragraph()
+                paragraph._p.style = bullet_style_id
+                self._add_runs(paragraph, value)
+            elif kind == PARAGRAPH:
+                marker_book = next((book for marker, book in PICK_SECTIONS.items() if marker in value), None)
+                if marker_book:
+                    section = marker_book
+                self._add_runs(doc.add_paragraph(), value)
+            elif kind == IMAGE:
+                alt, path = value
+                embedded.add(os.path.normpath(path))
+                self._add_image(doc, path, alt, images, missing)
+            elif kind == RULE:
+                doc.add_page_break()
+
+        if table:
+            self._add_table(doc, table)
+
+        remaining = [p for p in extra_images or [] if os.path.normpath(p) not in embedded]
+        if remaining:
+            doc.add_heading('Market Visuals', level=1)
+            for path in remaining:
+                self._add_image(doc, path, os.path.basename(path), images, missing)
+
+        return CompiledReport(doc, picks, images, missing)
+
+
+def compile_report(
+    markdown: str,
+    extra_images: Optional[List[str]] = None,
+    base_dir: Optional[str] = None,
+    substitutes: Optional[Dict[str, str]] = None,
+) -> CompiledReport:
+    return ReportCompiler(base_dir=base_dir, substitutes=substitutes).compile(markdown, extra_images)
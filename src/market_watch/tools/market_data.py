@@ -0,0 +1,201 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from .rate_limiter import get_rate_limiter
+from .storage import atomic_write_bytes
+
+DEFAULT_REPLAY_DIR = "replay"
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def period_to_offset(period: str) -> Optional[pd.DateOffset]:
+    """Converts a yfinance period string ('6mo', '1y', ...) into a DateOffset. 'max' maps to None."""
+    if period == "max":
+        return None
+    if period == "ytd":
+        now = pd.Timestamp.now()
+        return pd.DateOffset(days=now.dayofyear - 1)
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return pd.DateOffset(days=amount)
+    if unit == "wk":
+        return pd.DateOffset(weeks=amount)
+    if unit == "mo":
+        return pd.DateOffset(months=amount)
+    return pd.DateOffset(years=amount)
+
+
+class MarketDataProvider(ABC):
+    """Source of daily OHLCV bars and fundamentals used by the analysis tools."""
+
+    name: str = "base"
+
+    @abstractmethod
+    def history(self, ticker: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+        """Returns daily bars for a ticker, either for a trailing `period` or from `start`."""
+
+    @abstractmethod
+    def info(self, ticker: str) -> dict:
+        """Returns the fundamentals dict (yfinance `info` keys) for a ticker."""
+
+    def download(
+        self, tickers: List[str], period: Optional[str] = None, start: Optional[str] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """Returns daily bars for several tickers. Backends override this with a real bulk call."""
+        return {t: self.history(t, period=period, start=start) for t in tickers}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live data from Yahoo Finance."""
+
+    name: str = "yfinance"
+
+    def history(self, ticker: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+        get_rate_limiter().acquire("yfinance")
+        stock = yf.Ticker(ticker)
+        if start is not None:
+            return stock.history(start=start)
+        return stock.history(period=period)
+
+    def info(self, ticker: str) -> dict:
+        get_rate_limiter().acquire("yfinance")
+        return yf.Ticker(ticker).info
+
+    def download(
+        self, tickers: List[str], period: Optional[str] = None, start: Optional[str] = None
+    ) -> Dict[str, pd.DataFrame]:
+        kwargs = {"start": start} if start is not None else {"period": period}
+        get_rate_limiter().acquire("yfinance")
+        data = yf.download(
+            tickers, group_by='ticker', auto_adjust=True, actions=True,
+            progress=False, threads=True, **kwargs
+        )
+        if data is None or data.empty:
+            return {}
+        available = set(data.columns.get_level_values(0))
+        return {t: data[t].dropna(how='all') for t in tickers if t in available}
+
+
+class ReplayProvider(MarketDataProvider):
+    """Serves previously recorded bars and fundamentals from disk, fully offline.
+
+    Layout: `<root>/prices/<TICKER>.parquet` and `<root>/fundamentals/<TICKER>.json`.
+    Periods are measured back from the last recorded bar, so replays are deterministic.
+    """
+
+    name: str = "replay"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("MARKET_DATA_REPLAY_DIR", DEFAULT_REPLAY_DIR)
+
+    def _prices_path(self, ticker: str) -> str:
+        return os.path.join(self.root, "prices", f"{ticker.upper()}.parquet")
+
+    def _info_path(self, ticker: str) -> str:
+        return os.path.join(self.root, "fundamentals", f"{ticker.upper()}.json")
+
+    def history(self, ticker: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+        path = self._prices_path(ticker)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        df = pd.read_parquet(path)
+        if df.empty:
+            return df
+        if start is not None:
+            return df[df.index >= pd.Timestamp(start, tz=df.index.tz)]
+        if period is not None and period != "max":
+            return df[df.index >= df.index[-1] - period_to_offset(period)]
+        return df
+
+    def info(self, ticker: str) -> dict:
+        path = self._info_path(ticker)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+
+class RecordingProvider(MarketDataProvider):
+    """Passes calls through to another provider and records the responses for ReplayProvider.
+
+    Its name is tied to the replay directory, so the price and fundamentals caches
+    in front of it use their own directories: a symbol already warm in the live
+    cache still reaches the recorder, and the replay set comes out complete.
+    """
+
+    def __init__(self, inner: MarketDataProvider, root: Optional[str] = None):
+        self.inner = inner
+        self.replay = ReplayProvider(root)
+        self.name = f"record-{hashlib.sha1(os.path.abspath(self.replay.root).encode('utf-8')).hexdigest()[:8]}"
+        self._lock = threading.Lock()
+
+    def _record_history(self, ticker: str, df: pd.DataFrame) -> None:
+        if df is None or df.empty:
+            return
+        if df.index.tz is not None:
+            df = df.tz_localize(None)
+        with self._lock:
+            existing = self.replay.history(ticker)
+            if not existing.empty:
+                df = pd.concat([existing, df])
+                df = df[~df.index.duplicated(keep='last')].sort_index()
+            buffer = io.BytesIO()
+            df.to_parquet(buffer)
+            atomic_write_bytes(self.replay._prices_path(ticker), buffer.getvalue())
+
+    def history(self, ticker: str, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+        df = self.inner.history(ticker, period=period, start=start)
+        self._record_history(ticker, df)
+        return df
+
+    def info(self, ticker: str) -> dict:
+        info = self.inner.info(ticker)
+        payload = json.dumps(info, default=str).encode('utf-8')
+        atomic_write_bytes(self.replay._info_path(ticker), payload)
+        return info
+
+    def download(
+        self, tickers: List[str], period: Optional[str] = None, start: Optional[str] = None
+    ) -> Dict[str, pd.DataFrame]:
+        frames = self.inner.download(tickers, period=period, start=start)
+        for ticker, df in frames.items():
+            self._record_history(ticker, df)
+        return frames
+
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def create_provider(mode: Optional[str] = None) -> MarketDataProvider:
+    """Builds the provider selected by MARKET_DATA_PROVIDER: 'yfinance' (default), 'replay' or 'record'."""
+    mode = (mode or os.getenv("MARKET_DATA_PROVIDER", "yfinance")).lower()
+    if mode == "yfinance":
+        return YFinanceProvider()
+    if mode == "replay":
+        return ReplayProvider()
+    if mode == "record":
+        return RecordingProvider(YFinanceProvider())
+    raise ValueError(f"Unknown MARKET_DATA_PROVIDER: {mode}")
+
+
+def get_provider() -> MarketDataProvider:
+    """Returns the process-wide market data provider."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = create_provider()
+        return _provider
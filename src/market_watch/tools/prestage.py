@@ -0,0 +1,113 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .analysis_tools import format_snapshot_table
+from .chart_renderer import get_chart_renderer
+from .fundamentals_cache import get_fundamentals_cache
+from .indicators import latest_snapshot
+from .price_cache import get_price_cache
+from .universe import get_universe
+
+MAX_PRESTAGE_TICKERS = 30
+PRESTAGE_HEADER = "## Pre-staged Data"
+
+_TICKER_RE = re.compile(r"(?<![A-Za-z0-9])\$?([A-Z]{1,5}(?:[.-][A-Z])?)(?![A-Za-z0-9])")
+
+
+def extract_tickers(text: str, known: Optional[set] = None, limit: int = MAX_PRESTAGE_TICKERS) -> List[str]:
+    """Tickers mentioned in free text, in order of first mention.
+
+    Only symbols in the universe registry or the price cache count, so ordinary
+    capitalised words ("AI", "CEO") are ignored unless they are real listings.
+    """
+    if known is None:
+        known = {str(s) for s in get_universe().symbols} | set(get_price_cache().cached_symbols())
+    tickers = []
+    for match in _TICKER_RE.finditer(text or ""):
+        symbol = match.group(1)
+        if symbol in known and symbol not in tickers:
+            tickers.append(symbol)
+            if len(tickers) >= limit:
+                break
+    return tickers
+
+
+def prestage(tickers: List[str], output_dir: Optional[str] = None) -> Dict[str, object]:
+    """Computes indicators, charts and fundamentals for every ticker in bulk, without the LLM."""
+    frames = get_price_cache().history_many(tickers, period="1y")
+    closes = {t: df['Close'] for t, df in frames.items() if not df.empty}
+
+    snapshot = pd.DataFrame()
+    as_of = None
+    if closes:
+        close = pd.DataFrame(closes).sort_index()
+        snapshot = latest_snapshot(close)
+        as_of = close.index[-1]
+
+    charts = get_chart_renderer().render_many(closes, output_dir) if closes else {}
+
+    cache = get_fundamentals_cache()
+    cache.prefetch(tickers)
+    fundamentals = {}
+    for ticker in tickers:
+        try:
+            fundamentals[ticker] = cache.get(ticker)
+        except Exception:
+            fundamentals[ticker] = {}
+
+    return {"tickers": list(tickers), "snapshot": snapshot, "as_of": as_of,
+            "charts": charts, "fundamentals": fundamentals}
+
+
+def _fmt(value, pattern: str = "{}") -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return "N/A"
+    try:
+        return pattern.format(value)
+    except (ValueError, TypeError):
+        return str(value)
+
+
+def format_prestage(result: Dict[str, object]) -> str:
+    """Renders a prestage result as the context block appended to the scout's output."""
+    lines = [PRESTAGE_HEADER, "Computed in bulk for the tickers above. Use these figures directly "
+             "instead of calling tools again for the same tickers.", ""]
+
+    snapshot = result["snapshot"]
+    if not snapshot.empty:
+        lines.append(format_snapshot_table(snapshot, as_of=result["as_of"], requested=result["tickers"]))
+    else:
+        lines.append(f"No price data for: {', '.join(result['tickers'])}")
+
+    lines += ["", "Charts:"]
+    lines += [f"- {ticker}: {path}" for ticker, path in result["charts"].items()]
+
+    lines += ["", "Fundamentals:", "Ticker | Name | Sector | Market Cap | Forward P/E | EPS (Trailing) | 52W High | 52W Low"]
+    for ticker, info in result["fundamentals"].items():
+        lines.append(
+            f"{ticker} | {_fmt(info.get('longName'))} | {_fmt(info.get('sector'))} | "
+            f"{_fmt(info.get('marketCap'), '${:,}')} | {_fmt(info.get('forwardPE'), '{:.2f}')} | "
+            f"{_fmt(info.get('trailingEps'), '{:.2f}')} | {_fmt(info.get('fiftyTwoWeekHigh'), '${}')} | "
+            f"{_fmt(info.get('fiftyTwoWeekLow'), '${}')}"
+        )
+    return "\n".join(lines)
+
+
+def prestage_guardrail(output) -> Tuple[bool, Any]:
+    """Task guardrail for scout_task: appends the pre-staged data to the scout's output.
+
+    Downstream tasks receive it through their context. Never fails the task; if
+    pre-staging breaks, the analysts fall back to calling their tools.
+    """
+    raw = output.raw or ""
+    if PRESTAGE_HEADER in raw:
+        return True, raw
+    try:
+        tickers = extract_tickers(raw)
+        if not tickers:
+            return True, raw
+        return True, raw + "\n\n" + format_prestage(prestage(tickers))
+    except Exception as e:
+        return True, raw + f"\n\n{PRESTAGE_HEADER}\nPre-stage failed ({str(e)}); use the analysis tools."
@@ -0,0 +1,340 @@
+import io
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .market_data import MarketDataProvider, get_provider, period_to_offset
+from .storage import as_of, atomic_write_bytes, cache_dir
+
+# How long a cached series is considered fresh before we ask for newer bars.
+DEFAULT_REFRESH_INTERVAL = int(os.getenv("MARKET_WATCH_PRICE_REFRESH_SECONDS", "900"))
+# Minimum history pulled on a cold cache so later, shorter requests never re-download.
+DEFAULT_MIN_PERIOD = "1y"
+# How long a symbol the provider had no bars for (delisted, bad ticker) is not asked for again.
+DEFAULT_NO_DATA_TTL = int(os.getenv("MARKET_WATCH_NO_DATA_TTL_SECONDS", str(24 * 3600)))
+NO_DATA_SUFFIX = ".nodata"
+# Relative Close change on an already cached bar that means the provider restated
+# (split- or dividend-adjusted) the history, rather than rounding noise.
+RESTATEMENT_TOLERANCE = 1e-4
+
+
+def _longer_period(a: str, b: str) -> str:
+    if "max" in (a, b):
+        return "max"
+    now = pd.Timestamp.now()
+    return a if now - period_to_offset(a) <= now - period_to_offset(b) else b
+
+
+class PriceCache:
+    """Local per-symbol Parquet store of daily OHLCV bars, topped up incrementally.
+
+    With an `as_of` date (MARKET_WATCH_AS_OF) the cache is point-in-time: it never
+    fetches and every read is cut off after that date.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        provider: Optional[MarketDataProvider] = None,
+        refresh_interval: int = DEFAULT_REFRESH_INTERVAL,
+        as_of_date: Optional[str] = None,
+        no_data_ttl: int = DEFAULT_NO_DATA_TTL,
+    ):
+        self.provider = provider or get_provider()
+        # Keep live and replayed bars apart so an offline run never pollutes the live cache.
+        default_root = cache_dir("prices") if self.provider.name == "yfinance" else cache_dir(self.provider.name, "prices")
+        self.root = root or default_root
+        os.makedirs(self.root, exist_ok=True)
+        self.refresh_interval = refresh_interval
+        self.no_data_ttl = no_data_ttl
+        as_of_date = as_of_date or as_of()
+        self.as_of = pd.Timestamp(as_of_date) if as_of_date else None
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _data_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker.upper()}.parquet")
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{ticker.upper()}.json")
+
+    def _no_data_path(self, ticker: str) -> str:
+        # Empty marker file; its mtime is when the provider last had nothing for the symbol.
+        return os.path.join(self.root, f"{ticker.upper()}{NO_DATA_SUFFIX}")
+
+    def _no_data(self, ticker: str, now: float) -> bool:
+        try:
+            return now - os.path.getmtime(self._no_data_path(ticker)) < self.no_data_ttl
+        except OSError:
+            return False
+
+    def _mark_no_data(self, ticker: str) -> None:
+        atomic_write_bytes(self._no_data_path(ticker), b"")
+
+    def load(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Returns the cached bars for a ticker without touching the network."""
+        path = self._data_path(ticker)
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def _load_meta(self, ticker: str) -> dict:
+        path = self._meta_path(ticker)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _store(self, ticker: str, df: pd.DataFrame, meta: dict) -> None:
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+        atomic_write_bytes(self._data_path(ticker), buffer.getvalue())
+        atomic_write_bytes(self._meta_path(ticker), json.dumps(meta).encode('utf-8'))
+        if os.path.exists(self._no_data_path(ticker)):
+            os.remove(self._no_data_path(ticker))
+
+    def _until_as_of(self, df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        if df is None or self.as_of is None:
+            return df
+        return df[df.index <= self.as_of]
+
+    def _covers(self, meta: dict, period: str) -> bool:
+        covered = meta.get("covered_period")
+        return covered is not None and _longer_period(covered, period) == covered
+
+    def _fetch_many(self, tickers: List[str], **kwargs) -> Dict[str, pd.DataFrame]:
+        if len(tickers) == 1:
+            fetched = {tickers[0]: self.provider.history(tickers[0], **kwargs)}
+        else:
+            fetched = self.provider.download(tickers, **kwargs)
+        return {t: _naive(df) for t, df in fetched.items()}
+
+    def history(self, ticker: str, period: str = "1y") -> pd.DataFrame:
+        """Returns daily bars for the trailing `period`, fetching only what the cache is missing."""
+        return self.history_many([ticker], period)[ticker.upper()]
+
+    def history_many(self, tickers: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
+        """Like `history` for several tickers, with all missing bars pulled in one bulk download."""
+        symbols = sorted({t.upper() for t in tickers})
+        if self.as_of is not None:
+            return {s: _slice(self._until_as_of(self.load(s)), period) for s in symbols}
+        locks = [self._lock(s) for s in symbols]
+        for lock in locks:
+            lock.acquire()
+        try:
+            frames = {s: self.load(s) for s in symbols}
+            metas = {s: self._load_meta(s) for s in symbols}
+            now = time.time()
+            cold = [
+                s for s in symbols
+                if (frames[s] is None or frames[s].empty or not self._covers(metas[s], period))
+                and not (frames[s] is None and self._no_data(s, now))
+            ]
+            stale = [
+                s for s in symbols
+                if s not in cold and frames[s] is not None
+                and now - metas[s].get("checked_at", 0) > self.refresh_interval
+            ]
+
+            if cold:
+                fetch_period = _longer_period(period, DEFAULT_MIN_PERIOD)
+                fetched = self._fetch_many(cold, period=fetch_period)
+                for s in cold:
+                    fresh = fetched.get(s)
+                    if fresh is None or fresh.empty:
+                        if frames[s] is None:
+                            self._mark_no_data(s)
+                        continue
+                    if frames[s] is not None and not frames[s].empty:
+                        fresh = _merge(frames[s], fresh)
+                    frames[s] = fresh
+                    metas[s] = {"covered_period": fetch_period, "checked_at": now}
+                    self._store(s, fresh, metas[s])
+
+            if stale:
+                # Re-request the last cached day too, its bar may have been partial, and
+                # the one before it, a completed bar to check the history against.
+                start = min(frames[s].index[max(len(frames[s]) - 2, 0)] for s in stale).strftime('%Y-%m-%d')
+                fetched = self._fetch_many(stale, start=start)
+                restated = []
+                for s in stale:
+                    newer = fetched.get(s)
+                    if _restated(frames[s], newer):
+                        restated.append(s)
+                        continue
+                    if newer is not None and not newer.empty:
+                        frames[s] = _merge(frames[s], newer)
+                    metas[s]["checked_at"] = now
+                    self._store(s, frames[s], metas[s])
+
+                # A split or dividend re-adjusts every earlier bar: merging new bars onto the
+                # old ones would leave a phantom jump, so the whole history is replaced.
+                by_period: Dict[str, List[str]] = {}
+                for s in restated:
+                    by_period.setdefault(metas[s].get("covered_period", DEFAULT_MIN_PERIOD), []).append(s)
+                for covered, group in by_period.items():
+                    fetched = self._fetch_many(group, period=covered)
+                    for s in group:
+                        fresh = fetched.get(s)
+                        if fresh is None or fresh.empty:
+                            continue
+                        frames[s] = fresh.sort_index()
+                        metas[s] = {"covered_period": covered, "checked_at": now}
+                        self._store(s, frames[s], metas[s])
+        finally:
+            for lock in locks:
+                lock.release()
+
+        return {s: _slice(frames[s], period) for s in symbols}
+
+    def panel(self, tickers: List[str], period: str = "1y", field: str = "Close") -> pd.DataFrame:
+        """Returns a wide dates x tickers frame of one OHLCV field."""
+        frames = self.history_many(tickers, period)
+        columns = {}
+        for symbol, df in frames.items():
+            if df.empty:
+                continue
+            series = df[field]
+            series.index = series.index.normalize()
+            columns[symbol] = series[~series.index.duplicated(keep='last')]
+        if not columns:
+            return pd.DataFrame()
+        return pd.DataFrame(columns).sort_index()
+
+    def cached_symbols(self) -> Dict[str, float]:
+        """Every symbol with cached bars, mapped to its file's modification time."""
+        symbols = {}
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.name.endswith('.parquet') and entry.is_file():
+                    symbols[entry.name[:-len('.parquet')]] = entry.stat().st_mtime
+        return symbols
+
+    def uncovered(self, tickers: List[str], period: str) -> List[str]:
+        """Symbols whose cache does not reach back `period` (never cached or cached shorter).
+
+        Reads metadata only; symbols recently without data are left out.
+        """
+        now = time.time()
+        symbols = sorted({t.upper() for t in tickers})
+        return [
+            s for s in symbols
+            if not self._covers(self._load_meta(s), period) and not self._no_data(s, now)
+        ]
+
+    def unavailable_symbols(self) -> List[str]:
+        """Symbols the provider recently had no bars for; callers should not request them again yet."""
+        now = time.time()
+        symbols = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.name.endswith(NO_DATA_SUFFIX) and now - entry.stat().st_mtime < self.no_data_ttl:
+                    symbols.append(entry.name[:-len(NO_DATA_SUFFIX)])
+        return sorted(symbols)
+
+    def snapshot_panels(self, fields=("Open", "Close", "Volume"), lookback: int = 260) -> Dict[str, pd.DataFrame]:
+        """Wide dates x tickers frames for every cached symbol. Local only, never fetches.
+
+        The panels are kept as one consolidated Parquet file per field under `_panels/`
+        (`_panels_<as_of>/` for point-in-time caches)
+        and only the symbols whose files changed since the last snapshot are re-read.
+        """
+        fields = list(fields)
+        panels_name = "_panels" if self.as_of is None else f"_panels_{self.as_of:%Y-%m-%d}"
+        panels_dir = os.path.join(self.root, panels_name)
+        manifest_path = os.path.join(panels_dir, "manifest.json")
+        current = self.cached_symbols()
+
+        with self._locks_guard:
+            manifest = {}
+            if os.path.exists(manifest_path):
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+            reusable = manifest.get("fields") == fields and manifest.get("lookback") == lookback
+            previous = manifest.get("mtimes", {}) if reusable else {}
+            changed = [s for s, mtime in current.items() if previous.get(s) != mtime]
+            removed = [s for s in previous if s not in current]
+
+            if reusable and not changed and not removed:
+                return {field: pd.read_parquet(os.path.join(panels_dir, f"{field}.parquet")) for field in fields}
+
+            panels = {}
+            for field in fields:
+                path = os.path.join(panels_dir, f"{field}.parquet")
+                old = pd.read_parquet(path) if reusable and os.path.exists(path) else pd.DataFrame()
+                panels[field] = old.drop(columns=changed + removed, errors='ignore')
+
+            fresh = {field: {} for field in fields}
+            for symbol in changed:
+                df = self._until_as_of(pd.read_parquet(self._data_path(symbol), columns=fields)).tail(lookback)
+                for field in fields:
+                    fresh[field][symbol] = df[field]
+
+            for field in fields:
+                combined = pd.concat([panels[field], pd.DataFrame(fresh[field])], axis=1)
+                combined = combined.sort_index().tail(lookback)
+                panels[field] = combined[sorted(combined.columns)]
+                buffer = io.BytesIO()
+                panels[field].to_parquet(buffer)
+                atomic_write_bytes(os.path.join(panels_dir, f"{field}.parquet"), buffer.getvalue())
+            manifest = {"fields": fields, "lookback": lookback, "mtimes": current}
+            atomic_write_bytes(manifest_path, json.dumps(manifest).encode('utf-8'))
+            return panels
+
+
+def _slice(df: Optional[pd.DataFrame], period: str) -> pd.DataFrame:
+    if df is None or df.empty:
+        return pd.DataFrame()
+    offset = period_to_offset(period)
+    if offset is None:
+        return df
+    # Measured back from the newest bar rather than the wall clock so replayed
+    # recordings slice the same way as live data.
+    cutoff = df.index[-1] - offset
+    return df[df.index >= cutoff]
+
+
+def _naive(df: pd.DataFrame) -> pd.DataFrame:
+    # Ticker.history() returns exchange-local timestamps, yf.download() naive ones;
+    # daily bars are stored naive (exchange-local dates) so both can be merged.
+    if getattr(df.index, "tz", None) is not None:
+        df = df.tz_localize(None)
+    return df
+
+
+def _restated(cached: pd.DataFrame, newer: Optional[pd.DataFrame]) -> bool:
+    """Whether `newer` disagrees with the cached Close on the last completed cached bar."""
+    if newer is None or newer.empty or len(cached) < 2:
+        return False
+    day = cached.index[-2]
+    if day not in newer.index:
+        return False
+    before, after = float(cached["Close"].loc[day]), float(newer["Close"].loc[day])
+    return abs(after - before) > RESTATEMENT_TOLERANCE * max(abs(before), 1e-12)
+
+
+def _merge(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    combined = pd.concat([old, new])
+    combined = combined[~combined.index.duplicated(keep='last')]
+    return combined.sort_index()
+
+
+_shared_cache: Optional[PriceCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_price_cache() -> PriceCache:
+    """Returns the process-wide PriceCache shared by all analysis tools."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PriceCache()
+        return _shared_cache
@@ -0,0 +1,157 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import yaml
+
+from .storage import cache_dir, run_id as current_run_id
+
+DEFAULT_LIMITS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../config/rate_limits.yaml')
+_SECONDS_PER = {"second": 1, "minute": 60, "hour": 3600}
+
+
+def load_limits(path: Optional[str] = None) -> Dict[str, Tuple[float, float]]:
+    """Reads the bucket config into name -> (tokens per second, capacity)."""
+    path = path or os.getenv("MARKET_WATCH_RATE_LIMITS", DEFAULT_LIMITS_PATH)
+    with open(path, 'r') as f:
+        config = yaml.safe_load(f) or {}
+    limits = {}
+    for name, spec in config.items():
+        per = spec.get("per", "second")
+        if per not in _SECONDS_PER:
+            raise ValueError(f"Unsupported rate limit period for {name}: {per}")
+        limits[name] = (float(spec["rate"]) / _SECONDS_PER[per], float(spec.get("burst", 1)))
+    return limits
+
+
+class RateLimiter:
+    """Token buckets, one per backend, shared across threads and processes.
+
+    Bucket state is kept in a small SQLite database and updated inside an
+    IMMEDIATE transaction, so concurrent processes of the same run draw from the
+    same buckets. Wait times are recorded per run and bucket for `stats()`, so a
+    run reports its own waits, not everything the shared database has seen.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None, path: Optional[str] = None):
+        self.limits = load_limits() if limits is None else dict(limits)
+        self.path = path or os.path.join(cache_dir(), "rate_limits.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS run_bucket_stats ("
+            " run_id TEXT NOT NULL, name TEXT NOT NULL, acquired INTEGER NOT NULL, waited REAL NOT NULL,"
+            " max_wait REAL NOT NULL, PRIMARY KEY (run_id, name))"
+        )
+
+    def _take(self, name: str, tokens: float) -> float:
+        """Takes tokens if available. Returns 0, or the seconds until they will be."""
+        rate, capacity = self.limits[name]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (name,)).fetchone()
+                available = capacity if row is None else min(capacity, row[0] + max(now - row[1], 0) * rate)
+                wait = 0.0
+                if available >= tokens:
+                    available -= tokens
+                else:
+                    wait = (tokens - available) / rate
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)", (name, available, now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def _write(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _record(self, name: str, waited: float) -> None:
+        self._write(
+            "INSERT INTO run_bucket_stats (run_id, name, acquired, waited, max_wait) VALUES (?, ?, 1, ?, ?)"
+            " ON CONFLICT(run_id, name) DO UPDATE SET acquired = acquired + 1, waited = waited + excluded.waited,"
+            " max_wait = MAX(max_wait, excluded.max_wait)",
+            (current_run_id() or "", name, waited, waited),
+        )
+
+    def acquire(self, name: str, tokens: float = 1.0) -> float:
+        """Blocks until the named bucket can pay `tokens`; returns the seconds waited.
+
+        Names without a configured limit return immediately.
+        """
+        if name not in self.limits:
+            return 0.0
+        if tokens > self.limits[name][1]:
+            raise ValueError(f"Cannot acquire {tokens} tokens from '{name}' (burst is {self.limits[name][1]})")
+        start = time.monotonic()
+        while True:
+            wait = self._take(name, tokens)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+        waited = time.monotonic() - start
+        self._record(name, waited)
+        return waited
+
+    def stats(self, run_id: Optional[str] = None) -> Dict[str, dict]:
+        """Acquisitions and wait times per bucket for one run (default: the active run), over all its processes.
+
+        Calls made outside a run workspace are grouped under run id ''.
+        """
+        run_id = run_id if run_id is not None else current_run_id() or ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, acquired, waited, max_wait FROM run_bucket_stats WHERE run_id = ? ORDER BY name", (run_id,)
+            ).fetchall()
+        return {
+            name: {"acquired": acquired, "waited": waited, "max_wait": max_wait,
+                   "avg_wait": waited / acquired if acquired else 0.0}
+            for name, acquired, waited, max_wait in rows
+        }
+
+    def reset_stats(self, run_id: Optional[str] = None) -> None:
+        """Clears one run's stats, or every run's when `run_id` is None."""
+        if run_id is None:
+            self._write("DELETE FROM run_bucket_stats", ())
+        else:
+            self._write("DELETE FROM run_bucket_stats WHERE run_id = ?", (run_id,))
+
+    def format_stats(self, run_id: Optional[str] = None) -> str:
+        lines = ["Rate limiter waits:"]
+        for name, s in self.stats(run_id).items():
+            lines.append(
+                f"  {name}: {s['acquired']} calls, waited {s['waited']:.1f}s total "
+                f"(avg {s['avg_wait']:.2f}s, max {s['max_wait']:.2f}s)"
+            )
+        return "\n".join(lines)
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide RateLimiter."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
+
@@ -1,16 +1,14 @@
-import yfinance as yf
 import pandas as pd
-import pandas_ta as ta
-import matplotlib.pyplot as plt
 import os
 import json
-import re
 from crewai.tools import BaseTool
 from typing import Type, List
 from pydantic import BaseModel, Field
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from .chart_assets import load_manifest, variant_paths
+from .markdown_compiler import compile_report
+from .dashboard_store import DashboardStore, build_shards
+from .run_history import get_run_history, pick_data
+from .storage import as_of, atomic_write_bytes, legacy_dashboard, output_dir as get_output_dir
 
 
 class WordReportToolInput(BaseModel):
@@ -20,93 +18,72 @@ class WordReportToolInput(BaseModel):
 class WordReportTool(BaseTool):
     name: str = "Word Report Tool"
     description: str = (
-        "Generates a professional Word Document (.docx) from the provided markdown content and embeds "
-        "any specified chart images. Saves the file to 'output/market_watch_report.docx'. "
-        "Also generates a 'dashboard_data.json' file for the frontend."
+        "Generates a professional Word Document (.docx) from the provided markdown content, embedding "
+        "markdown images (![alt](path)), tables and any additional chart images. Saves the file to 'output/market_watch_report.docx'. "
+        "Also generates the dashboard data: the sharded 'dashboard/' index."
     )
     args_schema: Type[BaseModel] = WordReportToolInput
 
     def _run(self, report_content: str, chart_paths: List[str] = []) -> str:
         try:
-            # --- DOCX GENERATION ---
-            doc = Document()
-            title = doc.add_heading('Market Watch Daily Report', 0)
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            output_dir = get_output_dir()
 
-            for line in report_content.split('\n'):
-                if line.startswith('# '):
-                   doc.add_heading(line[2:], level=1)
-                elif line.startswith('## '):
-                   doc.add_heading(line[3:], level=2)
-                elif line.startswith('### '):
-                   doc.add_heading(line[4:], level=3)
-                elif line.startswith('**') and line.endswith('**'):
-                    p = doc.add_paragraph()
-                    run = p.add_run(line[2:-2])
-                    run.bold = True
-                elif line.strip() == '---':
-                    doc.add_page_break()
-                else:
-                    doc.add_paragraph(line)
+            # One pass over the markdown builds the DOCX and extracts the picks.
+            # Charts are embedded as their print variant when the asset pipeline has one.
+            manifest = load_manifest(output_dir)
+            report = compile_report(
+                report_content, chart_paths, base_dir=output_dir,
+                substitutes=variant_paths(manifest, "print", output_dir),
+            )
+            top_short = report.picks["short"]
+            top_long = report.picks["long"]
 
-            if chart_paths:
-                doc.add_heading('Market Visuals', level=1)
-                for path in chart_paths:
-                    if os.path.exists(path):
-                        doc.add_picture(path, width=Inches(6))
-                        last_paragraph = doc.paragraphs[-1] 
-                        last_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        doc.add_paragraph(f"Figure: {os.path.basename(path)}", style='Caption')
-                    else:
-                         doc.add_paragraph(f"[Missing Image: {path}]", style='Quote')
-
-            output_dir = "output"
-            if not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-            
             docx_path = os.path.join(output_dir, "market_watch_report.docx")
-            doc.save(docx_path)
-
-            # --- JSON DATA EXTRACTION ---
-            top_short = []
-            top_long = []
-            current_section = None
-
-            for line in report_content.split('\n'):
-                line = line.strip()
-                if "Top 5 Short-Term Picks" in line:
-                    current_section = "short"
-                    continue
-                elif "Top 5 Long-Term Picks" in line:
-                    current_section = "long"
-                    continue
-                elif line.startswith("#"):
-                    current_section = None
-                
-                if current_section and line.startswith("-"):
-                    # Extract Ticker and Reason
-                    # Expected format: "- **NVDA**: Reason..." or "- NVDA: Reason..."
-                    match = re.search(r"\- (?:\*\*)?([A-Z]+)(?:\*\*)?[:\s]+(.*)", line)
-                    if match:
-                        pick = {"ticker": match.group(1), "reason": match.group(2)}
-                        if current_section == "short":
-                            top_short.append(pick)
-                        elif current_section == "long":
-                            top_long.append(pick)
+            report.document.save(docx_path)
 
+            picks = {"short": top_short, "long": top_long}
             dashboard_data = {
                 "generated_at": pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "as_of": as_of(),
                 "top_short": top_short,
                 "top_long": top_long,
-                "charts": [os.path.basename(p) for p in chart_paths],
+                "charts": [os.path.basename(p) for p in report.images],
+                "chart_assets": manifest.get("charts", {}),
                 "full_report": report_content
             }
 
-            json_path = os.path.join(output_dir, "dashboard_data.json")
-            with open(json_path, 'w') as f:
-                json.dump(dashboard_data, f, indent=2)
-            
-            return f"Report saved to {docx_path} and data to {json_path}"
+            # Legacy single-file export, written only on request (MARKET_WATCH_LEGACY_DASHBOARD=1)
+            # for readers not yet moved to the dashboard/ index; it will be removed in the next release.
+            if legacy_dashboard():
+                atomic_write_bytes(
+                    os.path.join(output_dir, "dashboard_data.json"),
+                    json.dumps(dashboard_data, separators=(",", ":")).encode('utf-8'),
+                )
+
+            notes = []
+            try:
+                snapshot, fundamentals = pick_data(picks)
+            except Exception as e:
+                snapshot, fundamentals = None, {}
+                notes.append(f"pick data unavailable: {str(e)}")
+
+            # The dashboard polls the small index and refetches only shards whose ETag changed.
+            summary = {key: dashboard_data[key] for key in ("generated_at", "as_of", "top_short", "top_long", "charts")}
+            shards = build_shards(report_content, picks, dashboard_data["chart_assets"], snapshot, fundamentals)
+            store = DashboardStore(output_dir)
+            index = store.publish(summary, shards)
+            notes.append(f"dashboard index {index['etag']}")
+
+            # The files above only hold the latest run; the history store keeps every run.
+            try:
+                run_id = get_run_history().record_run(
+                    picks, snapshot, fundamentals, report_content, docx_path, store.index_path
+                )
+                notes.append(f"run #{run_id} added to history")
+            except Exception as e:
+                notes.append(f"run history not updated: {str(e)}")
+
+            return f"Report saved to {docx_path} and data to {store.index_path} ({'; '.join(notes)})"
 
         except Exception as e:
             return f"Error creating reports: {str(e)}"
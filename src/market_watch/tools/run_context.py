@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from .storage import RUNS_DIR, atomic_write_bytes, output_root
+
+RUN_FILE = "run.json"
+LATEST_NAME = "LATEST"
+LATEST_LINK = "latest"
+DEFAULT_KEEP_RUNS = 20
+
+
+def new_run_id(now: Optional[datetime] = None) -> str:
+    """Sortable, collision-free run id: 20260105-093000-1a2b3c."""
+    return f"{(now or datetime.now()):%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class RunContext:
+    """An isolated output workspace (<root>/runs/<run id>) for one crew run.
+
+    Entering the context exports MARKET_WATCH_RUN_ID, so every storage.output_dir()
+    call in this process (charts, report, dashboard) resolves into the workspace
+    instead of the shared output folder. Concurrent runs each use their own
+    process and never touch each other's files. A successful run then moves the
+    LATEST pointer to itself atomically.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, root: Optional[str] = None, pointer: str = LATEST_NAME):
+        self.run_id = run_id or new_run_id()
+        self.root = root or output_root()
+        # Name of the pointer file; batch runs keep one per watchlist (LATEST-<name>).
+        self.pointer = pointer
+        self.workspace = os.path.join(self.root, RUNS_DIR, self.run_id)
+        self._previous_env = {}
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.workspace, *parts)
+
+    def _write_status(self, **fields) -> None:
+        status = read_run(self.workspace) or {"run_id": self.run_id}
+        status.update(fields)
+        atomic_write_bytes(self.path(RUN_FILE), json.dumps(status, indent=2).encode('utf-8'))
+
+    def __enter__(self) -> "RunContext":
+        os.makedirs(self.workspace, exist_ok=True)
+        for key, value in (("MARKET_WATCH_RUN_ID", self.run_id), ("MARKET_WATCH_OUTPUT_DIR", self.root)):
+            self._previous_env[key] = os.environ.get(key)
+            os.environ[key] = value
+        self._write_status(status="running", pid=os.getpid(), started_at=datetime.now().isoformat(timespec='seconds'))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._write_status(
+                status="failed" if exc_type else "finished",
+                finished_at=datetime.now().isoformat(timespec='seconds'),
+                error=str(exc) if exc else None,
+            )
+            if exc_type is None:
+                self.publish_latest()
+        finally:
+            for key, value in self._previous_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    def publish_latest(self) -> None:
+        """Points LATEST (a file holding the run id) and, where supported, the `latest` symlink at this run."""
+        atomic_write_bytes(os.path.join(self.root, self.pointer), self.run_id.encode('utf-8'))
+        link = os.path.join(self.root, LATEST_LINK + self.pointer[len(LATEST_NAME):])
+        tmp_link = f"{link}.tmp-{os.getpid()}"
+        try:
+            if os.path.lexists(tmp_link):
+                os.remove(tmp_link)
+            os.symlink(os.path.join(RUNS_DIR, self.run_id), tmp_link, target_is_directory=True)
+            os.replace(tmp_link, link)
+        except OSError:
+            # Symlinks are a convenience (e.g. unavailable on some Windows setups); LATEST is authoritative.
+            if os.path.lexists(tmp_link):
+                os.remove(tmp_link)
+
+
+def read_run(workspace: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(workspace, RUN_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def latest_run(root: Optional[str] = None, pointer: str = LATEST_NAME) -> Optional[str]:
+    """Run id of the last successful run, or None."""
+    try:
+        with open(os.path.join(root or output_root(), pointer), 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def list_runs(root: Optional[str] = None) -> List[dict]:
+    """Every run workspace with its run.json status, newest first."""
+    runs_root = os.path.join(root or output_root(), RUNS_DIR)
+    if not os.path.isdir(runs_root):
+        return []
+    runs = []
+    for name in os.listdir(runs_root):
+        workspace = os.path.join(runs_root, name)
+        if name.startswith(".") or not os.path.isdir(workspace):
+            continue
+        status = read_run(workspace) or {"run_id": name, "status": "unknown"}
+        status["workspace"] = workspace
+        runs.append(status)
+    return sorted(runs, key=lambda r: r["run_id"], reverse=True)
+
+
+def gc_runs(
+    root: Optional[str] = None,
+    keep: Optional[int] = None,
+    max_age_days: Optional[float] = None,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """Deletes old run workspaces; returns the removed run ids.
+
+    Keeps the `keep` newest runs, every run a LATEST* pointer names and every
+    run whose process is still alive. Others are removed once they fall outside `keep` or are older
+    than `max_age_days`. A workspace is renamed before deletion, so readers never
+    see a half-deleted run. Picks outlive their workspace in the run history
+    store, which is what the backtest reads.
+    """
+    root = root or output_root()
+    keep = keep if keep is not None else int(os.getenv("MARKET_WATCH_KEEP_RUNS", DEFAULT_KEEP_RUNS))
+    pointers = [name for name in os.listdir(root) if name.startswith(LATEST_NAME)] if os.path.isdir(root) else []
+    pointed = {latest_run(root, name) for name in pointers}
+    cutoff = (now or datetime.now()) - timedelta(days=max_age_days) if max_age_days is not None else None
+
+    removed = []
+    for position, run in enumerate(list_runs(root)):
+        if run["run_id"] in pointed:
+            continue
+        if run.get("status") == "running" and _pid_alive(run.get("pid")):
+            continue
+        started = run.get("started_at")
+        too_old = cutoff is not None and started is not None and datetime.fromisoformat(started) < cutoff
+        if position < keep and not too_old:
+            continue
+        trash = os.path.join(os.path.dirname(run["workspace"]), f".trash-{run['run_id']}")
+        try:
+            os.replace(run["workspace"], trash)
+        except OSError:
+            continue
+        shutil.rmtree(trash, ignore_errors=True)
+        removed.append(run["run_id"])
+    return removed
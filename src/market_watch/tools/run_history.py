@@ -0,0 +1,212 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date as date_type
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .storage import as_of
+
+DEFAULT_HISTORY_PATH = os.path.join("history", "market_watch.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_date TEXT NOT NULL,
+    generated_at TEXT NOT NULL,
+    as_of TEXT,
+    report_path TEXT,
+    dashboard_path TEXT,
+    report_markdown TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_date ON runs (run_date);
+
+CREATE TABLE IF NOT EXISTS picks (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    run_date TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    book TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS picks_ticker ON picks (ticker, run_date);
+CREATE INDEX IF NOT EXISTS picks_date ON picks (run_date);
+
+CREATE TABLE IF NOT EXISTS indicator_snapshots (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    run_date TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    close REAL, rsi_14 REAL, macd REAL, macd_signal REAL, sma_50 REAL, sma_200 REAL
+);
+CREATE INDEX IF NOT EXISTS snapshots_ticker ON indicator_snapshots (ticker, run_date);
+CREATE INDEX IF NOT EXISTS snapshots_date ON indicator_snapshots (run_date);
+
+CREATE TABLE IF NOT EXISTS fundamentals (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    run_date TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS fundamentals_ticker ON fundamentals (ticker, run_date);
+CREATE INDEX IF NOT EXISTS fundamentals_date ON fundamentals (run_date);
+"""
+
+# indicator_snapshots column -> indicators.latest_snapshot column
+SNAPSHOT_COLUMNS = {
+    "close": "Close", "rsi_14": "RSI_14", "macd": "MACD_12_26_9",
+    "macd_signal": "MACDs_12_26_9", "sma_50": "SMA_50", "sma_200": "SMA_200",
+}
+
+
+def _float(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+class RunHistory:
+    """Append-only SQLite history of every run: picks, indicator snapshots, fundamentals
+    and report metadata, indexed by date and ticker."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("MARKET_WATCH_HISTORY_DB", DEFAULT_HISTORY_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def record_run(
+        self,
+        picks: Dict[str, List[dict]],
+        snapshot: Optional[pd.DataFrame] = None,
+        fundamentals: Optional[Dict[str, dict]] = None,
+        report_markdown: Optional[str] = None,
+        report_path: Optional[str] = None,
+        dashboard_path: Optional[str] = None,
+        run_date: Optional[str] = None,
+    ) -> int:
+        """Appends one run in a single transaction and returns its run_id.
+
+        `picks` maps a book ('short' / 'long') to a ranked list of {'ticker', 'reason'}.
+        """
+        point_in_time = as_of()
+        run_date = run_date or point_in_time or date_type.today().isoformat()
+        generated_at = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        pick_rows = [
+            (run_date, pick["ticker"].upper(), book, rank, pick.get("reason"))
+            for book, items in picks.items() for rank, pick in enumerate(items, start=1)
+        ]
+        snapshot_rows = []
+        if snapshot is not None:
+            for ticker, row in snapshot.iterrows():
+                snapshot_rows.append(
+                    (run_date, str(ticker).upper(), *[_float(row.get(col)) for col in SNAPSHOT_COLUMNS.values()])
+                )
+        fundamental_rows = [
+            (run_date, ticker.upper(), field, json.dumps(value, default=str))
+            for ticker, info in (fundamentals or {}).items() for field, value in info.items()
+        ]
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (run_date, generated_at, as_of, report_path, dashboard_path, report_markdown)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (run_date, generated_at, point_in_time, report_path, dashboard_path, report_markdown),
+            )
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO picks (run_id, run_date, ticker, book, rank, reason) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in pick_rows],
+            )
+            self._conn.executemany(
+                f"INSERT INTO indicator_snapshots (run_id, run_date, ticker, {', '.join(SNAPSHOT_COLUMNS)})"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in snapshot_rows],
+            )
+            self._conn.executemany(
+                "INSERT INTO fundamentals (run_id, run_date, ticker, field, value) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in fundamental_rows],
+            )
+        return run_id
+
+    def _query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def runs(self, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        return self._query(
+            "SELECT run_id, run_date, generated_at, as_of, report_path, dashboard_path FROM runs"
+            " WHERE run_date BETWEEN ? AND ? ORDER BY run_date, run_id",
+            (start or "0000-00-00", end or "9999-99-99"),
+        )
+
+    def picks_for(self, ticker: str) -> pd.DataFrame:
+        """Every time a ticker was picked, oldest first."""
+        return self._query(
+            "SELECT run_id, run_date, book, rank, reason FROM picks WHERE ticker = ? ORDER BY run_date, run_id",
+            (ticker.upper(),),
+        )
+
+    def picks_on(self, run_date: str) -> pd.DataFrame:
+        return self._query(
+            "SELECT run_id, ticker, book, rank, reason FROM picks WHERE run_date = ? ORDER BY run_id, book, rank",
+            (run_date,),
+        )
+
+    def snapshots_for(self, ticker: str) -> pd.DataFrame:
+        return self._query(
+            f"SELECT run_id, run_date, {', '.join(SNAPSHOT_COLUMNS)} FROM indicator_snapshots"
+            " WHERE ticker = ? ORDER BY run_date, run_id",
+            (ticker.upper(),),
+        )
+
+    def fundamentals_for(self, ticker: str) -> pd.DataFrame:
+        """One row per run, one column per recorded field."""
+        long = self._query(
+            "SELECT run_id, run_date, field, value FROM fundamentals WHERE ticker = ? ORDER BY run_date, run_id",
+            (ticker.upper(),),
+        )
+        if long.empty:
+            return long
+        long["value"] = long["value"].map(json.loads)
+        return long.pivot(index=["run_id", "run_date"], columns="field", values="value").reset_index()
+
+    def picks_frame(self) -> pd.DataFrame:
+        """All picks as (date, ticker, book) rows, the input format of backtest.forward_returns."""
+        picks = self._query("SELECT DISTINCT run_date AS date, ticker, book FROM picks ORDER BY run_date")
+        picks["date"] = pd.to_datetime(picks["date"])
+        return picks
+
+
+_history: Optional[RunHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_run_history() -> RunHistory:
+    """Returns the process-wide RunHistory."""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = RunHistory()
+        return _history
+
+
+def pick_data(picks: Dict[str, List[dict]]) -> Tuple[Optional[pd.DataFrame], Dict[str, dict]]:
+    """Indicator snapshot and fundamentals of every picked ticker, from the local caches."""
+    from .fundamentals_cache import get_fundamentals_cache
+    from .indicators import latest_snapshot
+    from .price_cache import get_price_cache
+
+    tickers = sorted({p["ticker"].upper() for items in picks.values() for p in items})
+    if not tickers:
+        return None, {}
+    close = get_price_cache().panel(tickers, period="1y", field="Close")
+    snapshot = latest_snapshot(close) if not close.empty else None
+    cache = get_fundamentals_cache()
+    return snapshot, {t: cache.get(t) for t in tickers}
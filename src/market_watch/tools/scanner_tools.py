@@ -1,5 +1,14 @@
+import pandas as pd
 from crewai.tools import BaseTool
-from typing import List, Dict
+from typing import Type, List, Dict
+from pydantic import BaseModel, Field
+from .price_cache import get_price_cache
+from .fundamentals_cache import get_fundamentals_cache
+from .screener import HISTORY_PERIOD, screen
+from .universe import get_universe
+
+# Tickers listed per sector by the Sector Discovery Tool (largest companies first).
+MAX_TICKERS_PER_SECTOR = 10
 
 class SectorDiscoveryTool(BaseTool):
     name: str = "Sector Discovery Tool"
@@ -9,12 +18,67 @@ class SectorDiscoveryTool(BaseTool):
     )
 
     def _run(self) -> Dict[str, List[str]]:
-        return {
-            "Technology": ["NVDA", "AMD", "AAPL", "MSFT", "GOOGL", "PLTR", "AVGO", "ORCL"],
-            "Financials": ["JPM", "BAC", "V", "MA", "GS", "MS"],
-            "Healthcare": ["LLY", "JNJ", "UNH", "PFE", "ABBV"],
-            "Consumer": ["AMZN", "TSLA", "WMT", "COST", "KO", "PEP"],
-            "Industrial": ["CAT", "DE", "GE", "HON"],
-            "Energy": ["XOM", "CVX", "COP"],
-            "High_Volatility": ["COIN", "MSTR", "SMCI", "ARM"]
-        }
+        universe = get_universe()
+        return {sector: universe.members(sector)[:MAX_TICKERS_PER_SECTOR] for sector in universe.sectors()}
+
+
+class MarketScreenerToolInput(BaseModel):
+    top_n: int = Field(default=5, description="Number of candidates per sector for each horizon.")
+    sectors: List[str] = Field(default=[], description="Optional list of sectors to restrict the output to.")
+
+class MarketScreenerTool(BaseTool):
+    name: str = "Market Screener Tool"
+    description: str = (
+        "Scans the whole cached market universe and ranks every symbol by momentum, volatility, "
+        "volume surge and opening gap. Returns the top short-term (momentum/volatility) and "
+        "long-term (trend/stability) candidates per sector."
+    )
+    args_schema: Type[BaseModel] = MarketScreenerToolInput
+
+    def _run(self, top_n: int = 5, sectors: List[str] = []) -> str:
+        try:
+            cache = get_price_cache()
+            # Universe symbols never downloaded, or cached with less than the screener's
+            # history, are fetched in one bulk call (point-in-time runs only screen what
+            # is already cached). Symbols the provider recently had no data for are
+            # skipped until their marker expires.
+            if cache.as_of is None:
+                missing = cache.uncovered([str(t) for t in get_universe().symbols], HISTORY_PERIOD)
+                if missing:
+                    cache.history_many(missing, period=HISTORY_PERIOD)
+
+            panels = cache.snapshot_panels(fields=("Open", "Close", "Volume"))
+            if panels['Close'].empty:
+                return "Error: No cached price data to screen."
+
+            result = screen(panels, _sector_map(), top_n=top_n)
+            return format_screen(result, panels['Close'], sectors)
+        except Exception as e:
+            return f"Error screening market: {str(e)}"
+
+def _sector_map() -> pd.Series:
+    # Registry sectors first; cached fundamentals cover symbols outside the universe file.
+    registry = get_universe().label_series('sector')
+    extra = pd.Series(get_fundamentals_cache().field_values('sector'), dtype=object)
+    return pd.concat([registry, extra[~extra.index.isin(registry.index)]])
+
+def _pct(value: float) -> str:
+    return "N/A" if pd.isna(value) else f"{value:+.1%}"
+
+def format_screen(result: Dict[str, pd.DataFrame], close: pd.DataFrame, sectors: List[str] = []) -> str:
+    """Renders screener output as one short/long candidate line per sector."""
+    wanted = {s.lower() for s in sectors}
+    lines = [f"Market Screen ({close.shape[1]} symbols ranked, as of {close.index[-1]:%Y-%m-%d}):"]
+    for sector in sorted(set(result['short']['sector']) | set(result['long']['sector'])):
+        if wanted and sector.lower() not in wanted:
+            continue
+        short = result['short'][result['short']['sector'] == sector]
+        long = result['long'][result['long']['sector'] == sector]
+        lines.append(f"## {sector}")
+        lines.append("Short-term: " + ", ".join(
+            f"{t} (5d {_pct(r.ret_5d)}, vol x{r.volume_surge:.1f}, gap {_pct(r.gap)})" for t, r in short.iterrows()
+        ))
+        lines.append("Long-term: " + ", ".join(
+            f"{t} (6m {_pct(r.ret_126d)}, 1y {_pct(r.ret_252d)})" for t, r in long.iterrows()
+        ))
+    return "\n".join(lines)
@@ -0,0 +1,98 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+# A 252-day return reads 253 closes, more than a "1y" download holds (~251 bars),
+# so the screener keeps two years per symbol (the snapshot panels keep the last 260).
+HISTORY_PERIOD = "2y"
+MIN_PRICE = 1.0
+MIN_DOLLAR_VOLUME = 1_000_000
+
+# Weights of the percentile-ranked metrics in each score.
+SHORT_TERM_WEIGHTS = {'ret_5d': 0.35, 'volume_surge': 0.25, 'abs_gap': 0.2, 'volatility_20d': 0.2}
+LONG_TERM_WEIGHTS = {'ret_126d': 0.35, 'ret_252d': 0.25, 'above_sma_200': 0.2, 'low_volatility': 0.2}
+
+
+def _trailing_return(close: np.ndarray, days: int) -> np.ndarray:
+    if close.shape[0] <= days:
+        return np.full(close.shape[1], np.nan)
+    return close[-1] / close[-1 - days] - 1
+
+
+def compute_metrics(open_: pd.DataFrame, close: pd.DataFrame, volume: pd.DataFrame) -> pd.DataFrame:
+    """Computes momentum, volatility, volume-surge and gap metrics for every column at once.
+
+    Inputs are aligned dates x tickers panels; returns one row per ticker.
+    """
+    tickers = close.columns
+    c = close.ffill().to_numpy(dtype='float64')
+    o = open_.reindex_like(close).to_numpy(dtype='float64')
+    v = volume.reindex_like(close).fillna(0).to_numpy(dtype='float64')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_returns = np.diff(np.log(c), axis=0)
+        volatility = np.nanstd(log_returns[-20:], axis=0) * np.sqrt(TRADING_DAYS_PER_YEAR)
+        avg_volume = np.nanmean(v[-21:-1], axis=0)
+        volume_surge = v[-1] / avg_volume
+        gap = o[-1] / c[-2] - 1 if c.shape[0] > 1 else np.full(len(tickers), np.nan)
+        sma_200 = np.nanmean(c[-200:], axis=0) if c.shape[0] >= 200 else np.full(len(tickers), np.nan)
+        dollar_volume = np.nanmean(c[-20:] * v[-20:], axis=0)
+
+        metrics = pd.DataFrame({
+            'price': c[-1],
+            'ret_5d': _trailing_return(c, 5),
+            'ret_20d': _trailing_return(c, 20),
+            'ret_126d': _trailing_return(c, 126),
+            'ret_252d': _trailing_return(c, 252),
+            'volatility_20d': volatility,
+            'volume_surge': volume_surge,
+            'gap': gap,
+            'above_sma_200': c[-1] / sma_200 - 1,
+            'dollar_volume': dollar_volume,
+        }, index=tickers)
+    metrics.index.name = 'Ticker'
+    return metrics.replace([np.inf, -np.inf], np.nan)
+
+
+def score(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Adds percentile-rank based `short_score` and `long_score` columns (0..1)."""
+    ranked = pd.DataFrame({
+        'ret_5d': metrics['ret_5d'],
+        'volume_surge': metrics['volume_surge'],
+        'abs_gap': metrics['gap'].abs(),
+        'volatility_20d': metrics['volatility_20d'],
+        'ret_126d': metrics['ret_126d'],
+        'ret_252d': metrics['ret_252d'],
+        'above_sma_200': metrics['above_sma_200'],
+        'low_volatility': -metrics['volatility_20d'],
+    }).rank(pct=True).fillna(0)
+
+    result = metrics.copy()
+    result['short_score'] = sum(ranked[name] * weight for name, weight in SHORT_TERM_WEIGHTS.items())
+    result['long_score'] = sum(ranked[name] * weight for name, weight in LONG_TERM_WEIGHTS.items())
+    return result
+
+
+def screen(
+    panels: Dict[str, pd.DataFrame],
+    sectors: pd.Series,
+    top_n: int = 5,
+    min_price: float = MIN_PRICE,
+    min_dollar_volume: float = MIN_DOLLAR_VOLUME,
+) -> Dict[str, pd.DataFrame]:
+    """Ranks a whole universe and returns the top-N short- and long-term candidates per sector.
+
+    `panels` holds 'Open', 'Close' and 'Volume' dates x tickers frames; `sectors`
+    maps ticker -> sector name.
+    """
+    scored = score(compute_metrics(panels['Open'], panels['Close'], panels['Volume']))
+    liquid = (scored['price'] >= min_price) & (scored['dollar_volume'] >= min_dollar_volume)
+    scored = scored[liquid].copy()
+    scored['sector'] = sectors.reindex(scored.index).fillna('Unknown')
+
+    return {
+        'short': scored.sort_values('short_score', ascending=False).groupby('sector', sort=True).head(top_n),
+        'long': scored.sort_values('long_score', ascending=False).groupby('sector', sort=True).head(top_n),
+    }
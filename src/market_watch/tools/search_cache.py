@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+from .storage import cache_dir
+
+DEFAULT_TTL = 6 * 3600
+# Queries whose token sets overlap at least this much (Jaccard) are treated as the same search.
+DEFAULT_SIMILARITY = 0.8
+
+_TOKEN_RE = re.compile(r"[a-z0-9$&]+(?:[.'-][a-z0-9]+)*")
+# Tickers (NVDA, BRK.B, $amd) and anything with a digit (Q3, 2025): the words that
+# say *what* a query is about, so two queries differing in one are never merged.
+_SYMBOL_RE = re.compile(r"(?<![\w$.])(?:\$[A-Za-z][\w.-]*|[A-Z][A-Z0-9&]+(?:[.-][A-Z0-9]+)*|[\w.-]*\d[\w.-]*)")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "about", "as", "at", "by", "for", "from", "in", "is", "it", "its",
+    "of", "on", "or", "the", "this", "to", "what", "whats", "with",
+})
+
+
+def query_tokens(query: str) -> FrozenSet[str]:
+    """Normalized token set of a search query: lowercase, punctuation and stopwords dropped."""
+    tokens = (t[:-2] if t.endswith("'s") else t for t in _TOKEN_RE.findall(query.lower()))
+    return frozenset(t for t in tokens if t not in _STOPWORDS)
+
+
+def query_symbols(query: str) -> FrozenSet[str]:
+    """Ticker-like and numeric tokens of a query, normalized like `query_tokens`."""
+    return frozenset(t.lower().lstrip("$").strip(".-") for t in _SYMBOL_RE.findall(query)) - {""}
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class SearchCache:
+    """Search results shared by every agent, keyed on normalized query + date.
+
+    - Exact hits: same token set, same date and options.
+    - Near duplicates: a fresh entry whose token set is similar enough is reused,
+      but only for a pure rewording (one token set contains the other) with the
+      same tickers and numbers, so "... for NVDA" never answers "... for AMD".
+    - Single flight: concurrent identical (or near-identical) queries wait for
+      the one request already in flight instead of calling the API again.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: int = DEFAULT_TTL,
+        similarity: float = DEFAULT_SIMILARITY,
+    ):
+        self.path = path or os.path.join(cache_dir(), "search.sqlite")
+        self.ttl = ttl
+        self.similarity = similarity
+        self.stats = {"hits": 0, "near_hits": 0, "coalesced": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Tuple[str, FrozenSet[str], FrozenSet[str], Future]] = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            " key TEXT PRIMARY KEY, scope TEXT NOT NULL, tokens TEXT NOT NULL, query TEXT NOT NULL,"
+            " response TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS search_results_scope ON search_results (scope)")
+        self._conn.commit()
+
+    @staticmethod
+    def scope(day: Optional[str] = None, options: Optional[dict] = None) -> str:
+        """Results are only shared between searches on the same date with the same options."""
+        return json.dumps({"date": day or date.today().isoformat(), "options": options or {}}, sort_keys=True)
+
+    @staticmethod
+    def key(scope: str, tokens: FrozenSet[str]) -> str:
+        return hashlib.sha256(f"{scope}|{' '.join(sorted(tokens))}".encode('utf-8')).hexdigest()
+
+    def _near(self, tokens: FrozenSet[str], symbols: FrozenSet[str], other_tokens: FrozenSet[str], other_symbols: FrozenSet[str]) -> float:
+        """Similarity of two queries, or 0.0 when they may ask about different things."""
+        if symbols != other_symbols or not (tokens <= other_tokens or other_tokens <= tokens):
+            return 0.0
+        return jaccard(tokens, other_tokens)
+
+    def _lookup(self, scope: str, tokens: FrozenSet[str], symbols: FrozenSet[str], now: float) -> Tuple[Optional[str], bool]:
+        """Returns (response, exact) for the best fresh cached entry, or (None, False)."""
+        rows = self._conn.execute(
+            "SELECT key, tokens, query, response FROM search_results WHERE scope = ? AND fetched_at >= ?",
+            (scope, now - self.ttl),
+        ).fetchall()
+        exact_key = self.key(scope, tokens)
+        best, best_score = None, 0.0
+        for key, cached_tokens, cached_query, response in rows:
+            if key == exact_key:
+                return response, True
+            score = self._near(tokens, symbols, frozenset(json.loads(cached_tokens)), query_symbols(cached_query))
+            if score >= self.similarity and score > best_score:
+                best, best_score = response, score
+        return best, False
+
+    def _store(self, scope: str, tokens: FrozenSet[str], query: str, response: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (key, scope, tokens, query, response, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (self.key(scope, tokens), scope, json.dumps(sorted(tokens)), query, response, time.time()),
+            )
+            self._conn.commit()
+
+    def get_or_fetch(
+        self,
+        query: str,
+        fetch: Callable[[], str],
+        options: Optional[dict] = None,
+        day: Optional[str] = None,
+    ) -> str:
+        """Returns a cached result for `query` or runs `fetch` once, sharing it with concurrent callers."""
+        scope = self.scope(day, options)
+        tokens = query_tokens(query)
+        symbols = query_symbols(query)
+        key = self.key(scope, tokens)
+
+        with self._lock:
+            response, exact = self._lookup(scope, tokens, symbols, time.time())
+            if response is not None:
+                self.stats["hits" if exact else "near_hits"] += 1
+                return response
+            waiting = self._inflight.get(key)
+            if waiting is None:
+                waiting = next(
+                    (entry for entry in self._inflight.values()
+                     if entry[0] == scope and self._near(tokens, symbols, entry[1], entry[2]) >= self.similarity),
+                    None,
+                )
+            if waiting is not None:
+                self.stats["coalesced"] += 1
+                future = waiting[3]
+                owner = False
+            else:
+                self.stats["misses"] += 1
+                future = Future()
+                self._inflight[key] = (scope, tokens, symbols, future)
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            response = fetch()
+            if isinstance(response, str) and not response.startswith("Error"):
+                self._store(scope, tokens, query, response)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def purge(self, now: Optional[float] = None) -> int:
+        """Deletes expired entries; returns how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM search_results WHERE fetched_at < ?", ((now or time.time()) - self.ttl,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+
+_cache: Optional[SearchCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Returns the process-wide SearchCache shared by every agent's search tool."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from typing import Any, ClassVar
+
+from crewai_tools import BraveSearchTool
+
+from .cassette import CassetteMiss, get_cassette
+from .rate_limiter import get_rate_limiter
+from .search_cache import get_search_cache
+from .storage import as_of
+
+# Point-in-time runs only see results published in this window before the as-of date.
+AS_OF_LOOKBACK_DAYS = 30
+
+
+class RateLimitedBraveSearchTool(BraveSearchTool):
+    """Brave Search paced by the shared 'brave' token bucket instead of a per-process sleep.
+
+    Results are shared between agents through the search cache (near-duplicate
+    queries and concurrent identical queries cost one request), and go through the
+    cassette, so recorded searches are replayed without a request.
+    """
+
+    _min_request_interval: ClassVar[float] = 0.0
+
+    def _run(self, **kwargs: Any) -> Any:
+        date = as_of()
+        if date and not kwargs.get("freshness"):
+            start = datetime.strptime(date, "%Y-%m-%d") - timedelta(days=AS_OF_LOOKBACK_DAYS)
+            kwargs["freshness"] = f"{start:%Y-%m-%d}to{date}"
+
+        request = {"search_url": self.search_url, "n_results": self.n_results, **kwargs}
+        for field in ("q", "query", "search_query"):
+            # Search queries are case-insensitive.
+            if isinstance(request.get(field), str):
+                request[field] = request[field].lower()
+
+        def live():
+            get_rate_limiter().acquire("brave")
+            return super(RateLimitedBraveSearchTool, self)._run(**kwargs)
+
+        def recorded():
+            try:
+                return get_cassette().through("brave", request, live)
+            except CassetteMiss as e:
+                return f"Error searching: {str(e)}"
+
+        query = kwargs.get("q") or kwargs.get("query") or kwargs.get("search_query")
+        if not isinstance(query, str):
+            return recorded()
+        options = {
+            k: v for k, v in kwargs.items() if v is not None and k not in ("q", "query", "search_query", "save_file")
+        }
+        return get_search_cache().get_or_fetch(query, recorded, options=options, day=date)
@@ -0,0 +1,64 @@
+import os
+import tempfile
+from typing import Optional
+
+DEFAULT_CACHE_DIR = "cache"
+DEFAULT_OUTPUT_DIR = "output"
+RUNS_DIR = "runs"
+
+
+def cache_dir(*parts: str) -> str:
+    """Returns (and creates) a directory under the local cache root."""
+    root = os.getenv("MARKET_WATCH_CACHE_DIR", DEFAULT_CACHE_DIR)
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Writes a file via a temp file + rename so readers never see a partial write."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def as_of() -> Optional[str]:
+    """The point-in-time date (YYYY-MM-DD) of a backfill run, or None for a live run."""
+    value = os.getenv("MARKET_WATCH_AS_OF")
+    return value or None
+
+
+def output_root() -> str:
+    """The output root shared by all runs (runs/, LATEST)."""
+    return os.getenv("MARKET_WATCH_OUTPUT_DIR", DEFAULT_OUTPUT_DIR)
+
+
+def legacy_dashboard() -> bool:
+    """Whether the deprecated single-file dashboard_data.json is still written (MARKET_WATCH_LEGACY_DASHBOARD=1)."""
+    return os.getenv("MARKET_WATCH_LEGACY_DASHBOARD", "") == "1"
+
+
+def run_id() -> Optional[str]:
+    """The id of the active run workspace (see run_context.py), or None."""
+    return os.getenv("MARKET_WATCH_RUN_ID") or None
+
+
+def output_dir(*parts: str) -> str:
+    """Returns (and creates) a directory under the run's output folder.
+
+    That is the run's workspace (<root>/runs/<run id>) when a run is active,
+    otherwise the output root itself.
+    """
+    current = run_id()
+    root = os.path.join(output_root(), RUNS_DIR, current) if current else output_root()
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
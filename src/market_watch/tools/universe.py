@@ -0,0 +1,203 @@
+import io
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .storage import atomic_write_bytes, cache_dir
+
+DEFAULT_UNIVERSE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../config/universe.csv')
+LABEL_COLUMNS = ("sector", "industry", "exchange", "market_cap_bucket")
+MARKET_CAP_ORDER = ["mega", "large", "mid", "small", "micro"]
+SNAPSHOT_VERSION = 1
+
+_FNV_OFFSET = 0x811C9DC5
+_FNV_PRIME = 0x01000193
+
+
+def _fnv1a(symbol: str) -> int:
+    h = _FNV_OFFSET
+    for byte in symbol.encode('utf-8'):
+        h = ((h ^ byte) * _FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+class UniverseRegistry:
+    """Array-backed ticker universe.
+
+    Symbol metadata lives in NumPy arrays: one fixed-width symbol array, a small
+    integer code array per label column, an open-addressing hash table for O(1)
+    symbol lookup, and a CSR-style (order + offsets) index of rows per sector.
+    Everything can be saved as .npy files and memory-mapped on the next start.
+    """
+
+    def __init__(
+        self,
+        symbols: np.ndarray,
+        codes: Dict[str, np.ndarray],
+        labels: Dict[str, List[str]],
+        hash_table: np.ndarray,
+        sector_order: np.ndarray,
+        sector_offsets: np.ndarray,
+    ):
+        self.symbols = symbols
+        self.codes = codes
+        self.labels = labels
+        self.hash_table = hash_table
+        self.sector_order = sector_order
+        self.sector_offsets = sector_offsets
+        self._mask = len(hash_table) - 1
+
+    # --- BUILD ---
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "UniverseRegistry":
+        df = df.copy()
+        df['symbol'] = df['symbol'].astype(str).str.strip().str.upper()
+        df = df.drop_duplicates('symbol', keep='last').reset_index(drop=True)
+        for column in LABEL_COLUMNS:
+            df[column] = df[column].fillna('Unknown').astype(str) if column in df else 'Unknown'
+
+        width = max(int(df['symbol'].str.len().max() or 1), 1)
+        symbols = df['symbol'].to_numpy(dtype=f'U{width}')
+
+        codes, labels = {}, {}
+        for column in LABEL_COLUMNS:
+            categories = sorted(df[column].unique())
+            if column == "market_cap_bucket":
+                categories = sorted(categories, key=lambda c: (MARKET_CAP_ORDER.index(c) if c in MARKET_CAP_ORDER else len(MARKET_CAP_ORDER), c))
+            labels[column] = categories
+            codes[column] = pd.Categorical(df[column], categories=categories).codes.astype(np.int16)
+
+        size = 1
+        while size < 2 * max(len(symbols), 1):
+            size <<= 1
+        hash_table = np.zeros(size, dtype=np.int32)
+        for row, symbol in enumerate(symbols):
+            slot = _fnv1a(str(symbol)) & (size - 1)
+            while hash_table[slot]:
+                slot = (slot + 1) & (size - 1)
+            hash_table[slot] = row + 1  # 0 marks an empty slot
+
+        # Rows grouped by sector, largest market-cap bucket first within each sector.
+        sector_codes = codes["sector"]
+        sector_order = np.lexsort((symbols, codes["market_cap_bucket"], sector_codes)).astype(np.int32)
+        counts = np.bincount(sector_codes, minlength=len(labels["sector"]))
+        sector_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+
+        return cls(symbols, codes, labels, hash_table, sector_order, sector_offsets)
+
+    @classmethod
+    def from_file(cls, path: str) -> "UniverseRegistry":
+        if path.endswith('.parquet'):
+            return cls.from_frame(pd.read_parquet(path))
+        return cls.from_frame(pd.read_csv(path, dtype=str, keep_default_na=False, na_values=['']))
+
+    # --- SNAPSHOT ---
+    def save_snapshot(self, directory: str, source_stamp: Optional[dict] = None) -> None:
+        os.makedirs(directory, exist_ok=True)
+        arrays = {"symbols": self.symbols, "hash_table": self.hash_table,
+                  "sector_order": self.sector_order, "sector_offsets": self.sector_offsets}
+        arrays.update({f"codes_{column}": codes for column, codes in self.codes.items()})
+        for name, array in arrays.items():
+            # Unique temp file per writer: concurrent rebuilds never share one.
+            buffer = io.BytesIO()
+            np.save(buffer, np.ascontiguousarray(array))
+            atomic_write_bytes(os.path.join(directory, f"{name}.npy"), buffer.getvalue())
+        manifest = {"version": SNAPSHOT_VERSION, "labels": self.labels, "source": source_stamp or {}}
+        # Written last: a snapshot without a current manifest is never trusted.
+        atomic_write_bytes(os.path.join(directory, "manifest.json"), json.dumps(manifest).encode('utf-8'))
+
+    @classmethod
+    def load_snapshot(cls, directory: str) -> "UniverseRegistry":
+        with open(os.path.join(directory, "manifest.json"), 'r') as f:
+            manifest = json.load(f)
+
+        def load(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+
+        codes = {column: load(f"codes_{column}") for column in LABEL_COLUMNS}
+        return cls(load("symbols"), codes, manifest["labels"], load("hash_table"),
+                   load("sector_order"), load("sector_offsets"))
+
+    @classmethod
+    def load(cls, source: Optional[str] = None, snapshot_dir: Optional[str] = None) -> "UniverseRegistry":
+        """Loads the universe from its memory-mapped snapshot, rebuilding it when the source file changed."""
+        source = source or os.getenv("MARKET_WATCH_UNIVERSE", DEFAULT_UNIVERSE_PATH)
+        snapshot_dir = snapshot_dir or cache_dir("universe")
+        stat = os.stat(source)
+        stamp = {"path": os.path.abspath(source), "mtime": stat.st_mtime, "size": stat.st_size}
+
+        manifest_path = os.path.join(snapshot_dir, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == SNAPSHOT_VERSION and manifest.get("source") == stamp:
+                return cls.load_snapshot(snapshot_dir)
+
+        registry = cls.from_file(source)
+        registry.save_snapshot(snapshot_dir, stamp)
+        return registry
+
+    # --- QUERIES ---
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.index_of(symbol) >= 0
+
+    def index_of(self, symbol: str) -> int:
+        """Row of a symbol, or -1 when it is not in the universe."""
+        symbol = symbol.upper()
+        slot = _fnv1a(symbol) & self._mask
+        while True:
+            row = int(self.hash_table[slot]) - 1
+            if row < 0:
+                return -1
+            if self.symbols[row] == symbol:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def label(self, column: str, row: int) -> str:
+        return self.labels[column][int(self.codes[column][row])]
+
+    def get(self, symbol: str) -> Optional[dict]:
+        row = self.index_of(symbol)
+        if row < 0:
+            return None
+        info = {"symbol": str(self.symbols[row])}
+        info.update({column: self.label(column, row) for column in LABEL_COLUMNS})
+        return info
+
+    def sectors(self) -> List[str]:
+        return list(self.labels["sector"])
+
+    def sector_rows(self, sector: str) -> np.ndarray:
+        """Rows of a sector (largest market-cap bucket first), as a view on the prebuilt index."""
+        if sector not in self.labels["sector"]:
+            return np.empty(0, dtype=np.int32)
+        code = self.labels["sector"].index(sector)
+        return self.sector_order[self.sector_offsets[code]:self.sector_offsets[code + 1]]
+
+    def members(self, sector: str) -> List[str]:
+        return [str(s) for s in self.symbols[self.sector_rows(sector)]]
+
+    def label_series(self, column: str) -> pd.Series:
+        """ticker -> label for the whole universe, built straight from the code arrays."""
+        values = np.asarray(self.labels[column], dtype=object)[np.asarray(self.codes[column])]
+        return pd.Series(values, index=np.asarray(self.symbols).astype(str), dtype=object)
+
+
+_registry: Optional[UniverseRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_universe() -> UniverseRegistry:
+    """Returns the process-wide universe registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = UniverseRegistry.load()
+        return _registry